@@ -8,6 +8,8 @@ from flask import Blueprint, request, jsonify
 from config.settings import Settings
 from .wallet import execute_transaction
 from app.assistants.assistant import Assistant
+from app.db.database import get_thread_record
+from app.db.history import record_message, record_run, update_run_status, get_messages
 
 logger = logging.getLogger('app')
 settings = Settings()
@@ -32,9 +34,13 @@ def ai_request():
     thread_id = assistant.create_thread(data["wallet"])
     try:
         assistant.create_message(thread_id, f'help my with request: {data["request"]}, for user: {data["wallet"]}')
+        record_message(data["wallet"], thread_id, "user", data["request"])
         run = assistant.create_run(thread_id)
+        record_run(run.id, data["wallet"], thread_id, run.status)
         assistant.wait_on_run(assistant.run, thread_id)
+        update_run_status(run.id, assistant.run.status)
         openai_response = assistant.get_response(thread_id)
+        record_message(data["wallet"], thread_id, "assistant", openai_response)
         return jsonify({"message": openai_response}), 200
     except Exception as e:
         assistant.cancel_run(thread_id, run.id)
@@ -42,10 +48,36 @@ def ai_request():
         return jsonify({"message": "Error"}), 500
 
 
-
-
- 
-            
-
-           
-            
\ No newline at end of file
+@ai_request_bp.route('/history', methods=['GET'])
+def get_history():
+    """Get a page of conversation history for the user's current thread
+    
+    Query params:
+        wallet: User wallet address
+        limit: Page size (default 50, clamped to 1-200)
+        before: Message id cursor from the previous page
+    """
+    wallet = request.args.get('wallet')
+    if not wallet:
+        return jsonify({'error': 'wallet parameter is required'}), 400
+    
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+        before = request.args.get('before')
+        before_id = int(before) if before is not None else None
+    except ValueError:
+        return jsonify({'error': 'limit and before must be integers'}), 400
+    
+    thread = get_thread_record(wallet)
+    if not thread:
+        return jsonify({'status': 'success', 'data': {'messages': [], 'next_before': None}})
+    
+    messages = get_messages(wallet, thread["thread_id"], limit=limit, before_id=before_id)
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'thread_id': thread["thread_id"],
+            'messages': messages,
+            'next_before': messages[-1]["id"] if len(messages) == limit else None
+        }
+    })
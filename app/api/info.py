@@ -1,11 +1,17 @@
 from flask import Blueprint, jsonify, request
-from web3 import Web3
 from app.core.protocols.silo import SiloProtocol
 from config.settings import Settings
+from app.core.provider import get_web3
 from typing import Dict, Any
+from services.apr_cache import AprCache
 
 settings = Settings()
-web3 = Web3(Web3.HTTPProvider(settings.RPC_URL))
+web3 = get_web3(settings)
+apr_cache = AprCache(
+    fetch=lambda: SiloProtocol.get_apr(web3, settings),
+    ttl=settings.APR_TTL,
+    refresh_interval=settings.APR_REFRESH_INTERVAL
+)
 
 info_bp = Blueprint('info', __name__)
 
@@ -32,12 +38,15 @@ def info() -> Dict[str, Any]:
             
         if protocol == 'silo':
             if method == 'all_apr':
-                # use static method
-                apr_data = SiloProtocol.get_apr(web3, settings)
+                # served from memory, refreshed in the background
+                apr_data = apr_cache.get()
                 return jsonify({
                     'status': 'success',
                     'data': {
-                        'apr': apr_data
+                        'apr': apr_data['data'],
+                        'updated_at': apr_data['updated_at'],
+                        'age_seconds': apr_data['age_seconds'],
+                        'stale': apr_data['stale']
                     }
                 })
             else:
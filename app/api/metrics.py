@@ -0,0 +1,43 @@
+from flask import Blueprint, jsonify
+from config.settings import Settings
+from app.core.provider import get_web3
+from app.core.rpc_metrics import get_rpc_metrics
+from app.core.rpc_batch import get_batch_stats
+from app.core.gas_estimator import get_gas_estimator
+from app.core.read_cache import get_read_cache
+from app.db.database import get_wallet_cache_stats
+from services.provisioning_queue import get_provisioning_queue
+from typing import Dict, Any
+
+metrics_bp = Blueprint('metrics', __name__)
+settings = Settings()
+web3 = get_web3(settings)
+
+@metrics_bp.route('/', methods=['GET'])
+@metrics_bp.route('', methods=['GET'])
+def get_metrics() -> Dict[str, Any]:
+    """Get RPC and cache metrics
+    
+    Returns:
+        JSON response with per-endpoint RPC histograms, batch stats, wallet
+        and read cache stats, RPC pool endpoint stats, cached gas limits and
+        provisioning job counts
+    """
+    try:
+        endpoint_stats = getattr(web3.provider, 'endpoint_stats', None)
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'rpc': get_rpc_metrics().snapshot(),
+                'rpc_batches': get_batch_stats(),
+                'rpc_pool': endpoint_stats() if endpoint_stats else None,
+                'wallet_cache': get_wallet_cache_stats(),
+                'read_cache': get_read_cache(web3).stats() if settings.READ_CACHE else None,
+                'gas_limits': get_gas_estimator(web3).stats(),
+                'provisioning': get_provisioning_queue().stats()
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 500
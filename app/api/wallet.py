@@ -1,18 +1,18 @@
 from flask import Blueprint, request, jsonify
 from services.wallet_service import WalletService
 from config.settings import Settings
-from web3 import Web3
-from app.db.database import create_wallet_record, update_cobo_address, get_wallet
-from app.core.wallet.safe_factory import SafeWalletFactory
-from app.core.wallet.cobo_factory import CoboArgusFactory
-from app.core.wallet.authorizer_manager import AuthorizerManager
+from app.core.provider import get_web3
+from app.db.database import get_wallet
+from app.db.jobs import get_job
+from services.provisioning_queue import get_provisioning_queue, QueueFull, WalletExists
 from app.core.protocols.token import TokenProtocol
-from app.core.protocols.silo import SiloProtocol
 from app.core.protocols.registry import ProtocolRegistry
+from app.core.tx_tracker import get_receipt_tracker
+import re
 
 wallet_bp = Blueprint('wallet', __name__)
 settings = Settings()
-web3 = Web3(Web3.HTTPProvider(settings.RPC_URL))
+web3 = get_web3(settings)
 wallet_service = WalletService(web3, settings)
 
 @wallet_bp.before_request
@@ -23,74 +23,46 @@ def handle_options():
 @wallet_bp.route('/create', methods=['POST'])
 @wallet_bp.route('', methods=['POST'])
 def create_wallet():
-    """Create new wallet for user"""
+    """Queue wallet provisioning for user
+
+    Safe, Cobo and authorizer deployment takes minutes, so it runs as a
+    background job. Responds 202 with the job; poll
+    GET /api/wallet/create/<job_id> for progress and the addresses.
+    Posting again after a job failed retries it from its last confirmed step.
+    """
     try:
         user_address = request.json.get('address')
         if not user_address:
             return jsonify({'error': 'Address required'}), 400
-            
-        # 1. create safe
-        safe_factory = SafeWalletFactory(web3, settings)
-        safe_address = safe_factory.create_safe_from_deployer()
-        
-        # 2. write wallet to db
-        create_wallet_record(user_address, safe_address)
-        
-        # 3. create cobo
-        cobo_factory = CoboArgusFactory(web3, settings)
-        cobo_address = cobo_factory.create_cobo_for_safe(
-            safe_address=safe_address,
-            user_address=user_address
-        )
-        
-        # 4. update cobo address in db
-        update_cobo_address(user_address, cobo_address)
-        
-        # 5. setup authorizers
-        authorizer_manager = AuthorizerManager(web3, settings)
-
-        # create approve authorizer
-        approve_authorizer_address = authorizer_manager.create_authorizer(
-            cobo_address=cobo_address,
-            user_address=user_address,
-            authorizer_type="ApproveAuthorizerV2",
-            role_name="approve"
-        )
-
-        # create silo authorizer
-        silo_authorizer_address = authorizer_manager.create_authorizer(
-            cobo_address=cobo_address,
-            user_address=user_address,
-            authorizer_type="SiloAuthorizer",
-            role_name="silo"
-        )
-
-        # create crowdfinding authorizer
-        crowdfinding_authorizer_address = authorizer_manager.create_authorizer(
-            cobo_address=cobo_address,
-            user_address=user_address,
-            authorizer_type="CrowdfindingAuthorizer",
-            role_name="crowdfinding"
-        )
         
-        # 7. transfer ownership of safe to user
-        safe_factory.transfer_ownership(
-            safe_address=safe_address,
-            new_owner=user_address
-        )
-        
-        return jsonify({
-            'safe_address': safe_address,
-            'cobo_address': cobo_address,
-            'approve_authorizer_address': approve_authorizer_address,
-            'silo_authorizer_address': silo_authorizer_address,
-            'crowdfinding_authorizer_address': crowdfinding_authorizer_address
-        })
+        queue = get_provisioning_queue()
+        job = queue.describe(queue.submit(user_address))
+        job['status_url'] = f"{request.path.rstrip('/').removesuffix('/create')}/create/{job['job_id']}"
+        return jsonify(job), 202
         
+    except WalletExists as e:
+        return jsonify({'error': str(e)}), 409
+    except QueueFull as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@wallet_bp.route('/create/<job_id>', methods=['GET'])
+def get_create_status(job_id: str):
+    """Progress of a wallet provisioning job
     
+    Returns:
+        status (queued, running, completed, failed), current step, per-step
+        status, tx hash and attempts, and the addresses created so far in result
+    """
+    try:
+        job = get_job(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(get_provisioning_queue().describe(job))
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @wallet_bp.route('/execute', methods=['POST'])
 def execute_transaction():
@@ -100,6 +72,7 @@ def execute_transaction():
     {
         "user_address": "0x...",
         "action": "approve" | "silo_deposit" | "silo_withdraw",
+        "wait": true,  # optional, false returns right after submission (poll GET /tx/<hash>)
         "params": {
             # for approve:
             "token_address": "0x...",
@@ -132,6 +105,7 @@ def execute_transaction():
         user_address = data['user_address']
         action = data['action']
         params = data['params']
+        wait = bool(data.get('wait', True))
         
         print(f"[Execute] Getting wallet data for user {user_address}")
         try:
@@ -145,6 +119,7 @@ def execute_transaction():
             print(f"[Execute] Processing approve action with params: {params}")
             try:
                 token_protocol = TokenProtocol(web3, settings, user_address)
+                token_protocol.wait_for_receipt = wait
                 tx_hash = token_protocol.approve(
                     token_address=params['token_address'],
                     spender_address=params['spender_address'],
@@ -167,6 +142,7 @@ def execute_transaction():
                 
             protocol_info = ProtocolRegistry.get_protocol_info(action)
             silo_protocol = protocol_info["class"](web3, settings, user_address)
+            silo_protocol.wait_for_receipt = wait
             method = getattr(silo_protocol, protocol_info["method"])
             
             tx_hash = method(
@@ -184,6 +160,54 @@ def execute_transaction():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@wallet_bp.route('/tx/<tx_hash>', methods=['GET'])
+def get_transaction_status(tx_hash: str):
+    """Get status of a submitted transaction
+    
+    Transactions sent by this process are long-polled; other hashes get a
+    single receipt lookup and 404 if the node has none.
+    
+    Query params:
+        timeout: Seconds to long-poll while the transaction is pending
+                 (default 0, capped by TX_LONG_POLL_MAX)
+        
+    Returns:
+        {
+            "status": "success",
+            "data": {
+                "tx_hash": "0x...",
+                "status": "pending" | "success" | "failed" | "dropped",
+                "block_number": 123,
+                "gas_used": 21000,
+                "submitted_at": 1700000000.0
+            }
+        }
+    """
+    try:
+        if not re.fullmatch(r'(0x)?[0-9a-fA-F]{64}', tx_hash):
+            return jsonify({'error': 'Invalid transaction hash'}), 400
+        
+        try:
+            timeout = float(request.args.get('timeout', 0))
+        except ValueError:
+            return jsonify({'error': 'timeout must be a number'}), 400
+        timeout = max(0.0, min(timeout, settings.TX_LONG_POLL_MAX))
+        
+        # only hashes this process sent are long-polled; tracking arbitrary
+        # client-supplied hashes would let them crowd out real transactions
+        tracker = get_receipt_tracker(web3)
+        result = tracker.wait(tx_hash, timeout=timeout, track=False) or tracker.lookup(tx_hash)
+        if result is None:
+            return jsonify({'error': 'Transaction not found'}), 404
+        return jsonify({
+            'status': 'success',
+            'data': result
+        })
+        
+    except Exception as e:
+        print(f"[TxStatus] Error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @wallet_bp.route('/methods', methods=['GET'])
 def get_available_methods():
     """Get all available API methods with their parameters"""
@@ -4,7 +4,8 @@ import json
 import time
 import logging
 from datetime import datetime
-from app.db.database import get_thread_record, create_thread_record
+from app.db.database import get_thread_record, create_thread_record, update_thread_record
+from app.db.history import count_messages
 from app.tools.assistant_tools import tool_registry
 settings = Settings()
 logger = logging.getLogger('app')
@@ -57,9 +58,23 @@ class Assistant:
         threads_records = get_thread_record(user_wallet_address)
         if threads_records:
             
-            self.thread = threads_records["thread_id"]
-            logger.info(f"Thread found: {self.thread}")
-            return self.thread
+            thread_id = threads_records["thread_id"]
+            if count_messages(user_wallet_address, thread_id) < settings.THREAD_MAX_MESSAGES:
+                self.thread = thread_id
+                logger.info(f"Thread found: {self.thread}")
+                return self.thread
+            
+            # history is too long: start a fresh thread so runs stay fast
+            self.thread = openai.beta.threads.create(
+                metadata={
+                    "user_wallet_address": user_wallet_address
+                }
+            )
+            last_threads = json.loads(threads_records["last_threads"] or "[]")
+            last_threads = (last_threads + [thread_id])[-settings.THREAD_HISTORY_KEEP:]
+            update_thread_record(user_wallet_address, self.thread.id, datetime.now(), json.dumps(last_threads))
+            logger.info(f"Thread {thread_id} rotated to {self.thread.id}")
+            return self.thread.id
         else:
             self.thread = openai.beta.threads.create(
                 metadata={
@@ -0,0 +1,101 @@
+"""Benchmark: Contract.encode_abi + bytes.fromhex vs app/core/abi_encoder.py
+
+Encodes the calldata the protocols and AuthorizerManager build most often:
+ERC20 approve, SiloMarket deposit and redeem, and a MultiSend of three
+packed Argus helper calls. Reports calls per second for the web3 Contract
+path (hex string, then bytes.fromhex) and for encode_call (selector +
+eth_abi.encode, bytes out). No RPC node is needed.
+
+Usage (from the repository root):
+    python -m app.benchmarks.abi_encoder [--count N]
+"""
+import argparse
+import time
+
+from web3 import Web3
+
+from app.core.abi_encoder import encode_call
+from app.core.abi_registry import get_abi_registry
+
+TOKEN = "0x039e2fB66102314Ce7b64Ce5Ce3E5183bc94aD38"
+SILO = "0x22AacdEc57b13911dE9f188CF69633cC537BdB76"
+SAFE = "0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7"
+HELPER = "0xE05966aee69CeCD677a30f469812Ced650cE3b5E"
+ROLES = [b"agent".ljust(32, b"\0")]
+
+
+def pack(operation: int, to: str, data: bytes) -> bytes:
+    return b''.join([
+        operation.to_bytes(1, 'big'), bytes.fromhex(to[2:]), (0).to_bytes(32, 'big'),
+        len(data).to_bytes(32, 'big'), data
+    ])
+
+
+def contract_cases(web3: Web3) -> dict:
+    registry = get_abi_registry()
+    erc20 = registry.contract(web3, "ERC20", TOKEN)
+    silo = registry.contract(web3, "SiloMarket", SILO)
+    helper = registry.contract(web3, "ArgusAccountHelper", HELPER)
+    multisend = registry.contract(web3, "MultiSend", SAFE)
+
+    def encode(contract, fn_name, args) -> bytes:
+        data = contract.encode_abi(fn_name, args=args)
+        return bytes.fromhex(data[2:])
+
+    def multisend_call() -> bytes:
+        transactions = [
+            pack(1, HELPER, encode(helper, "addAuthorizer", [SAFE, SILO, False, ROLES])),
+            pack(1, HELPER, encode(helper, "grantRoles", [SAFE, ROLES, [TOKEN]])),
+            pack(0, TOKEN, encode(erc20, "approve", [SILO, 2**256 - 1]))
+        ]
+        return encode(multisend, "multiSend", [b''.join(transactions)])
+
+    return {
+        "approve": lambda: encode(erc20, "approve", [SILO, 2**256 - 1]),
+        "deposit": lambda: encode(silo, "deposit", [10**18, SAFE]),
+        "redeem": lambda: encode(silo, "redeem", [10**18, SAFE, SAFE, 0]),
+        "multiSend": multisend_call
+    }
+
+
+def encoder_cases() -> dict:
+    def multisend_call() -> bytes:
+        transactions = [
+            pack(1, HELPER, encode_call("ArgusAccountHelper", "addAuthorizer", SAFE, SILO, False, ROLES)),
+            pack(1, HELPER, encode_call("ArgusAccountHelper", "grantRoles", SAFE, ROLES, [TOKEN])),
+            pack(0, TOKEN, encode_call("ERC20", "approve", SILO, 2**256 - 1))
+        ]
+        return encode_call("MultiSend", "multiSend", b''.join(transactions))
+
+    return {
+        "approve": lambda: encode_call("ERC20", "approve", SILO, 2**256 - 1),
+        "deposit": lambda: encode_call("SiloMarket", "deposit", 10**18, SAFE),
+        "redeem": lambda: encode_call("SiloMarket", "redeem", 10**18, SAFE, SAFE, 0),
+        "multiSend": multisend_call
+    }
+
+
+def rate(count: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    web3 = Web3()
+    before, after = contract_cases(web3), encoder_cases()
+    print(f"{'call':<10} {'encode_abi/s':>14} {'encode_call/s':>14} {'speedup':>8}")
+    for name in before:
+        assert before[name]() == after[name](), name
+        contract_rate = rate(args.count, before[name])
+        encoder_rate = rate(args.count, after[name])
+        print(f"{name:<10} {contract_rate:>14,.0f} {encoder_rate:>14,.0f} {encoder_rate / contract_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: TokenProtocol.approve build path with and without the ABI registry
+
+The old path re-read and re-parsed ERC20.json and CoboSafeAccount.json and
+built fresh Contract objects for every approve before encoding the inner
+approve call and the Cobo execTransaction wrapper. The registry path gets
+both contracts from get_abi_registry(). No RPC node is needed, encoding is
+done offline.
+
+Usage (from the repository root):
+    python -m app.benchmarks.abi_registry [--count N]
+"""
+import argparse
+import json
+import time
+
+from web3 import Web3
+
+from app.core.abi_registry import ABI_DIR, get_abi_registry
+
+TOKEN = "0x039e2fB66102314Ce7b64Ce5Ce3E5183bc94aD38"
+SPENDER = "0x22AacdEc57b13911dE9f188CF69633cC537BdB76"
+COBO = "0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7"
+MAX_UINT256 = 2**256 - 1
+
+
+def load_abi(name: str) -> list:
+    with open(ABI_DIR / f"{name}.json", "r") as f:
+        return json.load(f)
+
+
+def build(web3: Web3, token_contract, cobo_contract) -> str:
+    data = token_contract.encode_abi("approve", args=[SPENDER, MAX_UINT256])
+    call_data = {
+        'flag': 0,
+        'to': TOKEN,
+        'value': 0,
+        'data': bytes.fromhex(data[2:]),
+        'hint': b'',
+        'extra': b''
+    }
+    return cobo_contract.encode_abi("execTransaction", args=[call_data])
+
+
+def uncached_approve(web3: Web3) -> str:
+    token_contract = web3.eth.contract(address=TOKEN, abi=load_abi("ERC20"))
+    cobo_contract = web3.eth.contract(address=COBO, abi=load_abi("CoboSafeAccount"))
+    return build(web3, token_contract, cobo_contract)
+
+
+def registry_approve(web3: Web3) -> str:
+    registry = get_abi_registry()
+    return build(web3, registry.contract(web3, "ERC20", TOKEN), registry.contract(web3, "CoboSafeAccount", COBO))
+
+
+def timed(label: str, count: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    per_call_us = (time.perf_counter() - started) / count * 1e6
+    print(f"{label:<10} {count} approves -> {per_call_us:8.1f} us/approve")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    web3 = Web3()
+    started = time.perf_counter()
+    registry = get_abi_registry()
+    print(f"registry load: {len(registry.names())} ABIs in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    assert uncached_approve(web3) == registry_approve(web3)
+    before = timed("uncached", args.count, lambda: uncached_approve(web3))
+    after = timed("registry", args.count, lambda: registry_approve(web3))
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
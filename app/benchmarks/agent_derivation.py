@@ -0,0 +1,56 @@
+"""Benchmark: per-agent BIP44 derivation cost
+
+Compares the old path (seed + full m/44'/60'/0'/0/i derivation for every
+agent) with the cached change-level node used by generate_agent_wallet and
+generate_agent_wallets.
+
+Usage (from the repository root, AGENT_MNEMONIC set or --mnemonic given):
+    python -m app.benchmarks.agent_derivation [--count N]
+"""
+import argparse
+import os
+import time
+
+from bip_utils import Bip39MnemonicGenerator, Bip39SeedGenerator, Bip44, Bip44Changes, Bip44Coins
+from eth_account import Account
+
+
+def uncached_wallet(mnemonic: str, index: int) -> tuple[str, str]:
+    seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
+    bip44_def = Bip44.FromSeed(seed_bytes, Bip44Coins.ETHEREUM)
+    bip44_acc = bip44_def.Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT)
+    private_key = bip44_acc.AddressIndex(index).PrivateKey().Raw().ToHex()
+    return Account.from_key(private_key).address, private_key
+
+
+def timed(label: str, count: int, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    per_agent_ms = elapsed / count * 1000
+    print(f"{label:<22} {count} agents in {elapsed:.3f}s -> {per_agent_ms:.2f} ms/agent")
+    return per_agent_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--mnemonic", default=os.getenv('AGENT_MNEMONIC'))
+    args = parser.parse_args()
+
+    mnemonic = args.mnemonic or str(Bip39MnemonicGenerator().FromWordsNumber(12))
+    os.environ['AGENT_MNEMONIC'] = mnemonic
+
+    from app.db.database import generate_agent_wallet, generate_agent_wallets
+
+    uncached = timed("uncached", args.count, lambda: [uncached_wallet(mnemonic, i) for i in range(args.count)])
+    generate_agent_wallet(0)  # warm the change-level node
+    cached = timed("cached single", args.count, lambda: [generate_agent_wallet(i) for i in range(args.count)])
+    timed("cached batch", args.count, lambda: generate_agent_wallets(0, args.count))
+
+    assert uncached_wallet(mnemonic, 7) == generate_agent_wallet(7)
+    print(f"speedup: {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: per-call sqlite3.connect vs pooled WAL connections
+
+Runs the get_wallet lookup against a temporary wallets database, first with a
+fresh connection per query (the old behaviour) and then through
+ConnectionPool, from several threads.
+
+Usage (from the repository root):
+    python -m app.benchmarks.db_connections [--rows N] [--queries N] [--threads N]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.db.pool import ConnectionPool
+
+QUERY = "SELECT * FROM wallets WHERE user_address = ?"
+
+
+def seed(path: Path, rows: int) -> None:
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE wallets (
+            user_address TEXT PRIMARY KEY,
+            safe_address TEXT NOT NULL,
+            cobo_address TEXT,
+            agent_address TEXT,
+            agent_key TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO wallets (user_address, safe_address, cobo_address, agent_address, agent_key) VALUES (?, ?, ?, ?, ?)",
+        ((f"0x{i:040x}", f"0x{i + 1:040x}", f"0x{i + 2:040x}", f"0x{i + 3:040x}", f"{i:064x}") for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def per_call_lookup(path: Path, user_address: str) -> None:
+    if not path.exists():
+        raise RuntimeError("database missing")
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute(QUERY, (user_address,)).fetchone()
+    finally:
+        conn.close()
+
+
+def pooled_lookup(pool: ConnectionPool, user_address: str) -> None:
+    conn = pool.acquire()
+    try:
+        conn.execute(QUERY, (user_address,)).fetchone()
+    finally:
+        pool.release(conn)
+
+
+def run(label: str, fn, rows: int, queries: int, threads: int) -> float:
+    addresses = [f"0x{i % rows:040x}" for i in range(queries)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(fn, addresses))
+    elapsed = time.perf_counter() - started
+    qps = queries / elapsed
+    print(f"{label:<10} {queries} queries in {elapsed:.3f}s -> {qps:,.0f} q/s")
+    return qps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wallets.db"
+        seed(path, args.rows)
+        pool = ConnectionPool(path, size=args.threads)
+
+        per_call = run("per-call", lambda a: per_call_lookup(path, a), args.rows, args.queries, args.threads)
+        pooled = run("pooled", lambda a: pooled_lookup(pool, a), args.rows, args.queries, args.threads)
+        pool.close()
+
+    print(f"speedup: {pooled / per_call:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: transactions per wallet, sequential create_wallet vs ProvisioningPlanner
+
+Provisions one wallet against a local dev chain (e.g. an anvil fork of Sonic
+with the deployer funded) and counts the deployer's transactions from its
+nonce, along with total gas used and wall time. The batched path is expected
+to send exactly three transactions; the run fails if it sends more.
+
+--legacy also runs the old step-by-step pipeline. It reads the agent address
+from the wallets database (AuthorizerManager.setup_roles does), so it writes a
+row to app/data/wallets.db.
+
+Usage (from the repository root, RPC_URL pointing at the dev chain and
+deployer settings in .env):
+    python -m app.benchmarks.provisioning [--legacy] [--user ADDRESS]
+"""
+import argparse
+import os
+import sys
+import time
+
+from eth_account import Account
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from app.core.provider import get_web3
+from app.core.wallet.provisioning import ProvisioningPlanner, AUTHORIZERS
+
+BATCHED_TX_COUNT = 3
+
+
+def count_transactions(web3, settings, label: str, fn) -> int:
+    deployer = settings.DEPLOYER_ADDRESS
+    start_nonce = web3.eth.get_transaction_count(deployer)
+    start_block = web3.eth.block_number
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    tx_count = web3.eth.get_transaction_count(deployer) - start_nonce
+
+    gas_used = 0
+    for number in range(start_block + 1, web3.eth.block_number + 1):
+        block = web3.eth.get_block(number, full_transactions=True)
+        for tx in block['transactions']:
+            if tx['from'].lower() == deployer.lower():
+                gas_used += web3.eth.get_transaction_receipt(tx['hash'])['gasUsed']
+
+    print(f"{label:<10} {tx_count:3d} txs   {gas_used:>10,d} gas   {elapsed:7.1f} s")
+    return tx_count
+
+
+def provision_sequential(web3, settings, user_address: str) -> None:
+    from app.db.database import create_wallet_record, update_cobo_address
+    from app.core.wallet.safe_factory import SafeWalletFactory
+    from app.core.wallet.cobo_factory import CoboArgusFactory
+    from app.core.wallet.authorizer_manager import AuthorizerManager
+
+    safe_factory = SafeWalletFactory(web3, settings)
+    safe_address = safe_factory.create_safe_from_deployer()
+    create_wallet_record(user_address, safe_address)
+    cobo_address = CoboArgusFactory(web3, settings).create_cobo_for_safe(safe_address, user_address)
+    update_cobo_address(user_address, cobo_address)
+    authorizer_manager = AuthorizerManager(web3, settings)
+    for authorizer_type, role_name in AUTHORIZERS:
+        authorizer_manager.create_authorizer(cobo_address, user_address, authorizer_type, role_name)
+    safe_factory.transfer_ownership(safe_address, user_address)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="wallet owner (default: a fresh random address)")
+    parser.add_argument("--agent", help="agent address for the batched run (default: a fresh random address)")
+    parser.add_argument("--legacy", action="store_true", help="also run the sequential pipeline")
+    args = parser.parse_args()
+
+    settings = Settings()
+    web3 = get_web3(settings)
+    agent_address = args.agent or Account.create().address
+
+    batched = count_transactions(
+        web3, settings, "batched",
+        lambda: print(ProvisioningPlanner(web3, settings).provision(args.user or Account.create().address, agent_address))
+    )
+    if args.legacy:
+        sequential = count_transactions(
+            web3, settings, "sequential",
+            lambda: provision_sequential(web3, settings, args.user or Account.create().address)
+        )
+        print(f"transactions saved per wallet: {sequential - batched}")
+
+    if batched > BATCHED_TX_COUNT:
+        raise SystemExit(f"batched provisioning sent {batched} transactions, expected {BATCHED_TX_COUNT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: RPC round-trip latency with and without connection reuse
+
+Issues eth_blockNumber calls two ways: a fresh Web3(HTTPProvider) per call
+with no session reuse (a new TCP/TLS handshake each time, as the old tool
+functions effectively did under load), and the shared provider from
+app.core.provider. Prints mean and p95 latency for each.
+
+Usage (from the repository root, RPC_URL and deployer settings in .env):
+    python -m app.benchmarks.rpc_latency [--calls N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+from web3 import Web3
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from app.core.provider import get_web3
+
+
+def measure(label: str, calls: int, fn) -> list:
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<16} mean {statistics.mean(samples):7.2f} ms   p95 {p95:7.2f} ms")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    settings = Settings()
+
+    def fresh_provider():
+        session = requests.Session()
+        try:
+            Web3(Web3.HTTPProvider(settings.RPC_URL, session=session)).eth.block_number
+        finally:
+            session.close()
+
+    shared = get_web3(settings)
+    shared.eth.block_number  # open the pooled connection
+
+    before = measure("fresh provider", args.calls, fresh_provider)
+    after = measure("shared provider", args.calls, lambda: shared.eth.block_number)
+    print(f"mean speedup: {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark: single RPC endpoint vs PooledHTTPProvider against stub nodes
+
+Starts local stub JSON-RPC servers with injected latency: a fast node, a
+node with a slow tail (every few requests take much longer), and a node that
+drops every other request. Issues eth_blockNumber reads through a plain
+HTTPProvider pointed at the tail node (one endpoint stalls everything) and
+through PooledHTTPProvider over all three. It then sends raw transactions
+from two senders and checks that each sender stays on one node.
+
+Usage (from the repository root, no RPC node needed):
+    python -m app.benchmarks.rpc_pool [--calls N]
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_account import Account
+from web3 import Web3
+
+from app.core.rpc_pool import PooledHTTPProvider
+
+
+class StubNode:
+    """JSON-RPC stub answering every method with a dummy result"""
+
+    def __init__(self, name: str, latency: float, tail: float = 0.0, tail_every: int = 0, fail_every: int = 0):
+        self.name = name
+        self.latency = latency
+        self.tail = tail
+        self.tail_every = tail_every
+        self.fail_every = fail_every
+        self.requests = 0
+        self.raw_senders = Counter()
+        self._lock = threading.Lock()
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with node._lock:
+                    node.requests += 1
+                    count = node.requests
+                if node.fail_every and count % node.fail_every == 0:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                delay = node.latency * random.uniform(0.8, 1.2)
+                if node.tail_every and count % node.tail_every == 0:
+                    delay += node.tail
+                time.sleep(delay)
+                requests = body if isinstance(body, list) else [body]
+                responses = [node.answer(request) for request in requests]
+                payload = json.dumps(responses if isinstance(body, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def answer(self, request: dict) -> dict:
+        result = "0x10"
+        if request['method'] == 'eth_sendRawTransaction':
+            sender = Account.recover_transaction(request['params'][0])
+            with self._lock:
+                self.raw_senders[sender] += 1
+            result = "0x" + "00" * 32
+        return {"jsonrpc": "2.0", "id": request['id'], "result": result}
+
+
+def measure(label: str, calls: int, fn) -> list:
+    samples = []
+    errors = 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            errors += 1
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<16} mean {statistics.mean(samples):7.2f} ms   p95 {p95:7.2f} ms   max {samples[-1]:7.2f} ms   errors {errors}")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    fast = StubNode("fast", latency=0.010)
+    tail = StubNode("slow-tail", latency=0.008, tail=0.250, tail_every=5)
+    flaky = StubNode("flaky", latency=0.005, fail_every=2)
+    nodes = [fast, tail, flaky]
+
+    single = Web3(Web3.HTTPProvider(tail.url, request_kwargs={"timeout": 5}))
+    pooled_provider = PooledHTTPProvider([node.url for node in nodes], request_kwargs={"timeout": 5})
+    pooled = Web3(pooled_provider)
+
+    before = measure("single endpoint", args.calls, lambda: single.eth.block_number)
+    after = measure("pooled", args.calls, lambda: pooled.eth.block_number)
+    print(f"p95 improvement: {before[int(len(before) * 0.95) - 1] / after[int(len(after) * 0.95) - 1]:.1f}x")
+    print(f"hedged {pooled_provider.hedged} reads, hedge won {pooled_provider.hedge_wins}")
+    for uri, stats in pooled_provider.endpoint_stats().items():
+        name = next(node.name for node in nodes if node.url == uri)
+        print(f"  {name:<10} {stats}")
+
+    senders = [Account.create(), Account.create()]
+    for nonce in range(10):
+        for account in senders:
+            signed = account.sign_transaction({
+                'to': account.address, 'value': 0, 'gas': 21000, 'gasPrice': 1, 'nonce': nonce, 'chainId': 146
+            })
+            try:
+                pooled.eth.send_raw_transaction(signed.raw_transaction)
+            except Exception:
+                pass
+    for account in senders:
+        placement = {node.name: node.raw_senders[account.address] for node in nodes if node.raw_senders[account.address]}
+        print(f"sender {account.address[:10]}… sent via {placement}")
+
+    for node in nodes:
+        node.server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: reverse wallet lookups with and without secondary indexes
+
+Builds two temporary wallets databases with the same rows, one migrated up
+to the version before the reverse lookup indexes and one fully migrated,
+then times lookups by safe_address in both.
+
+Usage (from the repository root):
+    python -m app.benchmarks.wallet_lookups [--rows N] [--queries N]
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from app.db.migrations import WALLETS_MIGRATIONS, migrate
+
+QUERY = "SELECT * FROM wallets WHERE safe_address = ? COLLATE NOCASE"
+INDEX_VERSION = 3
+
+
+def build(path: Path, rows: int, target: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path))
+    migrate(conn, WALLETS_MIGRATIONS, target=target)
+    conn.executemany(
+        "INSERT INTO wallets (user_address, safe_address, cobo_address, agent_address, agent_key) VALUES (?, ?, ?, ?, ?)",
+        ((f"0x{i:040x}", f"0x{i + 1:040X}", f"0x{i + 2:040x}", f"0x{i + 3:040x}", f"{i:064x}") for i in range(rows))
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+
+def run(label: str, conn: sqlite3.Connection, safes: list) -> float:
+    started = time.perf_counter()
+    for safe in safes:
+        conn.execute(QUERY, (safe,)).fetchone()
+    elapsed = time.perf_counter() - started
+    qps = len(safes) / elapsed
+    print(f"{label:<10} {len(safes)} lookups in {elapsed:.3f}s -> {qps:,.0f} q/s")
+    return qps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    safes = [f"0x{random.randrange(args.rows) + 1:040x}" for _ in range(args.queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        scan = build(Path(tmp) / "scan.db", args.rows, target=INDEX_VERSION - 1)
+        indexed = build(Path(tmp) / "indexed.db", args.rows, target=INDEX_VERSION)
+
+        scan_qps = run("full scan", scan, safes)
+        indexed_qps = run("indexed", indexed, safes)
+        print(indexed.execute(f"EXPLAIN QUERY PLAN {QUERY}", (safes[0],)).fetchone()[-1])
+
+        scan.close()
+        indexed.close()
+
+    print(f"speedup: {indexed_qps / scan_qps:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
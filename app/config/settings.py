@@ -21,6 +21,36 @@ class Settings:
         
         self.RPC_URL = os.getenv('RPC_URL', 'https://rpc.soniclabs.com')
         self.CHAIN_ID = int(os.getenv('CHAIN_ID', '146'))
+        # Shared RPC session (see app/core/provider.py)
+        self.RPC_POOL_SIZE = int(os.getenv('RPC_POOL_SIZE', '20'))
+        self.RPC_TIMEOUT = float(os.getenv('RPC_TIMEOUT', '30'))
+        self.RPC_RETRIES = int(os.getenv('RPC_RETRIES', '0'))
+        self.RPC_KEEPALIVE = os.getenv('RPC_KEEPALIVE', 'True').lower() == 'true'
+        # Comma-separated list of RPC endpoints; more than one enables the pooled
+        # provider (see app/core/rpc_pool.py). Defaults to RPC_URL alone.
+        self.RPC_URLS = [
+            url.strip() for url in os.getenv('RPC_URLS', self.RPC_URL).split(',') if url.strip()
+        ]
+        self.RPC_HEDGE = os.getenv('RPC_HEDGE', 'True').lower() == 'true'
+        self.RPC_HEDGE_MIN_DELAY = float(os.getenv('RPC_HEDGE_MIN_DELAY', '0.05'))
+        self.RPC_MAX_FAILURES = int(os.getenv('RPC_MAX_FAILURES', '3'))
+        self.RPC_COOLDOWN = float(os.getenv('RPC_COOLDOWN', '30'))
+        # seconds after a send during which the sender's reads stay on its endpoint
+        self.RPC_READ_AFTER_WRITE = float(os.getenv('RPC_READ_AFTER_WRITE', '10'))
+        # RPC instrumentation (see app/core/rpc_metrics.py). Budgets cap RPC round
+        # trips per request, e.g. "/api/wallet/create=60,/api/ai_request=150";
+        # RPC_BUDGET_MODE 'log' only warns, 'fail' aborts the request
+        self.RPC_METRICS = os.getenv('RPC_METRICS', 'True').lower() == 'true'
+        self.RPC_CALL_BUDGETS = {
+            endpoint.strip(): int(budget)
+            for endpoint, budget in (
+                item.rsplit('=', 1) for item in os.getenv('RPC_CALL_BUDGETS', '').split(',') if '=' in item
+            )
+        }
+        self.RPC_BUDGET_MODE = os.getenv('RPC_BUDGET_MODE', 'log').lower()
+        # Per-block cache of eth_call / eth_getBalance reads (see app/core/read_cache.py)
+        self.READ_CACHE = os.getenv('READ_CACHE', 'True').lower() == 'true'
+        self.READ_CACHE_MAX = int(os.getenv('READ_CACHE_MAX', '10000'))
         self.SAFE_SERVICE_URL = os.getenv('SAFE_SERVICE_URL', 'https://safe-transaction.sonic.guru')
         self.AI_SERVICE_URL = os.getenv('AI_SERVICE_URL')
         self.AI_SERVICE_KEY = os.getenv('AI_SERVICE_KEY')
@@ -28,6 +58,43 @@ class Settings:
         self.COBO_FACTORY_ADDRESS = os.getenv('COBO_FACTORY_ADDRESS', "0x14149ab9476c12ab55ef6831cbE973B77De7f2Ac")
         self.ARGUS_HELPER_ADDRESS = os.getenv('ARGUS_HELPER_ADDRESS', "0xBBb7412f5dAc3Ed358C42E34b51BA2256fb3EB17")
         self.MULTISEND_ADDRESS = os.getenv('MULTISEND_ADDRESS', "0x38869bf66a61cF6bDB996A6aE40D5853Fd43B526")    
+        # Wallet provisioning: three batched MultiSend transactions (see
+        # app/core/wallet/provisioning.py) instead of the step-by-step pipeline
+        self.PROVISIONING_BATCHED = os.getenv('PROVISIONING_BATCHED', 'True').lower() == 'true'
+        # Background provisioning jobs (see app/services/provisioning_queue.py):
+        # worker threads, max unfinished jobs per process, job lease seconds
+        self.PROVISIONING_WORKERS = int(os.getenv('PROVISIONING_WORKERS', '2'))
+        self.PROVISIONING_MAX_QUEUED = int(os.getenv('PROVISIONING_MAX_QUEUED', '50'))
+        self.PROVISIONING_LEASE = float(os.getenv('PROVISIONING_LEASE', '60'))
+        # /api/info APR cache: background refresh period and max age before marked stale
+        self.APR_REFRESH_INTERVAL = float(os.getenv('APR_REFRESH_INTERVAL', '30'))
+        self.APR_TTL = float(os.getenv('APR_TTL', '60'))
+        self.MULTICALL3_ADDRESS = os.getenv('MULTICALL3_ADDRESS', "0xcA11bde05977b3631167028862bE2a173976CA11")
+        # Block watcher (see app/core/block_watcher.py): newHeads over websocket
+        # when WS_RPC_URL is set, eth_blockNumber polling otherwise
+        self.WS_RPC_URL = os.getenv('WS_RPC_URL')
+        self.BLOCK_POLL_INTERVAL = float(os.getenv('BLOCK_POLL_INTERVAL', '1'))
+        self.BLOCK_CATCHUP_MAX = int(os.getenv('BLOCK_CATCHUP_MAX', '20'))
+        # Background receipt tracker (see app/core/tx_tracker.py); receipts come
+        # from the block watcher, TX_POLL_INTERVAL is the slower reconcile pass
+        self.TX_POLL_INTERVAL = float(os.getenv('TX_POLL_INTERVAL', '5'))
+        self.TX_POLL_BATCH_SIZE = int(os.getenv('TX_POLL_BATCH_SIZE', '100'))
+        self.TX_PENDING_TIMEOUT = float(os.getenv('TX_PENDING_TIMEOUT', '600'))
+        self.TX_TRACKER_KEEP = int(os.getenv('TX_TRACKER_KEEP', '10000'))
+        self.TX_WAIT_TIMEOUT = float(os.getenv('TX_WAIT_TIMEOUT', '120'))
+        # Transaction fees (see app/core/fee_oracle.py): 'eip1559' or 'legacy'
+        self.FEE_STRATEGY = os.getenv('FEE_STRATEGY', 'eip1559')
+        self.FEE_CACHE_TTL = float(os.getenv('FEE_CACHE_TTL', '3'))
+        self.FEE_BASE_MULTIPLIER = float(os.getenv('FEE_BASE_MULTIPLIER', '2'))
+        self.GAS_PRICE_MULTIPLIER = float(os.getenv('GAS_PRICE_MULTIPLIER', '1'))
+        # Gas limits (see app/core/gas_estimator.py): estimate * (1 + margin), the
+        # margin decays towards GAS_MARGIN_MIN as receipts come in
+        self.GAS_MARGIN = float(os.getenv('GAS_MARGIN', '0.25'))
+        self.GAS_MARGIN_MIN = float(os.getenv('GAS_MARGIN_MIN', '0.1'))
+        self.GAS_MARGIN_MAX = float(os.getenv('GAS_MARGIN_MAX', '1.0'))
+        self.GAS_ESTIMATE_TTL = float(os.getenv('GAS_ESTIMATE_TTL', '600'))
+        # Upper bound for ?timeout= on GET /api/wallet/tx/<hash>
+        self.TX_LONG_POLL_MAX = float(os.getenv('TX_LONG_POLL_MAX', '30'))
 
 
         # Deployer settings
@@ -46,6 +113,11 @@ class Settings:
         )
 
         self.OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+        
+        # Assistant threads are rotated once they hold this many messages
+        self.THREAD_MAX_MESSAGES = int(os.getenv('THREAD_MAX_MESSAGES', '40'))
+        # Number of previous thread ids kept in threads.last_threads
+        self.THREAD_HISTORY_KEEP = int(os.getenv('THREAD_HISTORY_KEEP', '10'))
     
     ENABLE_TELEGRAM_BOT: bool = False
     TELEGRAM_TOKEN: Optional[str] = None
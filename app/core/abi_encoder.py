@@ -0,0 +1,108 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from app.core.abi_registry import get_abi_registry
+
+Normalizer = Optional[Callable[[Any], Any]]
+
+_encoders: Dict[Tuple[str, str, int], "FunctionEncoder"] = {}
+
+
+def _to_bytes(value: Any) -> Any:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    return value
+
+
+def _normalizer(abi_input: Dict[str, Any]) -> Normalizer:
+    """Converter from web3-style arguments to what eth_abi.encode expects
+
+    Structs may be passed as dicts and bytes as hex strings, like with
+    Contract.encode_abi. Returns None when the value can be passed as is.
+    """
+    abi_type = abi_input['type']
+    if abi_type.endswith(']'):
+        element = _normalizer({**abi_input, 'type': abi_type[:abi_type.rindex('[')]})
+        if element is None:
+            return None
+        return lambda values: [element(value) for value in values]
+
+    if abi_type == 'tuple':
+        components = abi_input['components']
+        names = [component['name'] for component in components]
+        normalizers = [_normalizer(component) for component in components]
+
+        def normalize_tuple(value: Any) -> tuple:
+            if isinstance(value, dict):
+                value = [value[name] for name in names]
+            return tuple(
+                normalize(item) if normalize else item
+                for normalize, item in zip(normalizers, value)
+            )
+
+        return normalize_tuple
+
+    if abi_type.startswith('bytes'):
+        return _to_bytes
+    return None
+
+
+class FunctionEncoder:
+    """Calldata encoder for one function: 4-byte selector + eth_abi.encode(args)
+
+    Returns bytes directly instead of the 0x-hex string of
+    Contract.encode_abi, so call sites need no bytes.fromhex round trip.
+    """
+
+    __slots__ = ('signature', 'selector', 'types', 'normalizers')
+
+    def __init__(self, fn_abi: Dict[str, Any]):
+        inputs = fn_abi.get('inputs', [])
+        self.types: List[str] = [collapse_if_tuple(abi_input) for abi_input in inputs]
+        self.signature = f"{fn_abi['name']}({','.join(self.types)})"
+        self.selector: bytes = function_abi_to_4byte_selector(fn_abi)
+        normalizers = [_normalizer(abi_input) for abi_input in inputs]
+        self.normalizers = normalizers if any(normalizers) else None
+
+    def encode(self, *args: Any) -> bytes:
+        if len(args) != len(self.types):
+            raise ValueError(f"{self.signature} takes {len(self.types)} arguments, got {len(args)}")
+        if self.normalizers is not None:
+            args = [
+                normalize(arg) if normalize else arg
+                for normalize, arg in zip(self.normalizers, args)
+            ]
+        return self.selector + encode(self.types, args)
+
+    __call__ = encode
+
+
+def get_encoder(contract_name: str, fn_name: str, arg_count: int) -> FunctionEncoder:
+    """Encoder for contract_name.fn_name, resolving overloads by argument count
+
+    Args:
+        contract_name: ABI file name (without .json)
+        fn_name: Function name
+        arg_count: Number of arguments
+    """
+    key = (contract_name, fn_name, arg_count)
+    encoder = _encoders.get(key)
+    if encoder is None:
+        entries = get_abi_registry().get(contract_name).functions.get(fn_name, [])
+        for entry in entries:
+            if len(entry.get('inputs', [])) == arg_count:
+                encoder = _encoders[key] = FunctionEncoder(entry)
+                break
+        else:
+            raise ValueError(f"Function {contract_name}.{fn_name} with {arg_count} args not found in ABI")
+    return encoder
+
+
+def encode_call(contract_name: str, fn_name: str, *args: Any) -> bytes:
+    """Calldata for contract_name.fn_name(*args)
+
+    Example:
+        data = encode_call("ERC20", "approve", spender, amount)
+    """
+    return get_encoder(contract_name, fn_name, len(args)).encode(*args)
@@ -0,0 +1,140 @@
+import json
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from eth_utils.abi import abi_to_signature
+from web3 import Web3
+from web3.contract import Contract
+from app.db.cache import LRUCache
+
+ABI_DIR = Path(__file__).parent.parent / "abi"
+
+_lock = threading.Lock()
+_registry: Optional["AbiRegistry"] = None
+
+
+class ContractAbi:
+    """Parsed ABI of one contract with precomputed selectors and event topics"""
+
+    __slots__ = ('name', 'abi', 'selectors', 'topics', 'functions')
+
+    def __init__(self, name: str, abi: List[Dict[str, Any]]):
+        self.name = name
+        self.abi = abi
+        # function name -> ABI entries (several when overloaded)
+        self.functions: Dict[str, List[Dict[str, Any]]] = {}
+        # 'transfer(address,uint256)' -> b'\xa9\x05\x9c\xbb'
+        self.selectors: Dict[str, bytes] = {}
+        # 'Transfer(address,address,uint256)' -> 32-byte topic0
+        self.topics: Dict[str, bytes] = {}
+        for entry in abi:
+            if entry.get('type') == 'function':
+                self.functions.setdefault(entry['name'], []).append(entry)
+                self.selectors[abi_to_signature(entry)] = function_abi_to_4byte_selector(entry)
+            elif entry.get('type') == 'event':
+                self.topics[abi_to_signature(entry)] = event_abi_to_log_topic(entry)
+
+    def selector(self, fn_name: str) -> bytes:
+        """4-byte selector of a function, by name or full signature"""
+        if '(' in fn_name:
+            return self.selectors[fn_name]
+        entries = self.functions.get(fn_name)
+        if not entries:
+            raise KeyError(f"{self.name} has no function {fn_name}")
+        if len(entries) > 1:
+            raise KeyError(f"{self.name}.{fn_name} is overloaded, pass the full signature")
+        return function_abi_to_4byte_selector(entries[0])
+
+    def topic(self, event_name: str) -> bytes:
+        """topic0 of an event, by name or full signature"""
+        if '(' in event_name:
+            return self.topics[event_name]
+        for signature, topic in self.topics.items():
+            if signature.split('(', 1)[0] == event_name:
+                return topic
+        raise KeyError(f"{self.name} has no event {event_name}")
+
+
+class AbiRegistry:
+    """Every ABI in app/abi/ parsed once, plus memoized Contract objects
+
+    Contract objects are cached per Web3 instance by (name, address); they
+    hold no per-call state, so one instance is shared by every caller.
+
+    Example:
+        registry = get_abi_registry()
+        erc20 = registry.contract(web3, "ERC20", token_address)
+        approve_selector = registry.get("ERC20").selector("approve")
+    """
+
+    def __init__(self, abi_dir: Path = ABI_DIR, contract_cache_size: int = 4096):
+        self._abis: Dict[str, ContractAbi] = {}
+        for path in sorted(abi_dir.glob("*.json")):
+            with open(path, "r") as f:
+                self._abis[path.stem] = ContractAbi(path.stem, json.load(f))
+        self.contract_cache_size = contract_cache_size
+        self._contracts_lock = threading.Lock()
+        self._contracts: "weakref.WeakKeyDictionary[Web3, LRUCache]" = weakref.WeakKeyDictionary()
+
+    def names(self) -> List[str]:
+        return list(self._abis)
+
+    def get(self, name: str) -> ContractAbi:
+        """Parsed ABI by file name (without .json)
+
+        Raises:
+            FileNotFoundError: If there is no such ABI file
+        """
+        try:
+            return self._abis[name]
+        except KeyError:
+            raise FileNotFoundError(f"ABI file not found: {ABI_DIR / f'{name}.json'}")
+
+    def abi(self, name: str) -> List[Dict[str, Any]]:
+        """Raw ABI list by file name (without .json)"""
+        return self.get(name).abi
+
+    def contract(self, web3: Web3, name: str, address: Optional[str] = None) -> Contract:
+        """Contract object for name at address, created once per Web3 instance
+
+        Args:
+            web3: Web3 instance
+            name: ABI file name (without .json)
+            address: Contract address, None for an address-less contract (encoding only)
+
+        Returns:
+            Contract: Shared contract object
+        """
+        if address is not None:
+            address = Web3.to_checksum_address(address)
+        with self._contracts_lock:
+            contracts = self._contracts.get(web3)
+            if contracts is None:
+                contracts = self._contracts[web3] = LRUCache(maxsize=self.contract_cache_size)
+        key = (name, address)
+        contract = contracts.get(key)
+        if contract is None:
+            abi = self.abi(name)
+            contract = web3.eth.contract(address=address, abi=abi) if address else web3.eth.contract(abi=abi)
+            contracts.put(key, contract)
+        return contract
+
+    def stats(self) -> Dict[str, Any]:
+        with self._contracts_lock:
+            caches = list(self._contracts.values())
+        return {
+            'abis': len(self._abis),
+            'contracts': [cache.stats() for cache in caches]
+        }
+
+
+def get_abi_registry() -> AbiRegistry:
+    """Get the process-wide ABI registry (loads app/abi/ on first use)"""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = AbiRegistry()
+    return _registry
@@ -0,0 +1,190 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from web3 import Web3
+from config.settings import Settings
+from app.core.rpc_batch import RpcBatch, to_int
+from app.core.rpc_metrics import provider_request_fns
+
+_lock = threading.Lock()
+_watcher: Optional["BlockWatcher"] = None
+
+BlockListener = Callable[[int, List[Dict[str, Any]]], None]
+
+# JSON-RPC "method not found" / "method not supported"
+_UNSUPPORTED_CODES = (-32601, -32004)
+
+
+class BlockWatcher:
+    """Follows new blocks and resolves watched transactions from them
+
+    Heads come from a websocket newHeads subscription when WS_RPC_URL is set,
+    otherwise (or while the socket is down) from polling eth_blockNumber.
+    For every new block that may contain a watched hash, all receipts of the
+    block are fetched in one eth_getBlockReceipts call. Nodes without that
+    method get one batched eth_getTransactionReceipt per watched hash instead.
+
+    Listeners are called for each block with its number and the receipts of
+    the watched transactions it mined (raw JSON-RPC dicts, often empty).
+
+    Example:
+        watcher = get_block_watcher(web3)
+        watcher.add_listener(lambda number, receipts: ...)
+        watcher.watch(tx_hash)
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.ws_url = settings.WS_RPC_URL
+        self.poll_interval = settings.BLOCK_POLL_INTERVAL
+        self.catchup_max = settings.BLOCK_CATCHUP_MAX
+        self._lock = threading.Lock()
+        self._listeners: List[BlockListener] = []
+        self._watched: Set[str] = set()
+        self._last_block: Optional[int] = None
+        self._block_receipts_supported = True
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.source: Optional[str] = None
+
+    def start(self) -> None:
+        """Start following blocks (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="block-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def add_listener(self, callback: BlockListener) -> None:
+        """Call callback(block_number, receipts) for every new block"""
+        with self._lock:
+            self._listeners.append(callback)
+        self.start()
+
+    def watch(self, tx_hash: str) -> None:
+        """Report the receipt of tx_hash to listeners once it is mined"""
+        with self._lock:
+            self._watched.add(tx_hash.lower())
+        self.start()
+
+    def unwatch(self, tx_hashes: Iterable[str]) -> None:
+        with self._lock:
+            self._watched.difference_update(tx_hash.lower() for tx_hash in tx_hashes)
+
+    @property
+    def last_block(self) -> Optional[int]:
+        return self._last_block
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.ws_url:
+                try:
+                    self._follow_websocket()
+                except Exception as e:
+                    print(f"[BlockWatcher] Websocket error, falling back to polling: {str(e)}")
+            # poll until it is time to retry the websocket (or forever without one)
+            self._follow_polling(retry_after=30 if self.ws_url else None)
+
+    def _follow_websocket(self) -> None:
+        from websockets.sync.client import connect
+
+        with connect(self.ws_url, open_timeout=10) as ws:
+            ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_subscribe",
+                "params": ["newHeads"]
+            }))
+            self.source = "websocket"
+            while not self._stop.is_set():
+                message = json.loads(ws.recv())
+                if 'error' in message:
+                    raise RuntimeError(message['error'])
+                params = message.get('params')
+                if params and params.get('result'):
+                    self._on_head(to_int(params['result']['number']))
+
+    def _follow_polling(self, retry_after: Optional[float]) -> None:
+        self.source = "polling"
+        started = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._on_head(self.web3.eth.block_number)
+            except Exception as e:
+                print(f"[BlockWatcher] Block poll failed: {str(e)}")
+            if retry_after is not None and time.monotonic() - started >= retry_after:
+                return
+            self._stop.wait(self.poll_interval)
+
+    def _on_head(self, head: int) -> None:
+        """Process every block up to head that has not been seen yet"""
+        if self._last_block is None:
+            self._last_block = head - 1
+        if head <= self._last_block:
+            return
+
+        first = max(self._last_block + 1, head - self.catchup_max + 1)
+        for block_number in range(first, head + 1):
+            try:
+                receipts = self._matched_receipts(block_number)
+            except Exception as e:
+                print(f"[BlockWatcher] Receipts for block {block_number} failed: {str(e)}")
+                receipts = []
+            self._last_block = block_number
+            self._notify(block_number, receipts)
+
+    def _matched_receipts(self, block_number: int) -> List[Dict[str, Any]]:
+        """Receipts of watched transactions mined in block_number"""
+        with self._lock:
+            watched = set(self._watched)
+        if not watched:
+            return []
+
+        if self._block_receipts_supported:
+            make_request, _ = provider_request_fns(self.web3)
+            response = make_request("eth_getBlockReceipts", [hex(block_number)])
+            error = response.get('error')
+            if error and error.get('code') in _UNSUPPORTED_CODES:
+                print("[BlockWatcher] eth_getBlockReceipts not supported, using per-hash receipts")
+                self._block_receipts_supported = False
+            elif error:
+                raise RuntimeError(error)
+            else:
+                receipts = [
+                    receipt for receipt in response.get('result') or []
+                    if receipt['transactionHash'].lower() in watched
+                ]
+                self.unwatch(receipt['transactionHash'] for receipt in receipts)
+                return receipts
+
+        with RpcBatch(self.web3, "BlockWatcher.receipts") as batch:
+            items = [batch.add("eth_getTransactionReceipt", [tx_hash]) for tx_hash in watched]
+        receipts = [item.result for item in items if item.result is not None]
+        self.unwatch(receipt['transactionHash'] for receipt in receipts)
+        return receipts
+
+    def _notify(self, block_number: int, receipts: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(block_number, receipts)
+            except Exception as e:
+                print(f"[BlockWatcher] Listener failed: {str(e)}")
+
+
+def get_block_watcher(web3: Optional[Web3] = None) -> BlockWatcher:
+    """Get the process-wide block watcher"""
+    global _watcher
+    if _watcher is None:
+        with _lock:
+            if _watcher is None:
+                if web3 is None:
+                    from app.core.provider import get_web3
+                    web3 = get_web3()
+                _watcher = BlockWatcher(web3, Settings())
+    return _watcher
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+from web3 import Web3
+from config.settings import Settings
+from app.core.rpc_batch import RpcBatch, to_int
+from app.core.block_watcher import get_block_watcher
+
+_lock = threading.Lock()
+_oracle: Optional["FeeOracle"] = None
+
+
+class Fees:
+    """Fee data of one block"""
+
+    __slots__ = ('block_number', 'base_fee', 'priority_fee', 'gas_price', 'fetched_at')
+
+    def __init__(self, block_number: int, base_fee: Optional[int], priority_fee: int, gas_price: int):
+        self.block_number = block_number
+        self.base_fee = base_fee
+        self.priority_fee = priority_fee
+        self.gas_price = gas_price
+        self.fetched_at = time.monotonic()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'block_number': self.block_number,
+            'base_fee': self.base_fee,
+            'priority_fee': self.priority_fee,
+            'gas_price': self.gas_price
+        }
+
+
+class FeeStrategy:
+    """Turns cached fee data into transaction fee fields"""
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+    def fee_fields(self, fees: Fees) -> Dict[str, int]:
+        raise NotImplementedError
+
+
+class LegacyFeeStrategy(FeeStrategy):
+    """Type 0 transactions: gasPrice = node gas price * GAS_PRICE_MULTIPLIER"""
+
+    def fee_fields(self, fees: Fees) -> Dict[str, int]:
+        return {'gasPrice': int(fees.gas_price * self.settings.GAS_PRICE_MULTIPLIER)}
+
+
+class Eip1559FeeStrategy(FeeStrategy):
+    """Type 2 transactions: maxFee = base fee * FEE_BASE_MULTIPLIER + priority fee
+
+    The multiplier leaves headroom for base fee increases over the next
+    blocks; only base fee + priority fee is actually paid. Falls back to
+    legacy pricing on chains without a base fee.
+    """
+
+    def fee_fields(self, fees: Fees) -> Dict[str, int]:
+        if fees.base_fee is None:
+            return LegacyFeeStrategy(self.settings).fee_fields(fees)
+        priority_fee = fees.priority_fee
+        return {
+            'maxPriorityFeePerGas': priority_fee,
+            'maxFeePerGas': int(fees.base_fee * self.settings.FEE_BASE_MULTIPLIER) + priority_fee
+        }
+
+
+FEE_STRATEGIES: Dict[str, Type[FeeStrategy]] = {
+    'legacy': LegacyFeeStrategy,
+    'eip1559': Eip1559FeeStrategy
+}
+
+
+def register_fee_strategy(name: str, strategy: Type[FeeStrategy]) -> None:
+    """Make a custom strategy selectable through FEE_STRATEGY"""
+    FEE_STRATEGIES[name] = strategy
+
+
+class FeeOracle:
+    """Per-block cache of base fee, priority fee and gas price
+
+    Fee data is fetched in one batched round trip and reused until the block
+    watcher reports a new block (or FEE_CACHE_TTL expires when no new block is
+    seen), so a burst of transactions costs one fee lookup per block.
+
+    Example:
+        tx = contract.functions.foo().build_transaction(get_fee_oracle(web3).apply({
+            'from': sender,
+            'gas': 100000,
+            'nonce': nonce
+        }))
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.ttl = settings.FEE_CACHE_TTL
+        strategy_cls = FEE_STRATEGIES.get(settings.FEE_STRATEGY)
+        if strategy_cls is None:
+            raise ValueError(f"Unknown fee strategy: {settings.FEE_STRATEGY}")
+        self.strategy = strategy_cls(settings)
+        self._lock = threading.Lock()
+        self._fees: Optional[Fees] = None
+        self._priority_fee_supported = True
+        get_block_watcher(web3).add_listener(self._on_block)
+
+    def _on_block(self, block_number: int, receipts: list) -> None:
+        fees = self._fees
+        if fees is not None and block_number > fees.block_number:
+            self._fees = None
+
+    def _fetch(self) -> Fees:
+        with RpcBatch(self.web3, "FeeOracle.fetch") as batch:
+            block = batch.add("eth_getBlockByNumber", ["latest", False])
+            gas_price = batch.gas_price()
+            priority_fee = batch.add("eth_maxPriorityFeePerGas", [], to_int) if self._priority_fee_supported else None
+
+        base_fee = block.result.get('baseFeePerGas')
+        base_fee = to_int(base_fee) if base_fee is not None else None
+        try:
+            priority = priority_fee.result if priority_fee is not None else None
+        except Exception:
+            # node without eth_maxPriorityFeePerGas
+            self._priority_fee_supported = False
+            priority = None
+        if priority is None:
+            priority = max(gas_price.result - (base_fee or 0), 0)
+
+        return Fees(to_int(block.result['number']), base_fee, priority, gas_price.result)
+
+    def current(self) -> Fees:
+        """Fee data of the latest block, fetched at most once per block"""
+        fees = self._fees
+        if fees is not None and time.monotonic() - fees.fetched_at < self.ttl:
+            return fees
+        with self._lock:
+            fees = self._fees
+            if fees is None or time.monotonic() - fees.fetched_at >= self.ttl:
+                fees = self._fees = self._fetch()
+            return fees
+
+    def fee_fields(self) -> Dict[str, int]:
+        """Fee fields for a new transaction from the configured strategy"""
+        return self.strategy.fee_fields(self.current())
+
+    def apply(self, tx_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return tx_params with fee fields filled in (replacing any existing ones)"""
+        params = {
+            key: value for key, value in tx_params.items()
+            if key not in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas')
+        }
+        params.update(self.fee_fields())
+        return params
+
+
+def get_fee_oracle(web3: Optional[Web3] = None) -> FeeOracle:
+    """Get the process-wide fee oracle shared by every signer"""
+    global _oracle
+    if _oracle is None:
+        with _lock:
+            if _oracle is None:
+                if web3 is None:
+                    from app.core.provider import get_web3
+                    web3 = get_web3()
+                _oracle = FeeOracle(web3, Settings())
+    return _oracle
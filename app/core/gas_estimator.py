@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from web3 import Web3
+from config.settings import Settings
+from app.core.rpc_batch import to_int
+from app.core.tx_tracker import get_receipt_tracker, normalize_tx_hash
+
+_lock = threading.Lock()
+_estimator: Optional["GasEstimator"] = None
+
+Shape = Tuple[str, str, int]
+
+# calldata is bucketed by size so e.g. a 3-call and a 30-call MultiSend get separate entries
+_SIZE_BUCKET = 512
+# a transaction using more than this share of its limit widens the margin
+_NEAR_LIMIT = 0.9
+
+
+def call_shape(to: str, data: Union[bytes, str]) -> Shape:
+    """Cache key of a call: target, 4-byte selector and calldata size bucket
+
+    For Cobo and Safe exec transactions pass the inner call, the outer
+    selector is always the same execTransaction.
+    """
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    return (to.lower(), data[:4].hex(), len(data) // _SIZE_BUCKET)
+
+
+class _GasEntry:
+    __slots__ = ('estimate', 'max_used', 'samples', 'margin', 'estimated_at')
+
+    def __init__(self, estimate: int, margin: float):
+        self.estimate = estimate
+        self.max_used = 0
+        self.samples = 0
+        self.margin = margin
+        self.estimated_at = time.monotonic()
+
+    def limit(self) -> int:
+        return int(max(self.estimate, self.max_used) * (1 + self.margin))
+
+
+class GasEstimator:
+    """Caches gas limits per call shape instead of hard-coding them
+
+    The first transaction of a shape calls eth_estimateGas. Later ones reuse
+    the cached value plus a safety margin until GAS_ESTIMATE_TTL expires.
+    Actual gasUsed from mined receipts feeds back into the entry: the margin
+    shrinks towards GAS_MARGIN_MIN as samples accumulate and doubles (up to
+    GAS_MARGIN_MAX) when a transaction comes close to its limit. If
+    estimation fails the caller's default limit is used.
+
+    Example:
+        estimator = get_gas_estimator(web3)
+        shape = call_shape(call_data.to, call_data.data)
+        gas = estimator.gas_limit({'from': sender, 'to': cobo, 'data': data}, shape, default=800000)
+        ...
+        estimator.observe(tx_hash, shape, gas)
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.margin = settings.GAS_MARGIN
+        self.margin_min = settings.GAS_MARGIN_MIN
+        self.margin_max = settings.GAS_MARGIN_MAX
+        self.ttl = settings.GAS_ESTIMATE_TTL
+        self._lock = threading.Lock()
+        self._entries: Dict[Shape, _GasEntry] = {}
+        self._in_flight: "OrderedDict[str, Tuple[Shape, int]]" = OrderedDict()
+        get_receipt_tracker(web3).add_listener(self._on_receipt)
+
+    def gas_limit(self, tx: Dict[str, Any], shape: Shape, default: int) -> int:
+        """Gas limit for tx
+
+        Args:
+            tx: Transaction fields used for estimation (from, to, data, value)
+            shape: Cache key from call_shape()
+            default: Limit to use if estimation fails
+
+        Returns:
+            int: Gas limit
+        """
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is not None and time.monotonic() - entry.estimated_at < self.ttl:
+                return entry.limit()
+
+        try:
+            estimate = self.web3.eth.estimate_gas({
+                key: value for key, value in tx.items()
+                if key in ('from', 'to', 'data', 'value')
+            })
+        except Exception as e:
+            print(f"[GasEstimator] Estimation failed for {shape}, using {default}: {str(e)}")
+            return entry.limit() if entry is not None else default
+
+        with self._lock:
+            if entry is None:
+                entry = self._entries[shape] = _GasEntry(estimate, self.margin)
+            else:
+                entry.estimate = estimate
+                entry.estimated_at = time.monotonic()
+            return entry.limit()
+
+    def observe(self, tx_hash: Any, shape: Shape, gas_limit: int) -> None:
+        """Remember which shape and limit a sent transaction used"""
+        with self._lock:
+            self._in_flight[normalize_tx_hash(tx_hash)] = (shape, gas_limit)
+            while len(self._in_flight) > 10000:
+                self._in_flight.popitem(last=False)
+
+    def _on_receipt(self, tx_hash: str, receipt: Dict[str, Any]) -> None:
+        with self._lock:
+            observed = self._in_flight.pop(tx_hash.lower(), None)
+            if observed is None:
+                return
+            shape, gas_limit = observed
+            entry = self._entries.get(shape)
+            if entry is None:
+                return
+            gas_used = to_int(receipt['gasUsed'])
+            entry.samples += 1
+            entry.max_used = max(entry.max_used, gas_used)
+            if gas_used >= gas_limit * _NEAR_LIMIT:
+                entry.margin = min(entry.margin * 2, self.margin_max)
+            else:
+                entry.margin = max(self.margin_min, entry.margin * 0.9)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cached entries keyed by 'target:selector:bucket'"""
+        with self._lock:
+            return {
+                f"{shape[0]}:{shape[1]}:{shape[2]}": {
+                    'estimate': entry.estimate,
+                    'max_used': entry.max_used,
+                    'samples': entry.samples,
+                    'margin': round(entry.margin, 3),
+                    'limit': entry.limit()
+                }
+                for shape, entry in self._entries.items()
+            }
+
+
+def get_gas_estimator(web3: Optional[Web3] = None) -> GasEstimator:
+    """Get the process-wide gas estimator"""
+    global _estimator
+    if _estimator is None:
+        with _lock:
+            if _estimator is None:
+                if web3 is None:
+                    from app.core.provider import get_web3
+                    web3 = get_web3()
+                _estimator = GasEstimator(web3, Settings())
+    return _estimator
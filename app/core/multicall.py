@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Sequence
+from eth_abi import decode
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+from web3.contract import Contract
+from config.settings import Settings
+from app.core.rpc_batch import find_function_abi
+from app.core.abi_registry import get_abi_registry
+
+
+class Multicall:
+    """Collects contract reads and runs them as a single Multicall3 aggregate3 eth_call
+
+    Each read is queued with add() and gets back its position in the result
+    list. Reads queued with allow_failure=True return None when they revert
+    instead of failing the whole batch.
+
+    Example:
+        multicall = Multicall(web3, settings)
+        for silo in silos:
+            multicall.add(silo_lens, "getDepositAPR", [silo])
+        aprs = multicall.execute()
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.contract = get_abi_registry().contract(web3, "Multicall3", settings.MULTICALL3_ADDRESS)
+        self._calls: List[Dict[str, Any]] = []
+
+    def add(
+        self,
+        contract: Contract,
+        fn_name: str,
+        args: Sequence[Any] = (),
+        allow_failure: bool = True
+    ) -> int:
+        """Queue a read
+
+        Args:
+            contract: Target contract instance (provides address and ABI)
+            fn_name: View function name
+            args: Function arguments
+            allow_failure: Return None for this read instead of reverting the batch
+
+        Returns:
+            int: Index of this read in the execute() result
+        """
+        fn_abi = find_function_abi(contract, fn_name, len(args))
+        data = contract.encode_abi(fn_name, args=list(args))
+
+        self._calls.append({
+            'target': contract.address,
+            'allow_failure': allow_failure,
+            'data': bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),
+            'output_types': [collapse_if_tuple(output) for output in fn_abi['outputs']]
+        })
+        return len(self._calls) - 1
+
+    def execute(self, block_identifier: Any = 'latest') -> List[Optional[Any]]:
+        """Run all queued reads in one eth_call and decode the results
+
+        Single-output functions are unwrapped; multi-output functions return
+        a tuple. Failed reads (allow_failure=True) come back as None.
+        """
+        if not self._calls:
+            return []
+
+        results = self.contract.functions.aggregate3([
+            (call['target'], call['allow_failure'], call['data'])
+            for call in self._calls
+        ]).call(block_identifier=block_identifier)
+
+        decoded = []
+        for call, (success, return_data) in zip(self._calls, results):
+            if not success or not return_data:
+                decoded.append(None)
+                continue
+            try:
+                values = decode(call['output_types'], return_data)
+            except Exception:
+                decoded.append(None)
+                continue
+            decoded.append(values[0] if len(values) == 1 else values)
+
+        self._calls = []
+        return decoded
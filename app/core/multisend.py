@@ -0,0 +1,111 @@
+import struct
+from typing import Any, Dict, Iterable, Iterator
+from app.core.abi_encoder import encode_call
+
+OPERATION_CALL = 0
+OPERATION_DELEGATECALL = 1
+
+# operation(1) + to(20) + value(32) + data length(32, only the low 8 bytes are used)
+_HEADER = struct.Struct('>B20s32s24xQ')
+_ZERO_WORD = bytes(32)
+
+
+# MultiSend targets repeat (MultiSend helpers, role managers), so their
+# decoded form is reused instead of parsing hex for every operation
+_ADDRESS_CACHE_MAX = 1024
+_address_cache: Dict[str, bytes] = {}
+
+
+def _address_bytes(address: str) -> bytes:
+    raw = _address_cache.get(address)
+    if raw is None:
+        raw = bytes.fromhex(address[2:] if address.startswith('0x') else address)
+        if len(raw) != 20:
+            raise ValueError(f"Invalid address: {address}")
+        if len(_address_cache) >= _ADDRESS_CACHE_MAX:
+            _address_cache.clear()
+        _address_cache[address] = raw
+    return raw
+
+
+class CallData:
+    """Cobo execTransaction CallData struct (flag, to, value, data, hint, extra)
+
+    Iterates in struct order so it can be passed to encode_call like a tuple.
+    """
+
+    __slots__ = ('flag', 'to', 'value', 'data', 'hint', 'extra')
+
+    def __init__(
+        self,
+        to: str,
+        data: bytes,
+        value: int = 0,
+        flag: int = 0,
+        hint: bytes = b'',
+        extra: bytes = b''
+    ):
+        self.flag = flag
+        self.to = to
+        self.value = value
+        self.data = data
+        self.hint = hint
+        self.extra = extra
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.flag, self.to, self.value, self.data, self.hint, self.extra))
+
+    def __repr__(self) -> str:
+        return f"CallData(to={self.to}, value={self.value}, data=0x{bytes(self.data)[:4].hex()}..., flag={self.flag})"
+
+
+class MultiSendOp:
+    """One operation of a MultiSend batch
+
+    The target address is kept as 20 raw bytes, ready for packing.
+    """
+
+    __slots__ = ('operation', 'to', 'value', 'data')
+
+    def __init__(self, to: str, data: bytes, value: int = 0, operation: int = OPERATION_CALL):
+        self.operation = operation
+        self.to = _address_bytes(to)
+        self.value = value
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"MultiSendOp(operation={self.operation}, to=0x{self.to.hex()}, value={self.value}, data_len={len(self.data)})"
+
+
+def pack_multisend(ops: Iterable[MultiSendOp]) -> bytes:
+    """Pack operations into the MultiSend transactions blob
+
+    Each operation is encoded as operation(uint8) + to(address) + value(uint256)
+    + data length(uint256) + data. Headers come from one precompiled Struct and
+    the blob is assembled with a single join, so it is allocated once at its
+    final size.
+
+    Args:
+        ops: Operations in execution order
+
+    Returns:
+        bytes: Packed transactions for MultiSend.multiSend
+    """
+    pack_header = _HEADER.pack
+    parts = []
+    append = parts.append
+    for op in ops:
+        data = op.data
+        value = op.value
+        append(pack_header(op.operation, op.to, value.to_bytes(32, 'big') if value else _ZERO_WORD, len(data)))
+        append(data)
+    return b''.join(parts)
+
+
+def encode_multisend(ops: Iterable[MultiSendOp]) -> bytes:
+    """Calldata for MultiSend.multiSend(packed ops)
+
+    Example:
+        data = encode_multisend([MultiSendOp(role_manager, add_roles_data), ...])
+    """
+    return encode_call("MultiSend", "multiSend", pack_multisend(ops))
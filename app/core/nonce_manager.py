@@ -0,0 +1,115 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from web3 import Web3
+from app.db.nonces import claim_nonce, release_nonce, reset_nonces
+
+_lock = threading.Lock()
+_manager: Optional["NonceManager"] = None
+
+
+class _AccountNonce:
+    """Nonce state of one sending address"""
+
+    __slots__ = ('lock', 'next_nonce')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_nonce: Optional[int] = None
+
+
+class NonceManager:
+    """Hands out transaction nonces locally instead of asking the node each time
+
+    Each address is seeded once from its pending transaction count. After that
+    nonces are counted locally, so several transactions from the same key can
+    be sent back to back without waiting for receipts. Every reservation is
+    also claimed in the shared sender_nonces table, so worker processes
+    sending for the same agent never sign the same nonce: a process that
+    falls behind the shared counter continues from it. A failed sign/send
+    marks the address for a resync from the node on its next reservation,
+    and so does a transaction the receipt tracker reports as dropped
+    (otherwise every later send would wait behind its nonce).
+
+    Example:
+        with get_nonce_manager(web3).reserve(agent_address) as nonce:
+            tx = contract.functions.foo().build_transaction({..., 'nonce': nonce})
+            signed_tx = web3.eth.account.sign_transaction(tx, private_key=agent_key)
+            tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    """
+
+    def __init__(self, web3: Web3):
+        self.web3 = web3
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, _AccountNonce] = {}
+
+    def _account(self, address: str) -> _AccountNonce:
+        key = address.lower()
+        with self._lock:
+            account = self._accounts.get(key)
+            if account is None:
+                account = self._accounts[key] = _AccountNonce()
+            return account
+
+    def _fetch(self, address: str) -> int:
+        return self.web3.eth.get_transaction_count(Web3.to_checksum_address(address), 'pending')
+
+    @contextmanager
+    def reserve(self, address: str) -> Iterator[int]:
+        """Reserve the next nonce for address
+
+        The nonce is only consumed if the with-block completes, so the
+        transaction must be sent inside it. Other senders using the same
+        address wait until then; senders using other addresses do not.
+
+        Args:
+            address: Sending address
+
+        Yields:
+            int: Nonce to use for the transaction
+        """
+        account = self._account(address)
+        with account.lock:
+            if account.next_nonce is None:
+                account.next_nonce = self._fetch(address)
+            nonce = claim_nonce(address, account.next_nonce)
+            try:
+                yield nonce
+            except Exception:
+                # dropped or rejected send: the node is the source of truth again
+                account.next_nonce = None
+                release_nonce(address, nonce)
+                raise
+            account.next_nonce = nonce + 1
+
+    def resync(self, address: Optional[str] = None) -> None:
+        """Forget local and shared nonce state so it is re-read from the node
+
+        Args:
+            address: Address to resync, or None for every address
+        """
+        reset_nonces(address)
+        with self._lock:
+            accounts = list(self._accounts.values()) if address is None else [self._accounts.get(address.lower())]
+        for account in accounts:
+            if account is None:
+                continue
+            with account.lock:
+                account.next_nonce = None
+
+
+def get_nonce_manager(web3: Optional[Web3] = None) -> NonceManager:
+    """Get the process-wide nonce manager
+
+    Nonces must be shared by every sender of the process, so there is a
+    single instance bound to the shared Web3 provider.
+    """
+    global _manager
+    if _manager is None:
+        with _lock:
+            if _manager is None:
+                if web3 is None:
+                    from app.core.provider import get_web3
+                    web3 = get_web3()
+                _manager = NonceManager(web3)
+    return _manager
@@ -1,10 +1,12 @@
 from web3 import Web3
-from typing import Dict, Any
 from abc import ABC, abstractmethod
 from app.db.database import get_wallet
-import json
-import os
-from pathlib import Path
+from app.core.nonce_manager import get_nonce_manager
+from app.core.fee_oracle import get_fee_oracle
+from app.core.gas_estimator import get_gas_estimator, call_shape
+from app.core.tx_tracker import get_receipt_tracker, STATUS_PENDING, STATUS_SUCCESS
+from app.core.abi_encoder import encode_call
+from app.core.multisend import CallData
 
 class BaseProtocol(ABC):
     """Base protocol for DeFi interactions"""
@@ -21,94 +23,115 @@ class BaseProtocol(ABC):
         
         self.agent_address = wallet_data['agent_address']
         self.agent_key = wallet_data['agent_key']
+        
+        # False: return right after submission, receipts are polled in the background
+        self.wait_for_receipt = True
     
-    def _execute_transaction(self, call_data: Dict[str, Any]) -> str:
+    def _execute_transaction(self, call_data: CallData) -> str:
         """Execute transaction through Cobo"""
-        cobo_contract = self.web3.eth.contract(
-            address=self.cobo_address,
-            abi=self._load_abi("CoboSafeAccount")
-        )
-        
-        
-        tx = cobo_contract.functions.execTransaction(call_data).build_transaction({
-            'from': self.agent_address,
-            'gas': 800000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.agent_address),
-            'chainId': self.settings.CHAIN_ID
-        })
+        data = encode_call("CoboSafeAccount", "execTransaction", call_data)
+        gas, shape = self._estimate_cobo_gas(data, call_data, 0, default=800000)
+        fee_fields = get_fee_oracle(self.web3).fee_fields()
         
-        signed_tx = self.web3.eth.account.sign_transaction(
-            tx, 
-            private_key=self.agent_key
-        )
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-        tx_hash_hex = tx_hash.hex()
-        tx_status = self.check_tx_status(tx_hash_hex)
-        return (tx_hash_hex, tx_status)
+        with get_nonce_manager(self.web3).reserve(self.agent_address) as nonce:
+            tx = {
+                'from': self.agent_address,
+                'to': self.cobo_address,
+                'data': data,
+                'value': 0,
+                'gas': gas,
+                'nonce': nonce,
+                'chainId': self.settings.CHAIN_ID,
+                **fee_fields
+            }
+            
+            signed_tx = self.web3.eth.account.sign_transaction(
+                tx, 
+                private_key=self.agent_key
+            )
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        get_gas_estimator(self.web3).observe(tx_hash, shape, gas)
+        return self._track_transaction(tx_hash)
     
-    def _execute_transaction_with_native(self, call_data: Dict[str, Any], native_amount: int) -> str:
+    def _execute_transaction_with_native(self, call_data: CallData, native_amount: int) -> str:
         """Execute transaction through Cobo with native token"""
-        cobo_contract = self.web3.eth.contract(
-            address=self.cobo_address,
-            abi=self._load_abi("CoboSafeAccount")
-        )
-        tx = cobo_contract.functions.execTransaction(call_data).build_transaction({
+        data = encode_call("CoboSafeAccount", "execTransaction", call_data)
+        gas, shape = self._estimate_cobo_gas(data, call_data, native_amount, default=500000)
+        fee_fields = get_fee_oracle(self.web3).fee_fields()
+        with get_nonce_manager(self.web3).reserve(self.agent_address) as nonce:
+            tx = {
+                'from': self.agent_address,
+                'to': self.cobo_address,
+                'data': data,
+                'value': native_amount,
+                'gas': gas,
+                'nonce': nonce,
+                'chainId': self.settings.CHAIN_ID,
+                **fee_fields
+            }
+            signed_tx = self.web3.eth.account.sign_transaction(
+                tx, 
+                private_key=self.agent_key
+            )
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        get_gas_estimator(self.web3).observe(tx_hash, shape, gas)
+        return self._track_transaction(tx_hash)
+    
+    def _estimate_cobo_gas(self, data: bytes, call_data: CallData, value: int, default: int) -> tuple:
+        """Gas limit for a Cobo execTransaction, cached per inner call shape
+        
+        Args:
+            data: Encoded execTransaction calldata
+            call_data: Inner CallData struct
+        
+        Returns:
+            tuple: (gas limit, shape) - pass both to GasEstimator.observe after sending
+        """
+        shape = call_shape(call_data.to, call_data.data)
+        gas = get_gas_estimator(self.web3).gas_limit({
             'from': self.agent_address,
-            'value': native_amount,
-            'gas': 500000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.agent_address),
-            'chainId': self.settings.CHAIN_ID
-        })
-        signed_tx = self.web3.eth.account.sign_transaction(
-            tx, 
-            private_key=self.agent_key
-        )
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        tx_hash_hex = tx_hash.hex()
+            'to': self.cobo_address,
+            'data': data,
+            'value': value
+        }, shape, default)
+        return gas, shape
+    
+    def _track_transaction(self, tx_hash) -> tuple:
+        """Hand a sent transaction to the receipt tracker
+        
+        Waits for the receipt only when wait_for_receipt is set.
+        """
+        tx_hash_hex = get_receipt_tracker(self.web3).track(tx_hash, sender=self.agent_address)
+        if not self.wait_for_receipt:
+            return (tx_hash_hex, "Transaction submitted")
         tx_status = self.check_tx_status(tx_hash_hex)
         return (tx_hash_hex, tx_status)
     
-    def check_tx_status(self, tx_hash: str) -> str:
-        """Check transaction status"""
+    def check_tx_status(self, tx_hash: str, timeout: float = None) -> str:
+        """Check transaction status
         
-        tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-        if tx_receipt['status'] == 1:
+        Args:
+            tx_hash: Transaction hash
+            timeout: Seconds to wait for the receipt (defaults to TX_WAIT_TIMEOUT)
+        """
+        
+        result = get_receipt_tracker(self.web3).wait(
+            tx_hash,
+            timeout=self.settings.TX_WAIT_TIMEOUT if timeout is None else timeout
+        )
+        if result is None:
+            return "Transaction pending"
+        elif result['status'] == STATUS_SUCCESS:
             return "Transaction successful"
+        elif result['status'] == STATUS_PENDING:
+            return "Transaction pending"
         else:
             return "Transaction failed"
         
             
     
-    @classmethod
-    def _load_abi(cls, name: str) -> dict:
-        """Load contract ABI from json file
-        
-        Args:
-            name: Name of the contract (without .json)
-            
-        Returns:
-            dict: Contract ABI
-            
-        Raises:
-            FileNotFoundError: If ABI file not found
-        """
-        abi_path = os.path.join(
-            Path(__file__).parent.parent.parent,
-            "abi",
-            f"{name}.json"
-        )
-        
-        try:
-            with open(abi_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"ABI file not found: {abi_path}")
-    
     @abstractmethod
-    def build_transaction(self, **kwargs) -> Dict[str, Any]:
+    def build_transaction(self, **kwargs) -> CallData:
         """Build transaction data for protocol
         
         Should be implemented by specific protocols
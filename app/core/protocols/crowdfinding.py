@@ -1,7 +1,9 @@
 from web3 import Web3
 from eth_abi import encode
-from typing import Dict, Any, Optional, List
+from typing import Optional, List
 from .base import BaseProtocol
+from app.core.abi_encoder import encode_call
+from app.core.multisend import CallData
 from config.initial_address_setup import INITIAL_SILOS
 from config.settings import Settings
 import os
@@ -32,25 +34,14 @@ class CrowdfindingProtocol(BaseProtocol):
         self,
         action: str,
         amount: int,
-    ) -> Dict[str, Any]:
+    ) -> CallData:
         """Build a transaction for a crowdfinding contract"""
         
         
-        crowdfinding_contract = self.web3.eth.contract(
-            address="0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7", #Crowdfinding contract
-            abi=self._load_abi("Crowdfinding")
+        data = encode_call("Crowdfinding", "contribute", amount)
+        return CallData(
+            to="0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7", #Crowdfinding contract
+            data=data
         )
-        data = crowdfinding_contract.encode_abi(
-            "contribute",
-            args=[amount]
-        )
-        return {
-            "flag": 0,
-            "to": "0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7", #Crowdfinding contract
-            "value": 0,
-            "data": bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),
-            "hint": b'',
-            "extra": b''
-        }
     
     
\ No newline at end of file
@@ -2,11 +2,12 @@ from web3 import Web3
 from eth_abi import encode
 from typing import Dict, Any, Optional, List
 from .base import BaseProtocol
+from app.core.multicall import Multicall
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
+from app.core.multisend import CallData
 from config.initial_address_setup import INITIAL_SILOS
 from config.settings import Settings
-import os
-import json
-from pathlib import Path
 
 
 class SiloProtocol(BaseProtocol):
@@ -68,26 +69,11 @@ class SiloProtocol(BaseProtocol):
         }
 
         router_address = "0x22AacdEc57b13911dE9f188CF69633cC537BdB76"
-        router_contract = self.web3.eth.contract(
-            address=router_address,
-            abi=self._load_abi("SiloRouter")
-        )
-
-        data = router_contract.encode_abi(
-            "execute",
-            args=[[action]]
-        )
+        data = encode_call("SiloRouter", "execute", [action])
         
         
         
-        call_data = {
-                'flag': 0,            # Standard call
-                'to': router_address,  # Target contract
-                'value': amount,           #  value
-                'data': bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),  # Encoded function call
-                'hint': b'',          # No hint
-                'extra': b''          # No extra data
-            }
+        call_data = CallData(to=router_address, data=data, value=amount)
         return self._execute_transaction(call_data)
     
     def withdraw(
@@ -121,7 +107,7 @@ class SiloProtocol(BaseProtocol):
         action: str,
         silo_address: str,
         amount: int,
-    ) -> Dict[str, Any]:
+    ) -> CallData:
         """Build transaction data for token operations
         
         Args:
@@ -129,62 +115,21 @@ class SiloProtocol(BaseProtocol):
             silo_address: Silo contract address
             amount: Amount of tokens
         Returns:
-            Dict[str, Any]: CallData struct for Cobo execTransaction
+            CallData: CallData struct for Cobo execTransaction
         """
         
         if action == "deposit":
-            silo_market_contract = self.web3.eth.contract(
-                address=silo_address,
-                abi=self._load_abi("SiloMarket")
-            )
-            data = silo_market_contract.encode_abi(
-                "deposit",
-                args=[amount]
-            )      
+            data = encode_call("SiloMarket", "deposit", amount, self.safe_address)      
             
-            return {
-                'flag': 0,            # Standard call
-                'to': silo_address,  # Target contract
-                'value': 0,           #  value
-                'data': bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),  # Encoded function call
-                'hint': b'',          # No hint
-                'extra': b''          # No extra data
-            }
+            return CallData(to=silo_address, data=data)
         
         if action == "withdraw":
-            silo_market_contract = self.web3.eth.contract(
-                address=silo_address,
-                abi=self._load_abi("SiloMarket")
-            )
+            data = encode_call("SiloMarket", "redeem", amount, self.safe_address, self.safe_address, 0)
 
-            data = silo_market_contract.encode_abi(
-                "redeem",
-                args=[amount, self.safe_address, self.safe_address, 0]
-            )
-
-            return {
-                'flag': 0,            # Standard call
-                'to': silo_address,  # Target contract
-                'value': 0,           # ETH value
-                'data': bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),  # Encoded function call
-                'hint': b'',          # No hint
-                'extra': b''          # No extra data
-            }
+            return CallData(to=silo_address, data=data)
 
         raise ValueError(f"Unknown action: {action}")
     
-    @classmethod
-    def _load_lens_abi(cls) -> dict:
-        """Load SiloLens contract ABI"""
-        abi_path = os.path.join(
-            Path(__file__).parent.parent.parent,
-            "abi",
-            "SiloLens.json"
-        )
-        
-        with open(abi_path, 'r') as f:
-            return json.load(f)
-
     @classmethod
     def get_apr(cls, web3: Web3, settings: Settings) -> List[Dict[str, Any]]:
         """Get APR for all registered silos (static method)
@@ -196,17 +141,18 @@ class SiloProtocol(BaseProtocol):
         Returns:
             List[Dict[str, Any]]: List of APRs for each silo
         """
-        silo_lens = web3.eth.contract(
-            address="0xE05966aee69CeCD677a30f469812Ced650cE3b5E",
-            abi=cls._load_lens_abi()
-        )
+        silo_lens = get_abi_registry().contract(web3, "SiloLens", "0xE05966aee69CeCD677a30f469812Ced650cE3b5E")
         
-        results = []
+        # one aggregate3 eth_call for all silos; a failing silo yields None
+        multicall = Multicall(web3, settings)
         for silo in INITIAL_SILOS:
-            apr = silo_lens.functions.getDepositAPR(silo).call()
+            multicall.add(silo_lens, "getDepositAPR", [silo])
+        
+        results = []
+        for silo, apr in zip(INITIAL_SILOS, multicall.execute()):
             results.append({
                 "silo_address": silo,
-                "apr": apr / 10**18 * 100
+                "apr": apr / 10**18 * 100 if apr is not None else None
             })
         
-        return results
\ No newline at end of file
+        return results
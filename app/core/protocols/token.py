@@ -1,6 +1,10 @@
 from web3 import Web3
-from typing import Dict, Any, Optional
+from typing import Dict, Optional, List, Tuple
 from .base import BaseProtocol
+from app.core.multicall import Multicall
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
+from app.core.multisend import CallData
 
 class TokenProtocol(BaseProtocol):
     """Protocol for token operations (ERC20)"""
@@ -32,29 +36,10 @@ class TokenProtocol(BaseProtocol):
             if amount is None:
                 amount = "115792089237316195423570985008687907853269984665640564039457584007913129639935"
             
-            token_contract = self.web3.eth.contract(
-                address=token_address,
-                abi=self._load_abi("ERC20")
-            )
+            data = encode_call("ERC20", "approve", spender_address, int(amount))
             
             
-            data = token_contract.encode_abi(
-                "approve",
-                args=[
-                    spender_address,
-                    int(amount)
-                ]
-            )
-            
-            
-            call_data = {
-                'flag': 0,
-                'to': token_address,
-                'value': 0,
-                'data': bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),
-                'hint': b'',
-                'extra': b''
-            }
+            call_data = CallData(to=token_address, data=data)
            
             
             try:
@@ -83,10 +68,7 @@ class TokenProtocol(BaseProtocol):
         Returns:
             int: Current allowance
         """
-        token_contract = self.web3.eth.contract(
-            address=self.web3.to_checksum_address(token_address),
-            abi=self._load_abi("ERC20")
-        )
+        token_contract = get_abi_registry().contract(self.web3, "ERC20", token_address)
         
         return token_contract.functions.allowance(
             self.safe_address,  # owner
@@ -97,15 +79,67 @@ class TokenProtocol(BaseProtocol):
         self,
         token_address: str
     ) -> int:
-        token_contract = self.web3.eth.contract(
-            address=self.web3.to_checksum_address(token_address),
-            abi=self._load_abi("ERC20")
-        )
+        token_contract = get_abi_registry().contract(self.web3, "ERC20", token_address)
         
         return token_contract.functions.balanceOf(
             self.safe_address
         ).call()
 
+    def get_token_reads(
+        self,
+        token_addresses: List[str],
+        pairs: List[Tuple[str, str]]
+    ) -> Tuple[Dict[str, Optional[int]], List[Optional[int]]]:
+        """Get Safe balances and allowances together in one round trip
+        
+        Args:
+            token_addresses: Tokens to read the balance of
+            pairs: (token_address, spender_address) tuples to read the allowance of
+            
+        Returns:
+            Tuple: Balance per token and allowance per pair, in order
+                   (None where the read failed)
+        """
+        registry = get_abi_registry()
+        multicall = Multicall(self.web3, self.settings)
+        for token_address in token_addresses:
+            token_contract = registry.contract(self.web3, "ERC20", token_address)
+            multicall.add(token_contract, "balanceOf", [self.safe_address])
+        for token_address, spender_address in pairs:
+            token_contract = registry.contract(self.web3, "ERC20", token_address)
+            multicall.add(token_contract, "allowance", [self.safe_address, spender_address])
+        
+        results = multicall.execute()
+        return dict(zip(token_addresses, results)), results[len(token_addresses):]
+
+    def get_token_balances(
+        self,
+        token_addresses: List[str]
+    ) -> Dict[str, Optional[int]]:
+        """Get Safe balances for several tokens in one round trip
+        
+        Args:
+            token_addresses: Token contract addresses
+            
+        Returns:
+            Dict[str, Optional[int]]: Balance per token (None if the read failed)
+        """
+        return self.get_token_reads(token_addresses, [])[0]
+
+    def get_allowances(
+        self,
+        pairs: List[Tuple[str, str]]
+    ) -> List[Optional[int]]:
+        """Get Safe allowances for several (token, spender) pairs in one round trip
+        
+        Args:
+            pairs: (token_address, spender_address) tuples
+            
+        Returns:
+            List[Optional[int]]: Allowance per pair, in order (None if the read failed)
+        """
+        return self.get_token_reads([], pairs)[1]
+
     def build_transaction(
         self,
         action: str,
@@ -113,7 +147,7 @@ class TokenProtocol(BaseProtocol):
         spender_address: str = None,
         amount: Optional[int] = None,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> CallData:
         """Build transaction data for token operations
         
         Args:
@@ -123,31 +157,16 @@ class TokenProtocol(BaseProtocol):
             amount: Amount of tokens
             
         Returns:
-            Dict[str, Any]: CallData struct for Cobo execTransaction
+            CallData: CallData struct for Cobo execTransaction
         """
-        token_contract = self.web3.eth.contract(
-            address=token_address,
-            abi=self._load_abi("ERC20")
-        )
-        
         if action == "approve":
             if not spender_address:
                 raise ValueError("spender_address required for approve")
             
             amount = amount if amount is not None else self.MAX_UINT256
-            data = token_contract.encode_abi(
-                "approve",
-                args=[spender_address, amount]
-            )
+            data = encode_call("ERC20", "approve", spender_address, amount)
             
             
-            return {
-                'flag': 0,            # Standard call
-                'to': token_address,  # Target contract
-                'value': 0,           # ETH value
-                'data': bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),  # Encoded function call
-                'hint': b'',          # No hint
-                'extra': b''          # No extra data
-            }
+            return CallData(to=token_address, data=data)
         
         raise ValueError(f"Unknown action: {action}")
\ No newline at end of file
@@ -0,0 +1,78 @@
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from config.settings import Settings
+from app.core.rpc_pool import PooledHTTPProvider
+from app.core.rpc_metrics import MIDDLEWARE_NAME as METRICS_MIDDLEWARE, RpcMetricsMiddleware
+from app.core.read_cache import MIDDLEWARE_NAME as READ_CACHE_MIDDLEWARE, BlockReadCacheMiddleware
+
+_lock = threading.Lock()
+_web3: Optional[Web3] = None
+
+
+def build_session(settings: Settings) -> requests.Session:
+    """Build a keep-alive requests session with a pool sized for concurrent workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.RPC_POOL_SIZE,
+        max_retries=settings.RPC_RETRIES,
+        pool_block=False
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not settings.RPC_KEEPALIVE:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def create_web3(settings: Settings) -> Web3:
+    """Create a Web3 instance on a dedicated pooled session
+
+    With several RPC_URLS the provider routes requests across all of them
+    (see app/core/rpc_pool.py). With RPC_METRICS every round trip is timed
+    and attributed to the calling Flask endpoint (see app/core/rpc_metrics.py).
+    With READ_CACHE repeated reads within a block are answered from memory
+    (see app/core/read_cache.py); it sits outside the metrics so cache hits
+    are not counted as RPC calls.
+    """
+    if len(settings.RPC_URLS) > 1:
+        provider = PooledHTTPProvider(
+            settings.RPC_URLS,
+            request_kwargs={"timeout": settings.RPC_TIMEOUT},
+            session_factory=lambda: build_session(settings),
+            hedge=settings.RPC_HEDGE,
+            hedge_min_delay=settings.RPC_HEDGE_MIN_DELAY,
+            max_failures=settings.RPC_MAX_FAILURES,
+            cooldown=settings.RPC_COOLDOWN,
+            read_after_write=settings.RPC_READ_AFTER_WRITE
+        )
+    else:
+        provider = Web3.HTTPProvider(
+            settings.RPC_URL,
+            request_kwargs={"timeout": settings.RPC_TIMEOUT},
+            session=build_session(settings)
+        )
+    web3 = Web3(provider)
+    # the first middleware injected at layer 0 ends up outermost
+    if settings.READ_CACHE:
+        web3.middleware_onion.inject(BlockReadCacheMiddleware, name=READ_CACHE_MIDDLEWARE, layer=0)
+    if settings.RPC_METRICS:
+        web3.middleware_onion.inject(RpcMetricsMiddleware, name=METRICS_MIDDLEWARE, layer=0)
+    return web3
+
+
+def get_web3(settings: Optional[Settings] = None) -> Web3:
+    """Get the process-wide Web3 instance
+
+    Every module shares one provider, so TCP/TLS connections to the RPC node
+    are reused across requests and tool calls.
+    """
+    global _web3
+    if _web3 is None:
+        with _lock:
+            if _web3 is None:
+                _web3 = create_web3(settings or Settings())
+    return _web3
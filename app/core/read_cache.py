@@ -0,0 +1,170 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set, Tuple
+from web3 import Web3
+from web3.middleware import Web3Middleware
+from web3.types import RPCEndpoint, RPCResponse
+from config.settings import Settings
+from app.core.block_watcher import get_block_watcher
+from app.core.tx_tracker import get_receipt_tracker
+
+_lock = threading.Lock()
+_cache: Optional["BlockReadCache"] = None
+
+# name of BlockReadCacheMiddleware in the web3 middleware onion
+MIDDLEWARE_NAME = "read_cache"
+
+CACHED_METHODS = ("eth_call", "eth_getBalance")
+
+Key = Tuple[str, str, str, int]
+
+
+class BlockReadCache:
+    """eth_call and eth_getBalance results cached for the current block
+
+    Entries are keyed by (method, address, call params, block number), where
+    'latest' resolves to the last block seen by the block watcher, and are
+    dropped as soon as the watcher reports a newer block. Receipts of our own
+    transactions evict every entry for the addresses they touched (to, from,
+    created contract, log emitters) so a read after a mined transaction does
+    not see pre-transaction state while the watcher is still behind.
+
+    Reads for 'pending', 'safe', 'finalized' or block hashes are not cached,
+    nor are error responses.
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.max_entries = settings.READ_CACHE_MAX
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, RPCResponse] = {}
+        self._by_address: Dict[str, Set[Key]] = defaultdict(set)
+        # bumped on every eviction so reads in flight during it are not stored
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.watcher = get_block_watcher(web3)
+        self.watcher.add_listener(self._on_block)
+        get_receipt_tracker(web3).add_listener(self._on_receipt)
+
+    def key(self, method: str, params: Any) -> Optional[Key]:
+        """Cache key of a request, None if it must not be cached"""
+        if method not in CACHED_METHODS or not params:
+            return None
+        block_identifier = params[1] if len(params) > 1 else "latest"
+        if block_identifier == "latest":
+            block_number = self.watcher.last_block
+        elif isinstance(block_identifier, int):
+            block_number = block_identifier
+        elif isinstance(block_identifier, str) and block_identifier.startswith("0x") and len(block_identifier) < 66:
+            block_number = int(block_identifier, 16)
+        else:
+            return None
+        if block_number is None:
+            return None
+
+        if method == "eth_getBalance":
+            return (method, str(params[0]).lower(), "", block_number)
+        call = params[0]
+        if not isinstance(call, dict) or not call.get('to'):
+            return None
+        fields = repr(sorted((name, value) for name, value in call.items() if name != 'to'))
+        return (method, str(call['to']).lower(), fields, block_number)
+
+    def get(self, key: Key) -> Optional[RPCResponse]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(response)
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def put(self, key: Key, response: RPCResponse, epoch: int) -> None:
+        """Store a successful response unless an eviction happened since epoch"""
+        if not isinstance(response, dict) or 'result' not in response or response.get('error'):
+            return
+        with self._lock:
+            if epoch != self._epoch or len(self._entries) >= self.max_entries:
+                return
+            self._entries[key] = response
+            self._by_address[key[1]].add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_address.clear()
+            self._epoch += 1
+
+    def evict(self, addresses) -> None:
+        """Drop every entry for the given addresses"""
+        with self._lock:
+            self._epoch += 1
+            for address in addresses:
+                for key in self._by_address.pop(address.lower(), ()):
+                    if self._entries.pop(key, None) is not None:
+                        self.evictions += 1
+
+    def _on_block(self, block_number: int, receipts: list) -> None:
+        self.clear()
+
+    def _on_receipt(self, tx_hash: str, receipt: Dict[str, Any]) -> None:
+        addresses = {receipt.get('to'), receipt.get('from'), receipt.get('contractAddress')}
+        addresses.update(log.get('address') for log in receipt.get('logs') or [])
+        self.evict(address for address in addresses if address)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.max_entries,
+                'block': self.watcher.last_block,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class BlockReadCacheMiddleware(Web3Middleware):
+    """Serves repeated eth_call / eth_getBalance reads within a block from BlockReadCache
+
+    Injected outermost (outside RpcMetricsMiddleware), so cache hits never
+    count as RPC round trips.
+    """
+
+    def wrap_make_request(self, make_request):
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            if method not in CACHED_METHODS:
+                return make_request(method, params)
+            cache = get_read_cache(self._w3)
+            key = cache.key(method, params)
+            if key is None:
+                return make_request(method, params)
+            response = cache.get(key)
+            if response is not None:
+                return response
+            epoch = cache.epoch()
+            response = make_request(method, params)
+            cache.put(key, response, epoch)
+            return response
+
+        return middleware
+
+
+def get_read_cache(web3: Optional[Web3] = None) -> BlockReadCache:
+    """Get the process-wide block-scoped read cache"""
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                if web3 is None:
+                    from app.core.provider import get_web3
+                    web3 = get_web3()
+                _cache = BlockReadCache(web3, Settings())
+    return _cache
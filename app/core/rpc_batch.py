@@ -0,0 +1,160 @@
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from eth_abi import decode
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+from web3.contract import Contract
+from app.core.rpc_metrics import provider_request_fns
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'batches': 0, 'requests': 0, 'round_trips_saved': 0})
+
+
+def to_int(value: Any) -> int:
+    """Format a hex quantity result"""
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def find_function_abi(contract: Contract, fn_name: str, arg_count: int) -> dict:
+    """Find function ABI entry, resolving overloads by argument count"""
+    for entry in contract.abi:
+        if (
+            entry.get('type') == 'function'
+            and entry.get('name') == fn_name
+            and len(entry.get('inputs', [])) == arg_count
+        ):
+            return entry
+    raise ValueError(f"Function {fn_name} with {arg_count} args not found in ABI")
+
+
+class BatchError(Exception):
+    """A single request inside a JSON-RPC batch returned an error"""
+
+
+class BatchItem:
+    """Handle for one queued request; result is available after the batch runs"""
+
+    __slots__ = ('method', 'params', 'formatter', '_result', '_error', '_done')
+
+    def __init__(self, method: str, params: list, formatter: Optional[Callable[[Any], Any]]):
+        self.method = method
+        self.params = params
+        self.formatter = formatter
+        self._result = None
+        self._error = None
+        self._done = False
+
+    def _resolve(self, response: Dict[str, Any]) -> None:
+        self._done = True
+        if 'error' in response and response['error']:
+            self._error = response['error']
+            return
+        result = response.get('result')
+        self._result = self.formatter(result) if self.formatter and result is not None else result
+
+    @property
+    def result(self) -> Any:
+        if not self._done:
+            raise RuntimeError(f"{self.method} has not been executed yet")
+        if self._error is not None:
+            raise BatchError(f"{self.method} failed: {self._error}")
+        return self._result
+
+
+class RpcBatch:
+    """Groups independent RPC reads into one JSON-RPC batch array
+
+    Requests queued inside the with-block are sent together when the block
+    exits (or on an explicit execute()). Providers without batch support fall
+    back to sequential requests.
+
+    Example:
+        with RpcBatch(web3, "AuthorizerManager.create_authorizer") as batch:
+            name_call = batch.call(impl_contract, "NAME")
+            block_number = batch.block_number()
+        tag = name_call.result[:28] + block_number.result.to_bytes(4, 'big')
+    """
+
+    def __init__(self, web3: Web3, label: str = "default"):
+        self.web3 = web3
+        self.label = label
+        self._items: List[BatchItem] = []
+
+    def __enter__(self) -> "RpcBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.execute()
+
+    def add(self, method: str, params: Sequence[Any] = (), formatter: Optional[Callable[[Any], Any]] = None) -> BatchItem:
+        """Queue a raw JSON-RPC request"""
+        item = BatchItem(method, list(params), formatter)
+        self._items.append(item)
+        return item
+
+    def gas_price(self) -> BatchItem:
+        return self.add("eth_gasPrice", [], to_int)
+
+    def block_number(self) -> BatchItem:
+        return self.add("eth_blockNumber", [], to_int)
+
+    def transaction_count(self, address: str, block_identifier: str = "latest") -> BatchItem:
+        return self.add("eth_getTransactionCount", [address, block_identifier], to_int)
+
+    def call(
+        self,
+        contract: Contract,
+        fn_name: str,
+        args: Sequence[Any] = (),
+        block_identifier: str = "latest"
+    ) -> BatchItem:
+        """Queue a view function call, decoded like ContractFunction.call()"""
+        fn_abi = find_function_abi(contract, fn_name, len(args))
+        output_types = [collapse_if_tuple(output) for output in fn_abi['outputs']]
+
+        def formatter(result: str) -> Any:
+            values = decode(output_types, bytes.fromhex(result[2:]))
+            return values[0] if len(values) == 1 else values
+
+        data = contract.encode_abi(fn_name, args=list(args))
+        return self.add("eth_call", [{'to': contract.address, 'data': data}, block_identifier], formatter)
+
+    def execute(self) -> List[BatchItem]:
+        """Send all queued requests, one round trip when the provider supports it"""
+        items, self._items = self._items, []
+        if not items:
+            return items
+
+        make_request, make_batch_request = provider_request_fns(self.web3)
+        requests = [(item.method, item.params) for item in items]
+
+        if make_batch_request is not None and len(items) > 1:
+            responses = make_batch_request(requests)
+            if isinstance(responses, dict):
+                # whole batch rejected by the node
+                raise BatchError(f"Batch request failed: {responses.get('error')}")
+            if responses and 'id' in responses[0]:
+                responses = sorted(responses, key=lambda response: response['id'])
+            round_trips = 1
+        else:
+            responses = [make_request(method, params) for method, params in requests]
+            round_trips = len(items)
+
+        for item, response in zip(items, responses):
+            item._resolve(response)
+
+        with _stats_lock:
+            stats = _stats[self.label]
+            stats['batches'] += 1
+            stats['requests'] += len(items)
+            stats['round_trips_saved'] += len(items) - round_trips
+
+        return items
+
+
+def get_batch_stats() -> Dict[str, Dict[str, int]]:
+    """Batches, requests and saved round trips per call site"""
+    with _stats_lock:
+        return {label: dict(stats) for label, stats in _stats.items()}
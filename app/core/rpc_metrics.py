@@ -0,0 +1,292 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from flask import g, has_request_context, request
+from web3 import Web3
+from web3.middleware import Web3Middleware
+from web3.types import RPCEndpoint, RPCResponse
+from web3._utils.encoding import Web3JsonEncoder
+from config.settings import Settings
+
+logger = logging.getLogger('app')
+
+_lock = threading.Lock()
+_metrics: Optional["RpcMetrics"] = None
+
+# label for RPC calls made outside a Flask request (watchers, trackers, caches)
+BACKGROUND = "background"
+# name of RpcMetricsMiddleware in the web3 middleware onion
+MIDDLEWARE_NAME = "rpc_metrics"
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+CALLS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class RpcBudgetExceeded(Exception):
+    """Raised in RPC_BUDGET_MODE=fail when a request makes more RPC calls than its budget"""
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket i counts values <= bounds[i], the last one the rest"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None for the overflow bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            'count': self.count,
+            'sum': round(self.total, 2),
+            'mean': round(self.total / self.count, 2) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': buckets
+        }
+
+
+class _MethodStats:
+    __slots__ = ('calls', 'errors', 'latency_ms', 'request_bytes', 'response_bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.request_bytes = Histogram(SIZE_BUCKETS_BYTES)
+        self.response_bytes = Histogram(SIZE_BUCKETS_BYTES)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'latency_ms': self.latency_ms.as_dict(),
+            'request_bytes': self.request_bytes.as_dict(),
+            'response_bytes': self.response_bytes.as_dict()
+        }
+
+
+class _EndpointStats:
+    __slots__ = ('requests', 'budget_exceeded', 'calls_per_request', 'rpc_ms_per_request', 'methods')
+
+    def __init__(self):
+        self.requests = 0
+        self.budget_exceeded = 0
+        self.calls_per_request = Histogram(CALLS_BUCKETS)
+        self.rpc_ms_per_request = Histogram(LATENCY_BUCKETS_MS)
+        self.methods: Dict[str, _MethodStats] = defaultdict(_MethodStats)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'budget_exceeded': self.budget_exceeded,
+            'calls_per_request': self.calls_per_request.as_dict(),
+            'rpc_ms_per_request': self.rpc_ms_per_request.as_dict(),
+            'methods': {method: stats.as_dict() for method, stats in self.methods.items()}
+        }
+
+
+class RpcMetrics:
+    """Per-endpoint RPC call statistics and call budgets
+
+    Every RPC round trip is attributed to the Flask endpoint (url rule such
+    as '/api/wallet/create') that made it, or to 'background' outside a
+    request. Round trips are counted per request in flask.g and checked
+    against RPC_CALL_BUDGETS; a JSON-RPC batch counts as one round trip.
+    """
+
+    def __init__(self, settings: Settings):
+        self.budgets = settings.RPC_CALL_BUDGETS
+        self.fail_over_budget = settings.RPC_BUDGET_MODE == 'fail'
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointStats] = defaultdict(_EndpointStats)
+
+    @staticmethod
+    def current_endpoint() -> str:
+        if not has_request_context():
+            return BACKGROUND
+        rule = request.url_rule
+        return rule.rule if rule is not None else request.path
+
+    def begin_call(self, endpoint: str) -> None:
+        """Count a round trip against the current request's budget"""
+        if endpoint == BACKGROUND:
+            return
+        calls = g.get('rpc_calls', 0) + 1
+        g.rpc_calls = calls
+        budget = self.budgets.get(endpoint)
+        if budget is None or calls <= budget:
+            return
+        if calls == budget + 1:
+            with self._lock:
+                self._endpoints[endpoint].budget_exceeded += 1
+            logger.warning(f"[RpcMetrics] {endpoint} exceeded its budget of {budget} RPC calls")
+        if self.fail_over_budget:
+            raise RpcBudgetExceeded(f"{endpoint} exceeded its budget of {budget} RPC calls")
+
+    def record(
+        self,
+        endpoint: str,
+        methods: List[str],
+        elapsed: float,
+        request_bytes: int,
+        response_bytes: int,
+        failed: List[bool]
+    ) -> None:
+        """Record one round trip carrying one or more methods
+
+        Args:
+            endpoint: Label from current_endpoint()
+            methods: RPC methods sent in the round trip
+            elapsed: Round trip time in seconds
+            request_bytes: Size of the JSON params
+            response_bytes: Size of the JSON response
+            failed: Per method, whether it errored
+        """
+        elapsed_ms = elapsed * 1000
+        if endpoint != BACKGROUND:
+            g.rpc_ms = g.get('rpc_ms', 0.0) + elapsed_ms
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            for method, error in zip(methods, failed):
+                method_stats = stats.methods[method]
+                method_stats.calls += 1
+                method_stats.errors += error
+                method_stats.latency_ms.observe(elapsed_ms)
+                method_stats.request_bytes.observe(request_bytes / len(methods))
+                method_stats.response_bytes.observe(response_bytes / len(methods))
+
+    def finish_request(self) -> None:
+        """Close the current request's counters; call from a teardown hook"""
+        calls = g.pop('rpc_calls', 0)
+        rpc_ms = g.pop('rpc_ms', 0.0)
+        endpoint = self.current_endpoint()
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats.requests += 1
+            stats.calls_per_request.observe(calls)
+            stats.rpc_ms_per_request.observe(rpc_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: stats.as_dict() for endpoint, stats in self._endpoints.items()}
+
+
+def _size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, cls=Web3JsonEncoder, separators=(',', ':')))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_error(response: Any) -> bool:
+    return isinstance(response, dict) and response.get('error') is not None
+
+
+class RpcMetricsMiddleware(Web3Middleware):
+    """Times every RPC round trip and feeds it to the process-wide RpcMetrics
+
+    Injected at layer 0 right after the read cache, so it sits inside the
+    cache (hits are never counted) and outside web3's own middleware: the
+    latency includes the other middleware and a budget violation stops the
+    call before it is sent.
+    """
+
+    def wrap_make_request(self, make_request):
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            metrics = get_rpc_metrics()
+            endpoint = metrics.current_endpoint()
+            metrics.begin_call(endpoint)
+            started = time.perf_counter()
+            response = None
+            try:
+                response = make_request(method, params)
+                return response
+            finally:
+                metrics.record(
+                    endpoint, [method], time.perf_counter() - started,
+                    _size(params), _size(response), [response is None or _is_error(response)]
+                )
+
+        return middleware
+
+    def wrap_make_batch_request(self, make_batch_request):
+        def middleware(requests_info: List[Tuple[RPCEndpoint, Any]]) -> Any:
+            metrics = get_rpc_metrics()
+            endpoint = metrics.current_endpoint()
+            metrics.begin_call(endpoint)
+            started = time.perf_counter()
+            response = None
+            try:
+                response = make_batch_request(requests_info)
+                return response
+            finally:
+                if isinstance(response, list):
+                    failed = [_is_error(item) for item in response]
+                else:
+                    # transport failure or a single error object for the whole batch
+                    failed = [True] * len(requests_info)
+                metrics.record(
+                    endpoint, [method for method, _ in requests_info],
+                    time.perf_counter() - started,
+                    _size([params for _, params in requests_info]), _size(response), failed
+                )
+
+        return middleware
+
+
+def provider_request_fns(web3: Web3) -> Tuple[Callable[..., Any], Optional[Callable[..., Any]]]:
+    """Provider make_request and make_batch_request, timed when metrics are enabled
+
+    For code that talks to the provider directly to get raw JSON-RPC
+    responses (RpcBatch, BlockWatcher), bypassing web3's formatting and
+    validation middleware but not the metrics.
+
+    Returns:
+        tuple: (make_request, make_batch_request or None if unsupported)
+    """
+    provider = web3.provider
+    make_request = provider.make_request
+    make_batch_request = getattr(provider, 'make_batch_request', None)
+    if MIDDLEWARE_NAME in web3.middleware_onion:
+        middleware = RpcMetricsMiddleware(web3)
+        make_request = middleware.wrap_make_request(make_request)
+        if make_batch_request is not None:
+            make_batch_request = middleware.wrap_make_batch_request(make_batch_request)
+    return make_request, make_batch_request
+
+
+def get_rpc_metrics() -> RpcMetrics:
+    """Get the process-wide RPC metrics"""
+    global _metrics
+    if _metrics is None:
+        with _lock:
+            if _metrics is None:
+                _metrics = RpcMetrics(Settings())
+    return _metrics
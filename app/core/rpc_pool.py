@@ -0,0 +1,334 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from eth_account import Account
+from web3 import HTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+# methods that change chain state; sent to the endpoint pinned to the sender
+WRITE_METHODS = ("eth_sendRawTransaction",)
+
+# JSON-RPC errors about the node rather than the request (rate limits,
+# state it does not have yet); reverts and nonce errors are real answers
+NODE_ERROR_CODES = (-32005, -32603, 429)
+NODE_ERROR_MESSAGES = (
+    "rate limit", "too many requests", "limit exceeded", "header not found",
+    "missing trie node", "timeout", "timed out", "unavailable", "try again"
+)
+
+
+class _NodeError(Exception):
+    """An endpoint answered with a node-side JSON-RPC error"""
+
+    def __init__(self, uri: str, response: bytes):
+        super().__init__(f"{uri} returned a node error")
+        self.response = response
+
+
+class _Endpoint:
+    """Latency and error statistics of one RPC endpoint"""
+
+    __slots__ = (
+        'uri', 'latency', 'error_rate', 'samples', 'requests', 'errors',
+        'consecutive_failures', 'down_until', 'lock'
+    )
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples: deque = deque(maxlen=200)
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed: float, ok: bool, alpha: float, max_failures: int, cooldown: float) -> None:
+        with self.lock:
+            self.requests += 1
+            self.error_rate = (1 - alpha) * self.error_rate + alpha * (0.0 if ok else 1.0)
+            if ok:
+                self.consecutive_failures = 0
+                self.samples.append(elapsed)
+                self.latency = elapsed if self.latency is None else (1 - alpha) * self.latency + alpha * elapsed
+            else:
+                self.errors += 1
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= max_failures:
+                    self.down_until = time.monotonic() + cooldown
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def score(self) -> float:
+        """Expected cost of a request: EWMA latency inflated by the error rate"""
+        # unmeasured endpoints go first so they get a latency sample
+        latency = self.latency if self.latency is not None else 0.0
+        return latency * (1 + 10 * self.error_rate)
+
+    def p95(self) -> Optional[float]:
+        with self.lock:
+            if len(self.samples) < 20:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'p95_ms': round(self.p95() * 1000, 2) if self.p95() is not None else None,
+            'error_rate': round(self.error_rate, 4),
+            'requests': self.requests,
+            'errors': self.errors,
+            'healthy': self.healthy
+        }
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """HTTP provider spreading requests over several RPC endpoints
+
+    Every endpoint keeps an EWMA of its latency and error rate. Reads go to
+    the healthy endpoint with the lowest score. If it has not answered
+    after its own p95 latency, a hedged duplicate goes to the next best
+    endpoint and the first answer wins. Endpoints failing max_failures
+    times in a row are skipped for cooldown seconds.
+
+    eth_sendRawTransaction is pinned per sender (recovered from the signed
+    transaction), so consecutive nonces of one account reach the same node
+    mempool in order. It moves to another endpoint only if the pinned one
+    fails. For read_after_write seconds after a send, reads by that sender
+    (eth_getTransactionCount, eth_call/eth_estimateGas from it) and any read
+    by the sending thread go to the same endpoint, so a lagging node cannot
+    return a stale nonce, allowance or balance. A JSON-RPC error about the
+    node itself (rate limit, missing header/state) counts as a failure of
+    the endpoint and the request is retried elsewhere.
+
+    Example:
+        provider = PooledHTTPProvider(
+            ["https://rpc-a", "https://rpc-b"],
+            request_kwargs={"timeout": 30},
+            session_factory=lambda: build_session(settings)
+        )
+        web3 = Web3(provider)
+    """
+
+    def __init__(
+        self,
+        endpoint_uris: List[str],
+        request_kwargs: Optional[Dict[str, Any]] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        hedge: bool = True,
+        hedge_min_delay: float = 0.05,
+        alpha: float = 0.2,
+        max_failures: int = 3,
+        cooldown: float = 30.0,
+        max_workers: int = 16,
+        read_after_write: float = 10.0
+    ):
+        if not endpoint_uris:
+            raise ValueError("At least one RPC endpoint is required")
+        super().__init__(endpoint_uris[0], request_kwargs=request_kwargs, exception_retry_configuration=None)
+        self.endpoints = [_Endpoint(uri) for uri in endpoint_uris]
+        if session_factory is not None:
+            for endpoint in self.endpoints:
+                self._request_session_manager.cache_and_return_session(endpoint.uri, session_factory())
+        self.hedge = hedge and len(self.endpoints) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self.alpha = alpha
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rpc-hedge")
+        self.read_after_write = read_after_write
+        self._pins: Dict[str, _Endpoint] = {}
+        self._written: Dict[str, float] = {}
+        self._pins_lock = threading.Lock()
+        self._local = threading.local()
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def __str__(self) -> str:
+        return f"RPC pool {[endpoint.uri for endpoint in self.endpoints]}"
+
+    def _ranked(self) -> List[_Endpoint]:
+        """Healthy endpoints by score, then unhealthy ones as a last resort"""
+        healthy = sorted((e for e in self.endpoints if e.healthy), key=lambda e: e.score())
+        return healthy + [e for e in self.endpoints if not e.healthy]
+
+    def _post(self, endpoint: _Endpoint, request_data: bytes) -> bytes:
+        started = time.monotonic()
+        try:
+            response = self._request_session_manager.make_post_request(
+                endpoint.uri, request_data, **self.get_request_kwargs()
+            )
+        except Exception:
+            endpoint.record(time.monotonic() - started, False, self.alpha, self.max_failures, self.cooldown)
+            raise
+        ok = not self._node_error(response)
+        endpoint.record(time.monotonic() - started, ok, self.alpha, self.max_failures, self.cooldown)
+        if not ok:
+            raise _NodeError(endpoint.uri, response)
+        return response
+
+    @staticmethod
+    def _node_error(response: bytes) -> bool:
+        """True if the response carries a node-side JSON-RPC error"""
+        if b'"error"' not in response:
+            return False
+        try:
+            body = json.loads(response)
+        except ValueError:
+            return True
+        for item in body if isinstance(body, list) else [body]:
+            error = item.get('error') if isinstance(item, dict) else None
+            if not error:
+                continue
+            if not isinstance(error, dict):
+                return True
+            message = str(error.get('message', '')).lower()
+            if error.get('code') in NODE_ERROR_CODES or any(text in message for text in NODE_ERROR_MESSAGES):
+                return True
+        return False
+
+    @staticmethod
+    def _give_up(last_error: Exception) -> bytes:
+        # every endpoint failed: a node error goes back to web3 as the response it was
+        if isinstance(last_error, _NodeError):
+            return last_error.response
+        raise last_error
+
+    def _read_pin(self, method: RPCEndpoint, params: Any) -> Optional[_Endpoint]:
+        """Endpoint a read must use because its sender or thread just wrote there"""
+        now = time.monotonic()
+        sender = self._read_sender(method, params)
+        if sender:
+            with self._pins_lock:
+                pinned = self._pins.get(sender)
+                if pinned is not None and self._written.get(sender, 0.0) > now - self.read_after_write:
+                    return pinned
+        pin = getattr(self._local, 'pin', None)
+        if pin is not None and pin[1] > now:
+            return pin[0]
+        return None
+
+    @staticmethod
+    def _read_sender(method: RPCEndpoint, params: Any) -> Optional[str]:
+        try:
+            if method == "eth_getTransactionCount":
+                return str(params[0]).lower()
+            if method in ("eth_call", "eth_estimateGas") and params[0].get('from'):
+                return str(params[0]['from']).lower()
+        except Exception:
+            pass
+        return None
+
+    def _read(self, request_data: bytes, pinned: Optional[_Endpoint] = None) -> bytes:
+        """Send a read to the best endpoint, hedging and failing over as needed
+
+        A pinned read is not hedged: only the pinned endpoint is known to
+        have seen the sender's latest transactions.
+        """
+        ranked = self._ranked()
+        if pinned is not None and pinned.healthy:
+            return self._failover([pinned] + [e for e in ranked if e is not pinned], request_data)[0]
+        if not self.hedge:
+            return self._failover(ranked, request_data)[0]
+
+        primary, backups = ranked[0], ranked[1:]
+        futures = {self._executor.submit(self._post, primary, request_data): primary}
+        delay = max(primary.p95() or self.hedge_min_delay, self.hedge_min_delay)
+        done, _ = wait(futures, timeout=delay)
+
+        if not done and backups:
+            self.hedged += 1
+            futures[self._executor.submit(self._post, backups[0], request_data)] = backups[0]
+            backups = backups[1:]
+
+        last_error: Optional[Exception] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if futures[future] is not primary:
+                    self.hedge_wins += 1
+                return result
+
+        if backups:
+            return self._failover(backups, request_data)[0]
+        return self._give_up(last_error)
+
+    def _failover(self, endpoints: List[_Endpoint], request_data: bytes) -> Tuple[bytes, Optional[_Endpoint]]:
+        """First answer from endpoints in order, and the endpoint that gave it"""
+        last_error: Optional[Exception] = None
+        for endpoint in endpoints:
+            try:
+                return self._post(endpoint, request_data), endpoint
+            except Exception as e:
+                print(f"[RpcPool] {endpoint.uri} failed: {str(e)}")
+                last_error = e
+        return self._give_up(last_error), None
+
+    def _write(self, sender: Optional[str], request_data: bytes) -> bytes:
+        """Send a write to the endpoint pinned to sender"""
+        with self._pins_lock:
+            pinned = self._pins.get(sender) if sender else None
+            if pinned is None or not pinned.healthy:
+                pinned = self._ranked()[0]
+                if sender:
+                    self._pins[sender] = pinned
+        try:
+            response = self._post(pinned, request_data)
+        except Exception as e:
+            print(f"[RpcPool] Pinned endpoint {pinned.uri} failed for {sender}: {str(e)}")
+            others = [endpoint for endpoint in self._ranked() if endpoint is not pinned]
+            if not others:
+                return self._give_up(e)
+            # resending the same signed transaction is idempotent
+            response, pinned = self._failover(others, request_data)
+            if pinned is None:
+                return response
+
+        # reads right after this send must see it (see _read_pin)
+        now = time.monotonic()
+        with self._pins_lock:
+            if sender:
+                self._pins[sender] = pinned
+                self._written[sender] = now
+        self._local.pin = (pinned, now + self.read_after_write)
+        return response
+
+    @staticmethod
+    def _sender(params: Any) -> Optional[str]:
+        try:
+            return Account.recover_transaction(params[0]).lower()
+        except Exception:
+            return None
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+        if method in WRITE_METHODS:
+            raw_response = self._write(self._sender(params), request_data)
+        else:
+            raw_response = self._read(request_data, self._read_pin(method, params))
+        return self.decode_rpc_response(raw_response)
+
+    def make_batch_request(self, batch_requests: List[Tuple[RPCEndpoint, Any]]) -> Any:
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        pinned = next(filter(None, (self._read_pin(method, params) for method, params in batch_requests)), None)
+        response = self.decode_rpc_response(self._read(request_data, pinned))
+        if not isinstance(response, list):
+            return response
+        return sorted(response, key=lambda item: item.get('id', 0))
+
+    def endpoint_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency, error rate and health per endpoint"""
+        return {endpoint.uri: endpoint.stats() for endpoint in self.endpoints}
@@ -0,0 +1,293 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from config.settings import Settings
+from app.core.rpc_batch import RpcBatch, to_int
+from app.core.block_watcher import get_block_watcher
+from app.core.nonce_manager import get_nonce_manager
+
+_lock = threading.Lock()
+_tracker: Optional["ReceiptTracker"] = None
+
+STATUS_PENDING = "pending"
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_DROPPED = "dropped"
+
+
+def normalize_tx_hash(tx_hash: Any) -> str:
+    """Lowercase 0x-prefixed hex form of a tx hash (str, bytes or HexBytes)"""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        tx_hash = bytes(tx_hash).hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith('0x') else f"0x{tx_hash}"
+
+
+class _TrackedTx:
+    __slots__ = ('tx_hash', 'sender', 'submitted_at', 'status', 'receipt')
+
+    def __init__(self, tx_hash: str, sender: Optional[str] = None):
+        self.tx_hash = tx_hash
+        self.sender = sender
+        self.submitted_at = time.time()
+        self.status = STATUS_PENDING
+        self.receipt: Optional[Dict[str, Any]] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        receipt = self.receipt or {}
+        return {
+            'tx_hash': self.tx_hash,
+            'status': self.status,
+            'block_number': to_int(receipt['blockNumber']) if receipt.get('blockNumber') is not None else None,
+            'gas_used': to_int(receipt['gasUsed']) if receipt.get('gasUsed') is not None else None,
+            'submitted_at': self.submitted_at
+        }
+
+
+class ReceiptTracker:
+    """Resolves receipts of submitted transactions in the background
+
+    Senders register a hash with track() and return immediately. Receipts
+    arrive from the block watcher as blocks are mined, and wake anyone
+    blocked in wait(). A slower reconcile loop re-checks every pending hash
+    in one JSON-RPC batch per TX_POLL_INTERVAL, which catches anything the
+    block stream missed and marks long-unmined hashes as dropped.
+
+    Example:
+        tracker = get_receipt_tracker(web3)
+        tracker.track(tx_hash)
+        result = tracker.wait(tx_hash, timeout=30)  # or tracker.status(tx_hash)
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.poll_interval = settings.TX_POLL_INTERVAL
+        self.batch_size = settings.TX_POLL_BATCH_SIZE
+        self.pending_timeout = settings.TX_PENDING_TIMEOUT
+        self.keep = settings.TX_TRACKER_KEEP
+        self._cond = threading.Condition()
+        self._txs: "OrderedDict[str, _TrackedTx]" = OrderedDict()
+        self._pending: Dict[str, _TrackedTx] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.watcher = get_block_watcher(web3)
+
+    def _start(self) -> None:
+        if self._thread is None:
+            self.watcher.add_listener(self._on_block)
+            self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+            self._thread.start()
+
+    def track(self, tx_hash: Any, sender: Optional[str] = None, submitted_at: Optional[float] = None) -> str:
+        """Start tracking a submitted transaction
+
+        Args:
+            tx_hash: Transaction hash
+            sender: Sending address, resynced in the nonce manager if the transaction is dropped
+            submitted_at: When it was sent, if before this call (dropped detection counts from here)
+
+        Returns:
+            str: Normalized transaction hash
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        with self._cond:
+            if tx_hash not in self._txs:
+                tracked = self._txs[tx_hash] = _TrackedTx(tx_hash, sender)
+                if submitted_at is not None:
+                    tracked.submitted_at = submitted_at
+                self._pending[tx_hash] = tracked
+                while len(self._txs) > self.keep:
+                    old_hash, _ = self._txs.popitem(last=False)
+                    self._pending.pop(old_hash, None)
+            self._start()
+            self._cond.notify_all()
+        self.watcher.watch(tx_hash)
+        return tx_hash
+
+    def add_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Call callback(tx_hash, receipt) whenever a tracked transaction is mined"""
+        with self._cond:
+            self._listeners.append(callback)
+
+    def status(self, tx_hash: Any) -> Optional[Dict[str, Any]]:
+        """Current status of a tracked transaction, None if it is not tracked"""
+        with self._cond:
+            tracked = self._txs.get(normalize_tx_hash(tx_hash))
+            return tracked.as_dict() if tracked else None
+
+    def receipt(self, tx_hash: Any) -> Optional[Dict[str, Any]]:
+        """Raw JSON-RPC receipt of a mined transaction, None while pending"""
+        with self._cond:
+            tracked = self._txs.get(normalize_tx_hash(tx_hash))
+            return tracked.receipt if tracked else None
+
+    def wait(self, tx_hash: Any, timeout: Optional[float] = None, track: bool = True) -> Optional[Dict[str, Any]]:
+        """Block until the transaction leaves the pending state or timeout expires
+
+        Args:
+            tx_hash: Transaction hash
+            timeout: Seconds to wait, None to wait indefinitely
+            track: Start tracking the hash if needed; with False an untracked hash returns None
+
+        Returns:
+            Dict[str, Any]: Transaction status (still pending on timeout)
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        if track:
+            self.track(tx_hash)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            tracked = self._txs.get(tx_hash)
+            if tracked is None:
+                # not tracked, or evicted past TX_TRACKER_KEEP since track()
+                return None
+            while tracked.status == STATUS_PENDING:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return tracked.as_dict()
+
+    def lookup(self, tx_hash: Any) -> Optional[Dict[str, Any]]:
+        """One-shot receipt lookup for a hash this process does not track
+
+        Does not start tracking, so callers can pass untrusted hashes.
+
+        Returns:
+            Dict[str, Any]: Status of the mined transaction, None if the node has no receipt
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        with RpcBatch(self.web3, "ReceiptTracker.lookup") as batch:
+            item = batch.add("eth_getTransactionReceipt", [tx_hash])
+        receipt = item.result
+        if receipt is None:
+            return None
+        tracked = _TrackedTx(tx_hash)
+        tracked.submitted_at = None
+        tracked.receipt = receipt
+        tracked.status = STATUS_SUCCESS if to_int(receipt.get('status')) == 1 else STATUS_FAILED
+        return tracked.as_dict()
+
+    def _on_block(self, block_number: int, receipts: List[Dict[str, Any]]) -> None:
+        for receipt in receipts:
+            self._resolve(receipt['transactionHash'].lower(), receipt)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # give the block stream the first chance to resolve new hashes
+            time.sleep(self.poll_interval)
+            with self._cond:
+                pending = list(self._pending)
+            try:
+                self._poll(pending)
+            except Exception as e:
+                print(f"[ReceiptTracker] Poll failed: {str(e)}")
+
+    def _poll(self, tx_hashes: List[str]) -> None:
+        """Fetch receipts for tx_hashes, batch_size hashes per round trip"""
+        for start in range(0, len(tx_hashes), self.batch_size):
+            chunk = tx_hashes[start:start + self.batch_size]
+            with RpcBatch(self.web3, "ReceiptTracker.poll") as batch:
+                items = [batch.add("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk]
+            for tx_hash, item in zip(chunk, items):
+                try:
+                    receipt = item.result
+                except Exception as e:
+                    print(f"[ReceiptTracker] Receipt lookup failed for {tx_hash}: {str(e)}")
+                    continue
+                self._resolve(tx_hash, receipt)
+
+    def _resolve(self, tx_hash: str, receipt: Optional[Dict[str, Any]]) -> None:
+        with self._cond:
+            tracked = self._pending.get(tx_hash)
+            if tracked is None:
+                return
+            if receipt is None:
+                if time.time() - tracked.submitted_at < self.pending_timeout:
+                    return
+                self.watcher.unwatch([tx_hash])
+                del self._pending[tx_hash]
+                dropped = True
+            else:
+                del self._pending[tx_hash]
+                tracked.receipt = receipt
+                listeners = list(self._listeners)
+                dropped = False
+
+        if dropped:
+            # the dropped nonce would leave a gap every later send waits
+            # behind; re-read it from the node (every address if the sender
+            # is unknown) before waiters see the status and send again
+            get_nonce_manager(self.web3).resync(tracked.sender)
+            with self._cond:
+                tracked.status = STATUS_DROPPED
+                self._cond.notify_all()
+            return
+
+        # listeners (e.g. cache eviction) run before waiters see the new status
+        for listener in listeners:
+            try:
+                listener(tx_hash, receipt)
+            except Exception as e:
+                print(f"[ReceiptTracker] Listener failed: {str(e)}")
+
+        with self._cond:
+            tracked.status = STATUS_SUCCESS if to_int(receipt.get('status')) == 1 else STATUS_FAILED
+            self._cond.notify_all()
+
+
+def get_receipt_tracker(web3: Optional[Web3] = None) -> ReceiptTracker:
+    """Get the process-wide receipt tracker"""
+    global _tracker
+    if _tracker is None:
+        with _lock:
+            if _tracker is None:
+                if web3 is None:
+                    from app.core.provider import get_web3
+                    web3 = get_web3()
+                _tracker = ReceiptTracker(web3, Settings())
+    return _tracker
+
+
+def format_receipt(web3: Web3, tx_hash: str, receipt: Dict[str, Any]) -> AttributeDict:
+    """Format a raw JSON-RPC receipt like web3.eth.get_transaction_receipt()"""
+    try:
+        from web3._utils.method_formatters import receipt_formatter
+    except ImportError:
+        return web3.eth.get_transaction_receipt(tx_hash)
+    return AttributeDict.recursive(receipt_formatter(receipt))
+
+
+def wait_for_receipt(web3: Web3, tx_hash: Any, timeout: Optional[float] = 120) -> AttributeDict:
+    """Drop-in replacement for web3.eth.wait_for_transaction_receipt
+
+    Waits on the shared block stream instead of polling the node per hash.
+
+    Args:
+        web3: Web3 instance
+        tx_hash: Transaction hash
+        timeout: Seconds to wait
+
+    Returns:
+        AttributeDict: Transaction receipt
+
+    Raises:
+        TimeExhausted: If the transaction is not mined (or dropped) within timeout
+    """
+    tracker = get_receipt_tracker(web3)
+    result = tracker.wait(tx_hash, timeout=timeout)
+    if result is None:
+        raise TimeExhausted(f"Transaction {normalize_tx_hash(tx_hash)} is no longer tracked")
+    receipt = tracker.receipt(result['tx_hash'])
+    if receipt is None:
+        raise TimeExhausted(
+            f"Transaction {result['tx_hash']} is {result['status']} after {timeout} seconds"
+        )
+    return format_receipt(web3, result['tx_hash'], receipt)
@@ -1,12 +1,21 @@
+from typing import List, Optional, Sequence
 from web3 import Web3
-from eth_account import Account
-from pathlib import Path
-import os
-import json
 from config.settings import Settings
 from app.core.wallet.safe_wallet import SafeWallet
 from config.initial_address_setup import INITIAL_CONTRACTS, INITIAL_SPENDERS, INITIAL_SILOS
 from app.db.database import get_wallet 
+from app.core.rpc_batch import RpcBatch
+from app.core.nonce_manager import get_nonce_manager
+from app.core.fee_oracle import get_fee_oracle
+from app.core.gas_estimator import get_gas_estimator, call_shape
+from app.core.tx_tracker import wait_for_receipt
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
+from app.core.multisend import MultiSendOp, OPERATION_CALL, OPERATION_DELEGATECALL, encode_multisend
+from app.core.wallet.step_graph import Step, StepGraph
+
+# ProxyCreated event of the Cobo factory; the proxy address is in the log data
+PROXY_CREATED_TOPIC = "532cf4635ae9ff4e1e42ba14917e825d00f602f28297cc654fa3b414b911232b"
 
 class AuthorizerManager:
     """Manager for Cobo Argus authorizers"""
@@ -14,11 +23,6 @@ class AuthorizerManager:
     def __init__(self, web3: Web3, settings: Settings):
         self.web3 = web3
         self.settings = settings
-        self.helper_contract = self._get_contract(
-            settings.ARGUS_HELPER_ADDRESS, 
-            "ArgusAccountHelper"
-        )
-        
         
         self.authorizer_implementations = {
             "ApproveAuthorizerV2": settings.APPROVE_AUTHORIZER_IMPL,
@@ -45,71 +49,140 @@ class AuthorizerManager:
         """
         
         try:
-            impl_address = self.authorizer_implementations.get(authorizer_type)
-            if not impl_address:
-                raise ValueError(f"Unknown authorizer type: {authorizer_type}")
-            
-            
-            name_abi = [{
-                "inputs": [],
-                "name": "NAME",
-                "outputs": [{"type": "bytes32"}],
-                "stateMutability": "view",
-                "type": "function"
-            }]
-            
-            impl_contract = self.web3.eth.contract(address=impl_address, abi=name_abi)
-            authorizer_name = impl_contract.functions.NAME().call()
-            
-            
-            current_block = self.web3.eth.block_number
-            name_bytes = authorizer_name[:28]  
-            block_bytes = current_block.to_bytes(4, 'big')
-            tag = name_bytes + block_bytes
-            
-            
-            
-            
-            safe_address = self._get_safe_address_from_cobo(cobo_address)
-            safe = SafeWallet(self.web3, self.settings, safe_address)
-            
-            init_data = self.helper_contract.encode_abi(
-                "createAuthorizer",
-                args=[self.settings.COBO_FACTORY_ADDRESS, cobo_address, f"0x{authorizer_name.hex()}", tag]
-            )
-            
-            tx_hash = safe.execute_transaction(
-                to=self.settings.ARGUS_HELPER_ADDRESS,
-                data=init_data,
-                operation=1  # DelegateCall
-            )
-            
-            
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-            authorizer_address = self._get_proxy_address_from_receipt(receipt)
-            print(f"Found authorizer proxy at: {authorizer_address}")
-            
-            
-            self.setup_roles(user_address, safe_address, cobo_address, authorizer_address, role_name)
-            
-            if authorizer_type == "ApproveAuthorizerV2":
-                self.setup_approve_list_manager(safe_address, authorizer_address)
-                
-                self.setup_initial_addresses(authorizer_address)
-                
-                self.transfer_approve_list_manager(safe_address, authorizer_address, user_address)
-
-            elif authorizer_type == "SiloAuthorizer":
-                self.transfer_silo_admin(safe_address, authorizer_address, self.settings.DEPLOYER_ADDRESS)
-                self.setup_silo_markets(safe_address, authorizer_address)
-                self.transfer_silo_admin(safe_address, authorizer_address, user_address)
-            
-            return authorizer_address
+            ctx = {
+                'user_address': user_address,
+                'cobo_address': cobo_address,
+                'safe_address': self._get_safe_address_from_cobo(cobo_address)
+            }
+            StepGraph(self.authorizer_steps(authorizer_type, role_name, requires=())).run(self.web3, ctx)
+            return ctx[f"{role_name}_authorizer_address"]
         
         except Exception as e:
             print(f"Error creating authorizer: {str(e)}")
             raise
 
+    def authorizer_steps(
+        self,
+        authorizer_type: str,
+        role_name: str,
+        requires: Sequence[str] = ("create_cobo",)
+    ) -> List[Step]:
+        """Steps of create_authorizer, one per transaction
+        
+        Reads user_address, safe_address, cobo_address and optionally
+        agent_address from the context and outputs
+        <role_name>_authorizer_address. All steps belong to the group
+        authorizer_<role_name>.
+        
+        Args:
+            authorizer_type: Type of authorizer (from implementations map)
+            role_name: Role granted to the agent
+            requires: Steps that must be done before the authorizer is created
+            
+        Returns:
+            List[Step]: Steps in execution order
+        """
+        if authorizer_type not in self.authorizer_implementations:
+            raise ValueError(f"Unknown authorizer type: {authorizer_type}")
+        
+        group = f"authorizer_{role_name}"
+        key = f"{role_name}_authorizer_address"
+        steps = [
+            Step(
+                f"{group}_create",
+                requires=requires,
+                submit=lambda ctx: self.submit_create_authorizer(ctx['safe_address'], ctx['cobo_address'], authorizer_type),
+                confirm=lambda ctx, receipt: {key: self._get_proxy_address_from_receipt(receipt)},
+                group=group
+            ),
+            Step(
+                f"{group}_roles",
+                requires=(f"{group}_create",),
+                submit=lambda ctx: self.submit_setup_roles(
+                    ctx['user_address'], ctx['safe_address'], ctx['cobo_address'], ctx[key], role_name,
+                    agent_address=ctx.get('agent_address')
+                ),
+                group=group
+            ),
+        ]
+        
+        if authorizer_type == "ApproveAuthorizerV2":
+            calls = [
+                ("list_manager", lambda ctx: self._submit_safe_call(
+                    ctx['safe_address'], ctx[key],
+                    encode_call("ApproveAuthorizerV2", "setApproveListManager", self.settings.DEPLOYER_ADDRESS)
+                )),
+                ("contracts", lambda ctx: self._submit_deployer_call(
+                    ctx[key], encode_call("ApproveAuthorizerV2", "addContracts", INITIAL_CONTRACTS)
+                )),
+                ("spenders", lambda ctx: self._submit_deployer_call(
+                    ctx[key], encode_call("ApproveAuthorizerV2", "addSpenders", INITIAL_SPENDERS)
+                )),
+                ("list_manager_transfer", lambda ctx: self._submit_safe_call(
+                    ctx['safe_address'], ctx[key],
+                    encode_call("ApproveAuthorizerV2", "setApproveListManager", ctx['user_address'])
+                )),
+            ]
+        elif authorizer_type == "SiloAuthorizer":
+            calls = [
+                ("admin", lambda ctx: self._submit_safe_call(
+                    ctx['safe_address'], ctx[key],
+                    encode_call("SiloAuthorizer", "setAdmin", self.settings.DEPLOYER_ADDRESS)
+                )),
+                ("pools", lambda ctx: self._submit_deployer_call(
+                    ctx[key], encode_call("SiloAuthorizer", "addPoolAddresses", INITIAL_SILOS)
+                )),
+                ("admin_transfer", lambda ctx: self._submit_safe_call(
+                    ctx['safe_address'], ctx[key],
+                    encode_call("SiloAuthorizer", "setAdmin", ctx['user_address'])
+                )),
+            ]
+        else:
+            calls = []
+        
+        for suffix, submit in calls:
+            steps.append(Step(f"{group}_{suffix}", requires=(steps[-1].name,), submit=submit, group=group))
+        return steps
+
+    def submit_create_authorizer(self, safe_address: str, cobo_address: str, authorizer_type: str) -> str:
+        """Send the createAuthorizer Safe transaction without waiting for it
+        
+        The proxy address is in the ProxyCreated log of the receipt.
+        
+        Returns:
+            str: Transaction hash
+        """
+        impl_address = self.authorizer_implementations.get(authorizer_type)
+        if not impl_address:
+            raise ValueError(f"Unknown authorizer type: {authorizer_type}")
+        
+        # NAME() is declared by every Cobo authorizer (BaseAuthorizer)
+        impl_contract = get_abi_registry().contract(self.web3, "BaseAuthorizer", impl_address)
+        with RpcBatch(self.web3, "AuthorizerManager.create_authorizer") as batch:
+            name_call = batch.call(impl_contract, "NAME")
+            block_number = batch.block_number()
+        authorizer_name = name_call.result
+        
+        
+        current_block = block_number.result
+        name_bytes = authorizer_name[:28]  
+        block_bytes = current_block.to_bytes(4, 'big')
+        tag = name_bytes + block_bytes
+        
+        safe = SafeWallet(self.web3, self.settings, safe_address)
+        
+        init_data = encode_call(
+            "ArgusAccountHelper",
+            "createAuthorizer",
+            self.settings.COBO_FACTORY_ADDRESS, cobo_address, authorizer_name, tag
+        )
+        
+        return safe.submit_transaction(
+            to=self.settings.ARGUS_HELPER_ADDRESS,
+            data=init_data,
+            operation=1  # DelegateCall
+        )
+
     def setup_roles(
         self,
         user_address: str,      # user address for getting agent
@@ -119,26 +192,47 @@ class AuthorizerManager:
         role_name: str
     ):
         """Setup roles for authorizer"""
+        tx_hash = self.submit_setup_roles(user_address, safe_address, cobo_address, authorizer_address, role_name)
+        wait_for_receipt(self.web3, tx_hash)
+
+    def submit_setup_roles(
+        self,
+        user_address: str,
+        safe_address: str,
+        cobo_address: str,
+        authorizer_address: str,
+        role_name: str,
+        agent_address: Optional[str] = None
+    ) -> str:
+        """Send the setup_roles MultiSend without waiting for it
         
-        wallet_data = get_wallet(user_address) 
-        agent_address = wallet_data['agent_address']
+        Args:
+            agent_address: Agent to grant the role to (read from the wallets database if not given)
+            
+        Returns:
+            str: Transaction hash
+        """
+        if agent_address is None:
+            wallet_data = get_wallet(user_address) 
+            agent_address = wallet_data['agent_address']
         
         role_bytes = self.web3.to_bytes(text=role_name).ljust(32, b'\0')
         role_names = [role_bytes]
         
-        transactions = [
+        operations = [
             self.build_add_roles_tx(cobo_address, role_names),
             self.build_add_authorizer_tx(cobo_address, authorizer_address, role_names),
             self.build_grant_roles_tx(cobo_address, role_names, agent_address)
         ]
         
-        self._send_multisend_tx(safe_address, transactions)
+        return self._submit_multisend_tx(safe_address, operations)
 
     def _build_create_tx(self, cobo_address: str, name: str, tag: bytes) -> dict:
         """Build transaction for creating authorizer"""
-        init_data = self.helper_contract.encode_abi(
+        init_data = encode_call(
+            "ArgusAccountHelper",
             "createAuthorizer",
-            args=[self.settings.COBO_FACTORY_ADDRESS, cobo_address, name, tag]
+            self.settings.COBO_FACTORY_ADDRESS, cobo_address, name, tag
         )
         
         return {
@@ -146,21 +240,55 @@ class AuthorizerManager:
             'to': self.settings.ARGUS_HELPER_ADDRESS,
             'data': init_data,
             'gas': 2000000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price,
             'chainId': self.settings.CHAIN_ID
         }
 
+    def _submit_transaction(self, tx: dict):
+        """Sign and send a deployer transaction without waiting for it
+
+        The nonce comes from the nonce manager, so several deployer
+        transactions can be in flight at once. Fee fields come from the
+        shared fee oracle, and the gas limit from the gas estimator with
+        tx['gas'] as the fallback.
+        """
+        estimator = get_gas_estimator(self.web3)
+        shape = call_shape(tx['to'], tx['data'])
+        gas = estimator.gas_limit(tx, shape, default=tx['gas'])
+        tx = get_fee_oracle(self.web3).apply({**tx, 'gas': gas})
+        with get_nonce_manager(self.web3).reserve(self.settings.DEPLOYER_ADDRESS) as nonce:
+            signed_tx = self.web3.eth.account.sign_transaction(
+                {**tx, 'nonce': nonce},
+                self.settings.DEPLOYER_PRIVATE_KEY
+            )
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        estimator.observe(tx_hash, shape, gas)
+        return tx_hash
+
+    def _submit_deployer_call(self, to: str, data: bytes) -> str:
+        """Send a direct deployer call to an authorizer without waiting for it"""
+        return self._submit_transaction({
+            'from': self.settings.DEPLOYER_ADDRESS,
+            'to': to,
+            'data': data,
+            'gas': 600000,
+            'chainId': self.settings.CHAIN_ID
+        }).hex()
+
+    def _submit_safe_call(self, safe_address: str, to: str, data: bytes) -> str:
+        """Send a Safe CALL (operation 0) without waiting for it"""
+        return SafeWallet(self.web3, self.settings, safe_address).submit_transaction(
+            to=to,
+            data=data,
+            operation=0  # Call
+        )
+
     def _send_transaction(self, tx: dict) -> dict:
         """Send and wait for transaction"""
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        return self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = self._submit_transaction(tx)
+        return wait_for_receipt(self.web3, tx_hash)
 
     def _get_proxy_address_from_receipt(self, receipt: dict) -> str:
         """Get proxy address from ProxyCreated event"""
-        PROXY_CREATED_TOPIC = "532cf4635ae9ff4e1e42ba14917e825d00f602f28297cc654fa3b414b911232b"
-        
         for log in receipt['logs']:
             if log['topics'][0].hex().lower() == PROXY_CREATED_TOPIC.lower():
                 raw_address = "0x" + log['data'].hex()[-40:]
@@ -168,88 +296,44 @@ class AuthorizerManager:
                 
         raise Exception("ProxyCreated event not found in receipt")
 
-    def _get_contract(self, address: str, name: str):
-        """Get contract instance"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", f"{name}.json")
-        with open(abi_path, "r") as f:
-            contract_abi = json.load(f)
-        return self.web3.eth.contract(address=address, abi=contract_abi)
 
-    def build_add_roles_tx(self, cobo_address: str, role_names: list) -> bytes:
-        """Build transaction data for adding roles"""
-        cobo_contract = self._get_contract(cobo_address, "CoboSafeAccount")
+    def build_add_roles_tx(self, cobo_address: str, role_names: list) -> MultiSendOp:
+        """Build MultiSend operation for adding roles"""
+        cobo_contract = get_abi_registry().contract(self.web3, "CoboSafeAccount", cobo_address)
         role_manager_address = cobo_contract.functions.roleManager().call()
         
-        role_manager = self._get_contract(role_manager_address, "RoleManager")
-        tx_data = role_manager.encode_abi("addRoles", args=[role_names])
-        
-        if isinstance(tx_data, str) and tx_data.startswith('0x'):
-            tx_data = bytes.fromhex(tx_data[2:])
-        
-        operation = 0  # CALL
-        address = bytes.fromhex(role_manager_address[2:])
-        value = (0).to_bytes(32, 'big')
-        data_length = len(tx_data).to_bytes(32, 'big')
+        tx_data = encode_call("RoleManager", "addRoles", role_names)
         
-        return b''.join([operation.to_bytes(1, 'big'), address, value, data_length, tx_data])
+        return MultiSendOp(role_manager_address, tx_data, operation=OPERATION_CALL)
 
-    def build_add_authorizer_tx(self, cobo_address: str, authorizer_address: str, role_names: list) -> bytes:
-        """Build transaction data for adding authorizer"""
-        tx_data = self.helper_contract.encode_abi(
-            "addAuthorizer",
-            args=[cobo_address, authorizer_address, False, role_names]
-        )
-        
-        if isinstance(tx_data, str) and tx_data.startswith('0x'):
-            tx_data = bytes.fromhex(tx_data[2:])
+    def build_add_authorizer_tx(self, cobo_address: str, authorizer_address: str, role_names: list) -> MultiSendOp:
+        """Build MultiSend operation for adding authorizer"""
+        tx_data = encode_call("ArgusAccountHelper", "addAuthorizer", cobo_address, authorizer_address, False, role_names)
         
-        operation = 1  # DELEGATECALL
-        address = bytes.fromhex(self.settings.ARGUS_HELPER_ADDRESS[2:])
-        value = (0).to_bytes(32, 'big')
-        data_length = len(tx_data).to_bytes(32, 'big')
-        
-        return b''.join([operation.to_bytes(1, 'big'), address, value, data_length, tx_data])
+        return MultiSendOp(self.settings.ARGUS_HELPER_ADDRESS, tx_data, operation=OPERATION_DELEGATECALL)
 
-    def build_grant_roles_tx(self, cobo_address: str, role_names: list, agent_address: str) -> bytes:
-        """Build transaction data for granting roles"""
-        tx_data = self.helper_contract.encode_abi(
-            "grantRoles",
-            args=[cobo_address, role_names, [agent_address]]
-        )
+    def build_grant_roles_tx(self, cobo_address: str, role_names: list, agent_address: str) -> MultiSendOp:
+        """Build MultiSend operation for granting roles"""
+        tx_data = encode_call("ArgusAccountHelper", "grantRoles", cobo_address, role_names, [agent_address])
         
-        if isinstance(tx_data, str) and tx_data.startswith('0x'):
-            tx_data = bytes.fromhex(tx_data[2:])
-        
-        operation = 1  # DELEGATECALL
-        address = bytes.fromhex(self.settings.ARGUS_HELPER_ADDRESS[2:])
-        value = (0).to_bytes(32, 'big')
-        data_length = len(tx_data).to_bytes(32, 'big')
-        
-        return b''.join([operation.to_bytes(1, 'big'), address, value, data_length, tx_data])
+        return MultiSendOp(self.settings.ARGUS_HELPER_ADDRESS, tx_data, operation=OPERATION_DELEGATECALL)
 
-    def _send_multisend_tx(self, safe_address: str, transactions: list) -> dict:
-        """Send transactions through MultiSend"""
-        multi_send_data = b''.join(transactions)
-        
-        multisend_contract = self._get_contract(
-            self.settings.MULTISEND_ADDRESS,
-            "MultiSend"
-        )
+    def _send_multisend_tx(self, safe_address: str, operations: list) -> dict:
+        """Send MultiSendOp operations through MultiSend"""
+        tx_hash = self._submit_multisend_tx(safe_address, operations)
         
-        multi_tx_data = multisend_contract.encode_abi(
-            "multiSend",
-            args=[multi_send_data]
-        )
+        return wait_for_receipt(self.web3, tx_hash)
+
+    def _submit_multisend_tx(self, safe_address: str, operations: list) -> str:
+        """Send MultiSendOp operations through MultiSend without waiting for the receipt"""
+        multi_tx_data = encode_multisend(operations)
         
         safe = SafeWallet(self.web3, self.settings, safe_address)
-        tx_hash = safe.execute_transaction(
+        return safe.submit_transaction(
             to=self.settings.MULTISEND_ADDRESS,
             data=multi_tx_data,
             operation=1  # DelegateCall
         )
-        
-        
-        return self.web3.eth.wait_for_transaction_receipt(tx_hash)
 
     def setup_approve_list_manager(self, safe_address: str, authorizer_address: str) -> None:
         """Setup approve list manager for authorizer
@@ -258,12 +342,7 @@ class AuthorizerManager:
             safe_address: Address of Safe wallet
             authorizer_address: Address of authorizer
         """
-        authorizer_contract = self._get_contract(authorizer_address, "ApproveAuthorizerV2")
-        
-        tx_data = authorizer_contract.encode_abi(
-            "setApproveListManager",
-            args=[self.settings.DEPLOYER_ADDRESS]
-        )
+        tx_data = encode_call("ApproveAuthorizerV2", "setApproveListManager", self.settings.DEPLOYER_ADDRESS)
         
         safe = SafeWallet(self.web3, self.settings, safe_address)
         tx_hash = safe.execute_transaction(
@@ -275,7 +354,7 @@ class AuthorizerManager:
 
     def _get_safe_address_from_cobo(self, cobo_address: str) -> str:
         """Get Safe address from Cobo contract"""
-        cobo_contract = self._get_contract(cobo_address, "CoboSafeAccount")
+        cobo_contract = get_abi_registry().contract(self.web3, "CoboSafeAccount", cobo_address)
         return cobo_contract.functions.safe().call()
 
     def setup_initial_addresses(self, authorizer_address: str) -> None:
@@ -285,47 +364,22 @@ class AuthorizerManager:
             authorizer_address: Address of authorizer
         """
         
-        authorizer_contract = self._get_contract(authorizer_address, "ApproveAuthorizerV2")
-        
         print("Adding contracts:", INITIAL_CONTRACTS)
-        tx_data = authorizer_contract.encode_abi(
-            "addContracts",
-            args=[INITIAL_CONTRACTS]
-        )
-        
-        tx = {
-            'from': self.settings.DEPLOYER_ADDRESS,
-            'to': authorizer_address,
-            'data': tx_data,
-            'gas': 600000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price,
-            'chainId': self.settings.CHAIN_ID
-        }
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-        
-        tx_data = authorizer_contract.encode_abi(
-            "addSpenders",
-            args=[INITIAL_SPENDERS]
-        )
-        
-        tx = {
-            'from': self.settings.DEPLOYER_ADDRESS,
-            'to': authorizer_address,
-            'data': tx_data,
-            'gas': 600000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price,
-            'chainId': self.settings.CHAIN_ID
-        }
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hashes = []
+        
+        # both calls are independent: send them back to back, then wait
+        for fn_name, args in (("addContracts", [INITIAL_CONTRACTS]), ("addSpenders", [INITIAL_SPENDERS])):
+            tx_data = encode_call("ApproveAuthorizerV2", fn_name, *args)
+            tx_hashes.append(self._submit_transaction({
+                'from': self.settings.DEPLOYER_ADDRESS,
+                'to': authorizer_address,
+                'data': tx_data,
+                'gas': 600000,
+                'chainId': self.settings.CHAIN_ID
+            }))
+        
+        for tx_hash in tx_hashes:
+            receipt = wait_for_receipt(self.web3, tx_hash)
 
     def transfer_approve_list_manager(self, safe_address: str, authorizer_address: str, new_manager: str) -> None:
         """Transfer approve list manager role to new address
@@ -335,12 +389,7 @@ class AuthorizerManager:
             authorizer_address: Address of authorizer
             new_manager: Address that will become the new manager
         """
-        authorizer_contract = self._get_contract(authorizer_address, "ApproveAuthorizerV2")
-        
-        tx_data = authorizer_contract.encode_abi(
-            "setApproveListManager",
-            args=[new_manager]
-        )
+        tx_data = encode_call("ApproveAuthorizerV2", "setApproveListManager", new_manager)
         
         safe = SafeWallet(self.web3, self.settings, safe_address)
         tx_hash = safe.execute_transaction(
@@ -349,19 +398,14 @@ class AuthorizerManager:
             operation=0  # Call
         )
         
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = wait_for_receipt(self.web3, tx_hash)
         print(f"Transferred approve list manager role to {new_manager}")
 
     
 
     def transfer_silo_admin(self, safe_address: str, authorizer_address: str, new_admin: str) -> None:
         """Transfer silo admin role to new address"""
-        authorizer_contract = self._get_contract(authorizer_address, "SiloAuthorizer")
-        
-        tx_data = authorizer_contract.encode_abi(
-            "setAdmin",
-            args=[new_admin]
-        )
+        tx_data = encode_call("SiloAuthorizer", "setAdmin", new_admin)
         
         safe = SafeWallet(self.web3, self.settings, safe_address)
         tx_hash = safe.execute_transaction(
@@ -369,28 +413,17 @@ class AuthorizerManager:
             data=tx_data,
             operation=0  # Call
         )
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = wait_for_receipt(self.web3, tx_hash)
 
     def setup_silo_markets(self, safe_address: str, authorizer_address: str) -> None:
-        authorizer_contract = self._get_contract(authorizer_address, "SiloAuthorizer")
-        
-        tx_data = authorizer_contract.encode_abi(
-            "addPoolAddresses",
-            args=[INITIAL_SILOS]
-        ) 
+        tx_data = encode_call("SiloAuthorizer", "addPoolAddresses", INITIAL_SILOS)
 
-        tx = {
+        receipt = self._send_transaction({
             'from': self.settings.DEPLOYER_ADDRESS,
             'to': authorizer_address,
             'data': tx_data,
             'gas': 600000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price,
             'chainId': self.settings.CHAIN_ID
-        }
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        })
         print(f"Added silo markets: {receipt}")
     
\ No newline at end of file
@@ -1,10 +1,18 @@
+from typing import List, Sequence
 from web3 import Web3
 from eth_account import Account
-from pathlib import Path
-import os
-import json
 from config.settings import Settings
 from app.core.wallet.authorizer_manager import AuthorizerManager
+from app.core.nonce_manager import get_nonce_manager
+from app.core.fee_oracle import get_fee_oracle
+from app.core.gas_estimator import get_gas_estimator, call_shape
+from app.core.tx_tracker import wait_for_receipt
+from app.core.wallet.step_graph import Step
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
+
+# bytes32 name of the CoboSafeAccount implementation on the Cobo factory
+COBO_SAFE_ACCOUNT_NAME = b"CoboSafeAccount".ljust(32, b'\0')
 
 class CoboArgusFactory:
     """Factory for creating Cobo Argus wallets"""
@@ -13,7 +21,6 @@ class CoboArgusFactory:
         self.web3 = web3
         self.settings = settings
         self.argus_helper_address = settings.ARGUS_HELPER_ADDRESS
-        self.helper_contract = self._init_helper_contract()
     
     def create_cobo_for_safe(self, safe_address: str, user_address: str) -> str:
         """Create Cobo Argus for Safe wallet
@@ -25,17 +32,33 @@ class CoboArgusFactory:
         Returns:
             str: Address of created Cobo Argus
         """
+        tx_hash = self.submit_init_argus(safe_address, user_address)
+        receipt = wait_for_receipt(self.web3, tx_hash, timeout=120)
+        
+        
+        
+        try:
+            return self._get_cobo_address_from_receipt(receipt)
+        except Exception as e:
+            print("Failed to get Cobo address from receipt:", str(e))
+            print("Full receipt:", receipt)
+            return None
+
+    def submit_init_argus(self, safe_address: str, user_address: str) -> str:
+        """Send the initArgus Safe transaction without waiting for it
         
+        Returns:
+            str: Transaction hash
+        """
         safe_contract = self._get_safe_contract(safe_address)
         
        
-        salt = self.web3.to_bytes(hexstr=f"{user_address}{'32'}").rjust(32, b'\0')
+        salt = self.cobo_salt(user_address)
         
-        init_data = self.helper_contract.encode_abi(
-            "initArgus",
-            args=[self.settings.COBO_FACTORY_ADDRESS, salt]
-        )
+        init_data = encode_call("ArgusAccountHelper", "initArgus", self.settings.COBO_FACTORY_ADDRESS, salt)
         
+        safe_nonce = safe_contract.functions.nonce().call()
+        fee_fields = get_fee_oracle(self.web3).fee_fields()
         
         tx_hash = safe_contract.functions.getTransactionHash(
             self.argus_helper_address,  # to
@@ -47,13 +70,13 @@ class CoboArgusFactory:
             0,                          # gasPrice
             "0x0000000000000000000000000000000000000000",  # gasToken
             "0x0000000000000000000000000000000000000000",  # refundReceiver
-            safe_contract.functions.nonce().call()          # nonce
+            safe_nonce                                      # nonce
         ).call()
         
         
         signed = Account._sign_hash(tx_hash, self.settings.DEPLOYER_PRIVATE_KEY)
         
-        tx = safe_contract.functions.execTransaction(
+        exec_fn = safe_contract.functions.execTransaction(
             self.argus_helper_address,  # to
             0,                          # value
             init_data,                  # data
@@ -64,56 +87,51 @@ class CoboArgusFactory:
             "0x0000000000000000000000000000000000000000",  # gasToken
             "0x0000000000000000000000000000000000000000",  # refundReceiver
             signed.signature                                # signature
-        ).build_transaction({
+        )
+        # the Cobo address comes from the salt, so every initArgus has the same shape
+        shape = call_shape(self.argus_helper_address, init_data)
+        gas = get_gas_estimator(self.web3).gas_limit({
             'from': self.settings.DEPLOYER_ADDRESS,
-            'gas': 2000000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price,
-            'chainId': self.settings.CHAIN_ID
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        
-        
-        
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-        
-        
-        
-        try:
-            return self._get_cobo_address_from_receipt(receipt)
-        except Exception as e:
-            print("Failed to get Cobo address from receipt:", str(e))
-            print("Full receipt:", receipt)
-            return None
+            'to': safe_address,
+            'data': encode_call("SafeWallet", "execTransaction", *exec_fn.args)
+        }, shape, default=2000000)
+        
+        with get_nonce_manager(self.web3).reserve(self.settings.DEPLOYER_ADDRESS) as deployer_nonce:
+            tx = exec_fn.build_transaction({
+                'from': self.settings.DEPLOYER_ADDRESS,
+                'gas': gas,
+                'nonce': deployer_nonce,
+                'chainId': self.settings.CHAIN_ID,
+                **fee_fields
+            })
+        
+            signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        get_gas_estimator(self.web3).observe(tx_hash, shape, gas)
+        
+        return tx_hash.hex()
+
+    def create_cobo_steps(self, requires: Sequence[str] = ("create_safe",)) -> List[Step]:
+        """Steps deploying the Cobo Argus account of ctx['safe_address']; outputs cobo_address"""
+        return [Step(
+            "create_cobo",
+            requires=requires,
+            submit=lambda ctx: self.submit_init_argus(ctx['safe_address'], ctx['user_address']),
+            confirm=lambda ctx, receipt: {'cobo_address': self._get_cobo_address_from_receipt(receipt)}
+        )]
     
-    def _init_helper_contract(self):
-        """Initialize Argus helper contract"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", "ArgusAccountHelper.json")
-        with open(abi_path, "r") as f:
-            helper_abi = json.load(f)
-            
-        return self.web3.eth.contract(
-            address=self.argus_helper_address,
-            abi=helper_abi
-        )
+    def cobo_salt(self, user_address: str) -> bytes:
+        """CREATE2 salt of the user's Cobo account"""
+        return self.web3.to_bytes(hexstr=f"{user_address}{'32'}").rjust(32, b'\0')
     
     def _get_safe_contract(self, address: str):
         """Get Safe contract instance"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", "SafeWallet.json")
-        with open(abi_path, "r") as f:
-            contract_abi = json.load(f)
-            
-        return self.web3.eth.contract(
-            address=address,
-            abi=contract_abi
-        )
+        return get_abi_registry().contract(self.web3, "SafeWallet", address)
     
     def _get_cobo_address_from_receipt(self, receipt) -> str:
         """Get Cobo address from transaction receipt"""
         
-        ARGUS_INITIALIZED_TOPIC = "d98315a38819f85a0914498fdc92737e16297453017a69ca222331e83644e739"
+        ARGUS_INITIALIZED_TOPIC = get_abi_registry().get("ArgusAccountHelper").topic("ArgusInitialized").hex()
         
         for log in receipt['logs']:
             topic0 = log['topics'][0].hex()
@@ -147,14 +165,5 @@ class CoboArgusFactory:
     
     def _get_safe_address_from_cobo(self, cobo_address: str) -> str:
         """Get Safe address from Cobo contract"""
-        cobo_contract = self.web3.eth.contract(
-            address=cobo_address,
-            abi=self._get_safe_contract_abi("CoboSafeAccount")
-        )
+        cobo_contract = get_abi_registry().contract(self.web3, "CoboSafeAccount", cobo_address)
         return cobo_contract.functions.safe().call()
-    
-    def _get_safe_contract_abi(self, name: str) -> dict:
-        """Get contract ABI from Safe contract"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", f"{name}.json")
-        with open(abi_path, "r") as f:
-            return json.load(f) 
\ No newline at end of file
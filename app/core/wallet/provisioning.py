@@ -0,0 +1,306 @@
+from typing import Dict, List, Sequence, Tuple
+from web3 import Web3
+from config.settings import Settings
+from config.initial_address_setup import INITIAL_CONTRACTS, INITIAL_SPENDERS, INITIAL_SILOS
+from app.core.wallet.safe_factory import SafeWalletFactory
+from app.core.wallet.cobo_factory import CoboArgusFactory, COBO_SAFE_ACCOUNT_NAME
+from app.core.wallet.authorizer_manager import AuthorizerManager, PROXY_CREATED_TOPIC
+from app.core.rpc_batch import RpcBatch
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
+from app.core.multisend import MultiSendOp, OPERATION_CALL, OPERATION_DELEGATECALL
+from app.core.tx_tracker import wait_for_receipt
+from app.core.wallet.step_graph import Step
+
+# (authorizer type, role name) created for every wallet, in creation order
+AUTHORIZERS: Tuple[Tuple[str, str], ...] = (
+    ("ApproveAuthorizerV2", "approve"),
+    ("SiloAuthorizer", "silo"),
+    ("CrowdfindingAuthorizer", "crowdfinding"),
+)
+
+SENTINEL_OWNER = "0x0000000000000000000000000000000000000001"
+
+
+class ProvisioningPlanner:
+    """Provisions a Safe, its Cobo Argus account and authorizers in three transactions
+
+    The step-by-step flow (SafeWalletFactory, CoboArgusFactory,
+    AuthorizerManager.create_authorizer, transfer_ownership) sends ~16
+    transactions and waits for each receipt. Here every Safe-executed step is
+    grouped into MultiSend delegatecalls:
+
+        1. create_safe      createProxyWithNonce (deployer)
+        2. deploy_argus     MultiSend[initArgus, createAuthorizer x3]
+        3. configure        MultiSend[addRoles, addAuthorizer x3, grantRoles,
+                            list manager / admin setup, swapOwner]
+
+    The Cobo address is predicted with CREATE2 so the authorizers can be
+    created in the same transaction as the Cobo account, and checked against
+    the ArgusInitialized event afterwards. Authorizer list and pool setup is
+    done by the Safe itself (it becomes list manager / admin for the duration
+    of the batch) instead of separate deployer transactions.
+
+    Example:
+        planner = ProvisioningPlanner(web3, settings)
+        safe_address = planner.create_safe()
+        argus = planner.deploy_argus(safe_address, user_address)
+        planner.configure(safe_address, argus['cobo_address'], argus['authorizers'], user_address, agent_address)
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.settings = settings
+        self.safe_factory = SafeWalletFactory(web3, settings)
+        self.cobo_factory = CoboArgusFactory(web3, settings)
+        self.authorizer_manager = AuthorizerManager(web3, settings)
+
+    def provision(self, user_address: str, agent_address: str) -> Dict[str, str]:
+        """Run all three transactions for a user whose agent is already known
+
+        Returns:
+            Dict[str, str]: safe_address, cobo_address and <role>_authorizer_address
+        """
+        safe_address = self.create_safe()
+        argus = self.deploy_argus(safe_address, user_address)
+        self.configure(safe_address, argus['cobo_address'], argus['authorizers'], user_address, agent_address)
+        return self.result(safe_address, argus)
+
+    @staticmethod
+    def result(safe_address: str, argus: Dict) -> Dict[str, str]:
+        """Flatten deploy_argus output into the /api/wallet/create response fields"""
+        result = {'safe_address': safe_address, 'cobo_address': argus['cobo_address']}
+        for (authorizer_type, role_name), address in zip(AUTHORIZERS, argus['authorizers']):
+            result[f"{role_name}_authorizer_address"] = address
+        return result
+
+    def create_safe(self) -> str:
+        """Transaction 1: deploy the Safe with the deployer as its only owner"""
+        return self.safe_factory.create_safe_from_deployer()
+
+    def plan_argus_ops(self, safe_address: str, user_address: str) -> Tuple[str, List[MultiSendOp]]:
+        """Operations of transaction 2 and the predicted Cobo address
+
+        Implementation names, the block number used in authorizer tags and
+        the Cobo CREATE2 address are read in one RPC batch.
+
+        Returns:
+            tuple: (predicted Cobo address, MultiSend operations)
+        """
+        registry = get_abi_registry()
+        salt = self.cobo_factory.cobo_salt(user_address)
+        factory = registry.contract(self.web3, "CoboFactory", self.settings.COBO_FACTORY_ADDRESS)
+
+        with RpcBatch(self.web3, "ProvisioningPlanner.plan_argus_ops") as batch:
+            cobo_call = batch.call(factory, "getCreate2Address", [safe_address, COBO_SAFE_ACCOUNT_NAME, salt])
+            name_calls = [
+                batch.call(
+                    registry.contract(self.web3, "ApproveAuthorizerV2", self._implementation(authorizer_type)),
+                    "NAME"
+                )
+                for authorizer_type, role_name in AUTHORIZERS
+            ]
+            block_number = batch.block_number()
+        cobo_address = self.web3.to_checksum_address(cobo_call.result)
+        block_bytes = block_number.result.to_bytes(4, 'big')
+
+        helper = self.settings.ARGUS_HELPER_ADDRESS
+        ops = [MultiSendOp(
+            helper,
+            encode_call("ArgusAccountHelper", "initArgus", self.settings.COBO_FACTORY_ADDRESS, salt),
+            operation=OPERATION_DELEGATECALL
+        )]
+        for name_call in name_calls:
+            authorizer_name = name_call.result
+            ops.append(MultiSendOp(
+                helper,
+                encode_call(
+                    "ArgusAccountHelper",
+                    "createAuthorizer",
+                    self.settings.COBO_FACTORY_ADDRESS, cobo_address, authorizer_name, authorizer_name[:28] + block_bytes
+                ),
+                operation=OPERATION_DELEGATECALL
+            ))
+        return cobo_address, ops
+
+    def deploy_argus(self, safe_address: str, user_address: str) -> Dict:
+        """Transaction 2: Cobo account and all authorizer proxies
+
+        Returns:
+            Dict: cobo_address and authorizers (addresses in AUTHORIZERS order)
+        """
+        tx_hash = self.submit_deploy_argus(safe_address, user_address)
+        return self.argus_from_receipt(safe_address, user_address, wait_for_receipt(self.web3, tx_hash))
+
+    def submit_deploy_argus(self, safe_address: str, user_address: str) -> str:
+        """Send transaction 2 without waiting for it
+
+        Returns:
+            str: Transaction hash
+        """
+        predicted_cobo, ops = self.plan_argus_ops(safe_address, user_address)
+        return self.authorizer_manager._submit_multisend_tx(safe_address, ops)
+
+    def argus_from_receipt(self, safe_address: str, user_address: str, receipt: Dict) -> Dict:
+        """Cobo and authorizer addresses from the receipt of transaction 2
+
+        Returns:
+            Dict: cobo_address and authorizers (addresses in AUTHORIZERS order)
+        """
+        predicted_cobo = self.web3.to_checksum_address(
+            get_abi_registry().contract(
+                self.web3, "CoboFactory", self.settings.COBO_FACTORY_ADDRESS
+            ).functions.getCreate2Address(
+                safe_address, COBO_SAFE_ACCOUNT_NAME, self.cobo_factory.cobo_salt(user_address)
+            ).call()
+        )
+        cobo_address = self.cobo_factory._get_cobo_address_from_receipt(receipt)
+        if cobo_address.lower() != predicted_cobo.lower():
+            raise Exception(f"Cobo deployed at {cobo_address}, expected {predicted_cobo}")
+
+        # initArgus deploys its own proxies before emitting ArgusInitialized;
+        # every ProxyCreated after it belongs to a createAuthorizer op, in order
+        argus_topic = get_abi_registry().get("ArgusAccountHelper").topic("ArgusInitialized").hex().lower()
+        authorizers = []
+        argus_seen = False
+        for log in receipt['logs']:
+            topic0 = log['topics'][0].hex().lower()
+            if topic0 == argus_topic:
+                argus_seen = True
+            elif argus_seen and topic0 == PROXY_CREATED_TOPIC:
+                authorizers.append(self.web3.to_checksum_address("0x" + log['data'].hex()[-40:]))
+        if len(authorizers) != len(AUTHORIZERS):
+            raise Exception(f"Expected {len(AUTHORIZERS)} authorizer proxies in receipt, found {len(authorizers)}")
+
+        print(f"[ProvisioningPlanner] Cobo {cobo_address}, authorizers {authorizers}")
+        return {'cobo_address': cobo_address, 'authorizers': authorizers}
+
+    def plan_configure_ops(
+        self,
+        safe_address: str,
+        cobo_address: str,
+        authorizers: List[str],
+        user_address: str,
+        agent_address: str
+    ) -> List[MultiSendOp]:
+        """Operations of transaction 3
+
+        Roles are added and granted for all authorizers at once. Safe
+        ownership moves to the user last, while the batch still runs with the
+        deployer's signature.
+        """
+        role_manager = get_abi_registry().contract(
+            self.web3, "CoboSafeAccount", cobo_address
+        ).functions.roleManager().call()
+        helper = self.settings.ARGUS_HELPER_ADDRESS
+        role_names = [self.web3.to_bytes(text=role_name).ljust(32, b'\0') for _, role_name in AUTHORIZERS]
+
+        ops = [MultiSendOp(role_manager, encode_call("RoleManager", "addRoles", role_names), operation=OPERATION_CALL)]
+        for (authorizer_type, _), role_bytes, authorizer_address in zip(AUTHORIZERS, role_names, authorizers):
+            ops.append(MultiSendOp(
+                helper,
+                encode_call("ArgusAccountHelper", "addAuthorizer", cobo_address, authorizer_address, False, [role_bytes]),
+                operation=OPERATION_DELEGATECALL
+            ))
+        ops.append(MultiSendOp(
+            helper,
+            encode_call("ArgusAccountHelper", "grantRoles", cobo_address, role_names, [agent_address]),
+            operation=OPERATION_DELEGATECALL
+        ))
+
+        for (authorizer_type, _), authorizer_address in zip(AUTHORIZERS, authorizers):
+            if authorizer_type == "ApproveAuthorizerV2":
+                calls = [
+                    ("setApproveListManager", [safe_address]),
+                    ("addContracts", [INITIAL_CONTRACTS]),
+                    ("addSpenders", [INITIAL_SPENDERS]),
+                    ("setApproveListManager", [user_address]),
+                ]
+            elif authorizer_type == "SiloAuthorizer":
+                calls = [
+                    ("setAdmin", [safe_address]),
+                    ("addPoolAddresses", [INITIAL_SILOS]),
+                    ("setAdmin", [user_address]),
+                ]
+            else:
+                continue
+            for fn_name, args in calls:
+                ops.append(MultiSendOp(
+                    authorizer_address,
+                    encode_call(authorizer_type, fn_name, *args),
+                    operation=OPERATION_CALL
+                ))
+
+        ops.append(MultiSendOp(
+            safe_address,
+            encode_call("SafeWallet", "swapOwner", SENTINEL_OWNER, self.settings.DEPLOYER_ADDRESS, user_address),
+            operation=OPERATION_CALL
+        ))
+        return ops
+
+    def configure(
+        self,
+        safe_address: str,
+        cobo_address: str,
+        authorizers: List[str],
+        user_address: str,
+        agent_address: str
+    ) -> dict:
+        """Transaction 3: roles, authorizer lists and admins, Safe ownership
+
+        Returns:
+            dict: Transaction receipt
+        """
+        tx_hash = self.submit_configure(safe_address, cobo_address, authorizers, user_address, agent_address)
+        return wait_for_receipt(self.web3, tx_hash)
+
+    def submit_configure(
+        self,
+        safe_address: str,
+        cobo_address: str,
+        authorizers: List[str],
+        user_address: str,
+        agent_address: str
+    ) -> str:
+        """Send transaction 3 without waiting for it
+
+        Returns:
+            str: Transaction hash
+        """
+        ops = self.plan_configure_ops(safe_address, cobo_address, authorizers, user_address, agent_address)
+        return self.authorizer_manager._submit_multisend_tx(safe_address, ops)
+
+    def argus_steps(self, requires: Sequence[str] = ("create_safe",)) -> List[Step]:
+        """Steps for transactions 2 and 3 (transaction 1 is SafeWalletFactory.create_safe_steps)
+
+        deploy_argus outputs the result() fields; configure reads them back
+        along with user_address and agent_address.
+        """
+        return [
+            Step(
+                "deploy_argus",
+                requires=requires,
+                submit=lambda ctx: self.submit_deploy_argus(ctx['safe_address'], ctx['user_address']),
+                confirm=lambda ctx, receipt: self.result(
+                    ctx['safe_address'],
+                    self.argus_from_receipt(ctx['safe_address'], ctx['user_address'], receipt)
+                )
+            ),
+            Step(
+                "configure",
+                requires=("deploy_argus",),
+                submit=lambda ctx: self.submit_configure(
+                    ctx['safe_address'],
+                    ctx['cobo_address'],
+                    [ctx[f"{role_name}_authorizer_address"] for _, role_name in AUTHORIZERS],
+                    ctx['user_address'],
+                    ctx['agent_address']
+                )
+            ),
+        ]
+
+    def _implementation(self, authorizer_type: str) -> str:
+        impl_address = self.authorizer_manager.authorizer_implementations.get(authorizer_type)
+        if not impl_address:
+            raise ValueError(f"Unknown authorizer type: {authorizer_type}")
+        return impl_address
@@ -1,10 +1,14 @@
 from web3 import Web3
-from typing import Dict, Any
-import json
-import os
+from typing import List, Sequence
 from config.settings import Settings
-from pathlib import Path
 from app.core.wallet.safe_wallet import SafeWallet
+from app.core.nonce_manager import get_nonce_manager
+from app.core.fee_oracle import get_fee_oracle
+from app.core.gas_estimator import get_gas_estimator, call_shape
+from app.core.tx_tracker import wait_for_receipt
+from app.core.wallet.step_graph import Step
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
 
 class SafeWalletFactory:
     """Factory for creating Safe wallets"""
@@ -13,40 +17,49 @@ class SafeWalletFactory:
         self.web3 = web3
         self.settings = settings
         self.factory_address = settings.SAFE_FACTORY_ADDRESS
-        self.factory_contract = self._init_factory_contract()
-    
-    def _init_factory_contract(self):
-        """Initialize Safe factory contract"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", "SafeProxyFactory.json")
-        with open(abi_path, "r") as f:
-            factory_abi = json.load(f)
-        
-        return self.web3.eth.contract(
-            address=self.factory_address,
-            abi=factory_abi
-        )
+        self.factory_contract = get_abi_registry().contract(web3, "SafeProxyFactory", self.factory_address)
     
     def create_safe_from_deployer(self) -> str:
         """Create new Safe wallet from deployer account"""
+        tx_hash = self.submit_create_safe()
+        receipt = wait_for_receipt(self.web3, tx_hash)
+        
+        return self._get_safe_address_from_receipt(receipt)
+
+    def submit_create_safe(self) -> str:
+        """Send createProxyWithNonce from the deployer without waiting for it
+        
+        Returns:
+            str: Transaction hash
+        """
         setup_data = self._prepare_safe_setup(self.settings.DEPLOYER_ADDRESS)
+        fee_fields = get_fee_oracle(self.web3).fee_fields()
         salt_nonce = self.web3.eth.block_number
         
-        tx = self.factory_contract.functions.createProxyWithNonce(
-            self.settings.SAFE_SINGLETON_ADDRESS,
-            setup_data,
-            salt_nonce
-        ).build_transaction({
+        create_args = [self.settings.SAFE_SINGLETON_ADDRESS, setup_data, salt_nonce]
+        create_data = encode_call("SafeProxyFactory", "createProxyWithNonce", *create_args)
+        shape = call_shape(self.factory_address, create_data)
+        gas = get_gas_estimator(self.web3).gas_limit({
             'from': self.settings.DEPLOYER_ADDRESS,
-            'gas': 2000000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            'to': self.factory_address,
+            'data': create_data
+        }, shape, default=2000000)
+        
+        with get_nonce_manager(self.web3).reserve(self.settings.DEPLOYER_ADDRESS) as deployer_nonce:
+            tx = self.factory_contract.functions.createProxyWithNonce(
+                *create_args
+            ).build_transaction({
+                'from': self.settings.DEPLOYER_ADDRESS,
+                'gas': gas,
+                'nonce': deployer_nonce,
+                **fee_fields
+            })
+            
+            signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        get_gas_estimator(self.web3).observe(tx_hash, shape, gas)
         
-        return self._get_safe_address_from_receipt(receipt)
+        return tx_hash.hex()
 
     def transfer_ownership(self, safe_address: str, new_owner: str) -> str:
         """Transfer Safe ownership to new owner
@@ -55,6 +68,17 @@ class SafeWalletFactory:
             safe_address: Address of Safe wallet
             new_owner: New owner address
             
+        Returns:
+            str: Transaction hash
+        """
+        tx_hash = self.submit_transfer_ownership(safe_address, new_owner)
+        receipt = wait_for_receipt(self.web3, tx_hash)
+        
+        return receipt['transactionHash'].hex()
+
+    def submit_transfer_ownership(self, safe_address: str, new_owner: str) -> str:
+        """Send the swapOwner Safe transaction without waiting for it
+        
         Returns:
             str: Transaction hash
         """
@@ -63,22 +87,35 @@ class SafeWalletFactory:
         old_owner = self.settings.DEPLOYER_ADDRESS
         
        
-        data = safe.contract.encode_abi(
+        data = encode_call(
+            "SafeWallet",
             "swapOwner",
-            args=[
-                "0x0000000000000000000000000000000000000001",  # prevOwner (sentinel)
-                old_owner,                                      # oldOwner (deployer)
-                new_owner                                       # newOwner
-            ]
+            "0x0000000000000000000000000000000000000001",  # prevOwner (sentinel)
+            old_owner,                                      # oldOwner (deployer)
+            new_owner                                       # newOwner
         )
         
-        tx_hash = safe.execute_transaction(
+        return safe.submit_transaction(
             to=safe_address,     
-            data=bytes.fromhex(data[2:]) if data.startswith('0x') else bytes.fromhex(data),
+            data=data,
             operation=0          # Call
         )
-        
-        return tx_hash
+
+    def create_safe_steps(self) -> List[Step]:
+        """Steps deploying the Safe; outputs safe_address"""
+        return [Step(
+            "create_safe",
+            submit=lambda ctx: self.submit_create_safe(),
+            confirm=lambda ctx, receipt: {'safe_address': self._get_safe_address_from_receipt(receipt)}
+        )]
+
+    def transfer_ownership_steps(self, requires: Sequence[str] = ("create_safe",)) -> List[Step]:
+        """Steps handing the Safe from the deployer to ctx['user_address']"""
+        return [Step(
+            "transfer_ownership",
+            requires=requires,
+            submit=lambda ctx: self.submit_transfer_ownership(ctx['safe_address'], ctx['user_address'])
+        )]
 
     def _prepare_safe_setup(self, owner_address: str) -> bytes:
         """Prepare data for Safe setup
@@ -90,10 +127,6 @@ class SafeWalletFactory:
             bytes: Encoded setup data for Safe creation
         """
         
-        singleton_address = self._get_singleton_address()
-        safe_contract = self._get_safe_contract(singleton_address)
-        
-        
         owners = [owner_address]  # List of initial owners
         threshold = 1  # Number of required confirmations
         to = "0x0000000000000000000000000000000000000000"  # Optional delegate call after setup
@@ -104,18 +137,17 @@ class SafeWalletFactory:
         payment_receiver = "0x0000000000000000000000000000000000000000"  # Payment receiver
         
         
-        setup_data = safe_contract.encode_abi(
+        setup_data = encode_call(
+            "SafeWallet",
             "setup",
-            args=[
-                owners,              # _owners
-                threshold,          # _threshold
-                to,                # to
-                data,              # data
-                fallback_handler,  # fallbackHandler
-                payment_token,     # paymentToken
-                payment,          # payment
-                payment_receiver  # paymentReceiver
-            ]
+            owners,            # _owners
+            threshold,         # _threshold
+            to,                # to
+            data,              # data
+            fallback_handler,  # fallbackHandler
+            payment_token,     # paymentToken
+            payment,           # payment
+            payment_receiver   # paymentReceiver
         )
         
         return setup_data
@@ -128,17 +160,6 @@ class SafeWalletFactory:
         """
         return self.settings.SAFE_SINGLETON_ADDRESS
 
-    def _get_safe_contract(self, address: str):
-        """Get Safe contract instance"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", "SafeWallet.json")
-        with open(abi_path, "r") as f:
-            contract_abi = json.load(f)
-        
-        return self.web3.eth.contract(
-            address=address,
-            abi=contract_abi
-        )
-
     def _get_safe_address_from_receipt(self, receipt) -> str:
         """Extract Safe address from transaction receipt
         
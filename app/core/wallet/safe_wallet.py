@@ -1,10 +1,13 @@
 from typing import Dict, Any
 from app.core.wallet.base import BaseWallet
 from web3 import Web3
-import os
-import json
 from eth_account import Account
-from pathlib import Path
+from app.core.nonce_manager import get_nonce_manager
+from app.core.fee_oracle import get_fee_oracle
+from app.core.gas_estimator import get_gas_estimator, call_shape
+from app.core.tx_tracker import wait_for_receipt
+from app.core.abi_registry import get_abi_registry
+from app.core.abi_encoder import encode_call
 
 class SafeWallet(BaseWallet):
     """Implementation of Safe wallet"""
@@ -13,7 +16,7 @@ class SafeWallet(BaseWallet):
         super().__init__(safe_address)
         self.web3 = web3
         self.settings = settings
-        self.contract = self._get_contract(safe_address, "SafeWallet")
+        self.contract = get_abi_registry().contract(web3, "SafeWallet", safe_address)
     
     def execute_transaction(
         self,
@@ -31,6 +34,24 @@ class SafeWallet(BaseWallet):
         Returns:
             str: Transaction hash
         """
+        tx_hash = self.submit_transaction(to, data, operation)
+        receipt = wait_for_receipt(self.web3, tx_hash)
+        
+        return receipt['transactionHash'].hex()
+
+    def submit_transaction(
+        self,
+        to: str,
+        data: bytes,
+        operation: int = 0,  # 0=Call, 1=DelegateCall
+    ) -> str:
+        """Sign and send a Safe execTransaction without waiting for the receipt
+        
+        Returns:
+            str: Transaction hash
+        """
+        safe_nonce = self.contract.functions.nonce().call()
+        fee_fields = get_fee_oracle(self.web3).fee_fields()
         
         tx_hash = self.contract.functions.getTransactionHash(
             to,                 # to
@@ -42,14 +63,14 @@ class SafeWallet(BaseWallet):
             0,               # gasPrice
             "0x0000000000000000000000000000000000000000",  # gasToken
             "0x0000000000000000000000000000000000000000",  # refundReceiver
-            self.contract.functions.nonce().call()          # nonce
+            safe_nonce                                      # nonce
         ).call()
         
         
         signed = Account._sign_hash(tx_hash, self.settings.DEPLOYER_PRIVATE_KEY)
         
         
-        tx = self.contract.functions.execTransaction(
+        exec_fn = self.contract.functions.execTransaction(
             to,              # to
             0,              # value
             data,          # data
@@ -60,28 +81,39 @@ class SafeWallet(BaseWallet):
             "0x0000000000000000000000000000000000000000",  # gasToken
             "0x0000000000000000000000000000000000000000",  # refundReceiver
             signed.signature                                # signature
-        ).build_transaction({
-            'from': self.settings.DEPLOYER_ADDRESS,
-            'gas': 600000,
-            'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-            'gasPrice': self.web3.eth.gas_price,
-            'chainId': self.settings.CHAIN_ID
-        })
+        )
+        gas, shape = self._estimate_exec_gas(exec_fn, to, data, default=600000)
         
+        with get_nonce_manager(self.web3).reserve(self.settings.DEPLOYER_ADDRESS) as deployer_nonce:
+            tx = exec_fn.build_transaction({
+                'from': self.settings.DEPLOYER_ADDRESS,
+                'gas': gas,
+                'nonce': deployer_nonce,
+                'chainId': self.settings.CHAIN_ID,
+                **fee_fields
+            })
         
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
         
-        return receipt['transactionHash'].hex()
+            signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        get_gas_estimator(self.web3).observe(tx_hash, shape, gas)
+        
+        return tx_hash.hex()
+
+    def _estimate_exec_gas(self, exec_fn, to: str, data, default: int) -> tuple:
+        """Gas limit for a Safe execTransaction, cached per inner call shape
+        
+        Returns:
+            tuple: (gas limit, shape) - pass both to GasEstimator.observe after sending
+        """
+        shape = call_shape(to, data)
+        gas = get_gas_estimator(self.web3).gas_limit({
+            'from': self.settings.DEPLOYER_ADDRESS,
+            'to': self.address,
+            'data': encode_call("SafeWallet", "execTransaction", *exec_fn.args)
+        }, shape, default)
+        return gas, shape
 
-    def _get_contract(self, address: str, name: str):
-        """Get contract instance"""
-        abi_path = os.path.join(Path(__file__).parent.parent.parent, "abi", f"{name}.json")
-        with open(abi_path, "r") as f:
-            contract_abi = json.load(f)
-        return self.web3.eth.contract(address=address, abi=contract_abi)
-    
     async def get_balance(self) -> float:
         
         balance = await self.web3.eth.get_balance(self.address)
@@ -101,6 +133,9 @@ class SafeWallet(BaseWallet):
             str: Transaction hash
         """
         try:
+            safe_nonce = self.contract.functions.nonce().call()
+            fee_fields = get_fee_oracle(self.web3).fee_fields()
+            
             tx_hash = self.contract.functions.getTransactionHash(
                 tx_data['to'],                 # to
                 tx_data.get('value', 0),       # value
@@ -111,12 +146,12 @@ class SafeWallet(BaseWallet):
                 0,                             # gasPrice
                 "0x0000000000000000000000000000000000000000",  # gasToken
                 "0x0000000000000000000000000000000000000000",  # refundReceiver
-                self.contract.functions.nonce().call()          # nonce
+                safe_nonce                                      # nonce
             ).call()
             
             signed = Account._sign_hash(tx_hash, self.settings.DEPLOYER_PRIVATE_KEY)
             
-            tx = self.contract.functions.execTransaction(
+            exec_fn = self.contract.functions.execTransaction(
                 tx_data['to'],              # to
                 tx_data.get('value', 0),    # value
                 tx_data['data'],           # data
@@ -127,17 +162,22 @@ class SafeWallet(BaseWallet):
                 "0x0000000000000000000000000000000000000000",  # gasToken
                 "0x0000000000000000000000000000000000000000",  # refundReceiver
                 signed.signature                                # signature
-            ).build_transaction({
-                'from': self.settings.DEPLOYER_ADDRESS,
-                'gas': 600000,
-                'nonce': self.web3.eth.get_transaction_count(self.settings.DEPLOYER_ADDRESS),
-                'gasPrice': self.web3.eth.gas_price,
-                'chainId': self.settings.CHAIN_ID
-            })
+            )
+            gas, shape = self._estimate_exec_gas(exec_fn, tx_data['to'], tx_data['data'], default=600000)
             
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            with get_nonce_manager(self.web3).reserve(self.settings.DEPLOYER_ADDRESS) as deployer_nonce:
+                tx = exec_fn.build_transaction({
+                    'from': self.settings.DEPLOYER_ADDRESS,
+                    'gas': gas,
+                    'nonce': deployer_nonce,
+                    'chainId': self.settings.CHAIN_ID,
+                    **fee_fields
+                })
+            
+                signed_tx = self.web3.eth.account.sign_transaction(tx, self.settings.DEPLOYER_PRIVATE_KEY)
+                tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            get_gas_estimator(self.web3).observe(tx_hash, shape, gas)
+            receipt = wait_for_receipt(self.web3, tx_hash)
             
             return receipt['transactionHash'].hex()
             
@@ -0,0 +1,178 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from web3 import Web3
+from app.core.tx_tracker import get_receipt_tracker, wait_for_receipt, normalize_tx_hash, STATUS_DROPPED
+
+STEP_PENDING = "pending"
+STEP_RUNNING = "running"
+STEP_SUBMITTED = "submitted"
+STEP_DONE = "done"
+STEP_FAILED = "failed"
+
+Context = Dict[str, Any]
+Checkpoint = Dict[str, Any]
+
+
+class StepFailed(Exception):
+    """A step's transaction was mined but reverted"""
+
+
+class Step:
+    """One node of a provisioning step graph
+
+    Off-chain steps set run(ctx) -> outputs. Transaction steps set
+    submit(ctx) -> tx_hash and optionally confirm(ctx, receipt) -> outputs;
+    the runner checkpoints the hash between the two, so a restarted run
+    waits for the transaction already sent instead of sending another.
+    Outputs are merged into the context for the steps that follow.
+
+    group names the coarser step a node belongs to: a checkpoint recorded
+    as done under the group name counts for every node in it.
+    """
+
+    __slots__ = ('name', 'requires', 'run', 'submit', 'confirm', 'group')
+
+    def __init__(
+        self,
+        name: str,
+        requires: Sequence[str] = (),
+        run: Optional[Callable[[Context], Optional[Dict[str, Any]]]] = None,
+        submit: Optional[Callable[[Context], str]] = None,
+        confirm: Optional[Callable[[Context, Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+        group: Optional[str] = None
+    ):
+        if (run is None) == (submit is None):
+            raise ValueError(f"Step {name} needs exactly one of run or submit")
+        self.name = name
+        self.requires = tuple(requires)
+        self.run = run
+        self.submit = submit
+        self.confirm = confirm
+        self.group = group
+
+    def __repr__(self) -> str:
+        return f"Step({self.name}, requires={list(self.requires)})"
+
+
+class StepGraph:
+    """Ordered, dependency-checked list of steps with checkpointed execution
+
+    Steps run in the order given, which must list every step after the
+    steps it requires. run() skips steps whose checkpoint is done (reusing
+    their recorded outputs) and reports every state change to save, so the
+    caller can persist checkpoints wherever it likes.
+
+    Example:
+        graph = StepGraph(factory.create_safe_steps() + cobo_factory.create_cobo_steps())
+        ctx = graph.run(web3, {'user_address': user}, checkpoints, save)
+    """
+
+    def __init__(self, steps: Iterable[Step]):
+        self.steps: List[Step] = list(steps)
+        seen = set()
+        for step in self.steps:
+            if step.name in seen:
+                raise ValueError(f"Duplicate step {step.name}")
+            missing = [name for name in step.requires if name not in seen]
+            if missing:
+                raise ValueError(f"Step {step.name} requires {missing}, which do not come before it")
+            seen.add(step.name)
+
+    @property
+    def names(self) -> List[str]:
+        return [step.name for step in self.steps]
+
+    def run(
+        self,
+        web3: Web3,
+        ctx: Context,
+        checkpoints: Optional[Dict[str, Checkpoint]] = None,
+        save: Optional[Callable[[str, Checkpoint], None]] = None,
+        timeout: Optional[float] = 120
+    ) -> Context:
+        """Run every step that is not done yet
+
+        Args:
+            web3: Web3 instance used to wait for receipts
+            ctx: Initial context, updated in place with step outputs
+            checkpoints: Step name -> checkpoint (status, tx_hash, output, attempts) from a previous run
+            save: Called with (step name, checkpoint) on every state change
+            timeout: Seconds to wait for each transaction receipt
+
+        Returns:
+            Context: ctx with the outputs of all steps
+
+        Raises:
+            StepFailed: A step's transaction reverted
+            TimeExhausted: A receipt did not arrive in time (the step stays submitted)
+        """
+        checkpoints = checkpoints or {}
+        save = save or (lambda name, checkpoint: None)
+        done = set()
+
+        for step in self.steps:
+            checkpoint = dict(checkpoints.get(step.name) or {'status': STEP_PENDING, 'attempts': 0})
+            group_checkpoint = checkpoints.get(step.group) if step.group else None
+            if checkpoint['status'] == STEP_DONE or (group_checkpoint and group_checkpoint['status'] == STEP_DONE):
+                ctx.update(checkpoint.get('output') or {})
+                done.add(step.name)
+                continue
+            for name in step.requires:
+                if name not in done:
+                    raise RuntimeError(f"Step {step.name} requires {name}, which is not done")
+
+            try:
+                if step.run is not None:
+                    checkpoint.update(status=STEP_RUNNING, attempts=checkpoint.get('attempts', 0) + 1, error=None)
+                    save(step.name, checkpoint)
+                    output = step.run(ctx) or {}
+                else:
+                    output = self._run_transaction(web3, step, ctx, checkpoint, save, timeout)
+            except Exception as e:
+                # a transaction whose fate is unknown stays submitted, the
+                # next run waits for it again instead of sending a duplicate
+                if checkpoint['status'] != STEP_SUBMITTED or isinstance(e, StepFailed):
+                    checkpoint['status'] = STEP_FAILED
+                checkpoint['error'] = str(e)
+                save(step.name, checkpoint)
+                raise
+
+            ctx.update(output)
+            checkpoint.update(status=STEP_DONE, output=output, error=None)
+            save(step.name, checkpoint)
+            done.add(step.name)
+
+        return ctx
+
+    def _run_transaction(
+        self,
+        web3: Web3,
+        step: Step,
+        ctx: Context,
+        checkpoint: Checkpoint,
+        save: Callable[[str, Checkpoint], None],
+        timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        tx_hash = checkpoint.get('tx_hash') if checkpoint['status'] == STEP_SUBMITTED else None
+        if tx_hash:
+            # count the pending time from the original send, so a resumed
+            # run sees a dropped transaction as dropped within this wait
+            tracker = get_receipt_tracker(web3)
+            tracker.track(tx_hash, submitted_at=checkpoint.get('submitted_at'))
+            result = tracker.wait(tx_hash, timeout=timeout)
+            if result is not None and result['status'] == STATUS_DROPPED:
+                # the tracker has already resynced the sender's nonce
+                print(f"[StepGraph] {step.name}: {tx_hash} was dropped, sending again")
+                tx_hash = None
+
+        if not tx_hash:
+            checkpoint.update(status=STEP_RUNNING, attempts=checkpoint.get('attempts', 0) + 1, error=None)
+            save(step.name, checkpoint)
+            tx_hash = normalize_tx_hash(step.submit(ctx))
+            checkpoint.update(status=STEP_SUBMITTED, tx_hash=tx_hash, submitted_at=time.time())
+            save(step.name, checkpoint)
+
+        receipt = wait_for_receipt(web3, tx_hash, timeout=timeout)
+        if receipt['status'] != 1:
+            raise StepFailed(f"{step.name}: transaction {tx_hash} reverted")
+        return (step.confirm(ctx, receipt) if step.confirm else None) or {}
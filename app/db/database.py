@@ -1,55 +1,73 @@
 import sqlite3
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+from functools import lru_cache
 from pathlib import Path
 from eth_account import Account
 from bip_utils import Bip39SeedGenerator, Bip44, Bip44Changes, Bip44Coins
 from datetime import datetime
+from app.db.pool import ConnectionPool
+from app.db.cache import LRUCache
+from app.db.migrations import migrate, WALLETS_MIGRATIONS, THREADS_MIGRATIONS
 
 DB_PATH = Path(__file__).parent.parent / 'data' / 'wallets.db'
 DB_PATH_THREADS = Path(__file__).parent.parent / 'data' / 'threads.db'
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+WALLET_CACHE_SIZE = int(os.getenv('WALLET_CACHE_SIZE', '1024'))
+
+# Wallet rows keyed by user address, shared by every protocol built in this process
+_wallet_cache = LRUCache(maxsize=WALLET_CACHE_SIZE)
 
 def init_db():
-    """Initialize database and create tables"""
+    """Initialize database and apply schema migrations"""
     
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
     conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS wallets (
-            user_address TEXT PRIMARY KEY,
-            safe_address TEXT NOT NULL,
-            cobo_address TEXT,
-            agent_address TEXT,
-            agent_key TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    
-    conn.commit()
-    conn.close()
+    try:
+        migrate(conn, WALLETS_MIGRATIONS)
+    finally:
+        conn.close()
 
 def get_db_connection():
-    """Get database connection with row factory"""
-    if not DB_PATH.exists():
-        init_db()
-    
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get pooled database connection with row factory
+
+    Hand the connection back with release_db_connection() when done.
+    """
+    return _wallets_pool.acquire()
 
 def get_db_connection_threads():
-    """Get database connection with row factory"""
-    if not DB_PATH_THREADS.exists():
-        init_db_threads()
-    
-    conn = sqlite3.connect(str(DB_PATH_THREADS))
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get pooled threads database connection with row factory
+
+    Hand the connection back with release_db_connection_threads() when done.
+    """
+    return _threads_pool.acquire()
+
+def release_db_connection(conn: sqlite3.Connection) -> None:
+    """Return a wallets database connection to the pool"""
+    _wallets_pool.release(conn)
+
+def release_db_connection_threads(conn: sqlite3.Connection) -> None:
+    """Return a threads database connection to the pool"""
+    _threads_pool.release(conn)
+
+@lru_cache(maxsize=1)
+def _agent_change_node(mnemonic: str):
+    """Derive the m/44'/60'/0'/0 node for the agent mnemonic
+
+    Seed generation is a 2048-round PBKDF2, so the node is derived once per
+    process and every agent afterwards costs a single child derivation.
+    """
+    seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
+    bip44_def = Bip44.FromSeed(seed_bytes, Bip44Coins.ETHEREUM)
+    return bip44_def.Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT)
+
+def _get_agent_change_node():
+    """Get cached change-level node for AGENT_MNEMONIC"""
+    mnemonic = os.getenv('AGENT_MNEMONIC')
+    if not mnemonic:
+        raise ValueError("AGENT_MNEMONIC not set in environment")
+    return _agent_change_node(mnemonic)
 
 def generate_agent_wallet(index: int) -> tuple[str, str]:
     """Generate agent wallet from mnemonic
@@ -60,27 +78,93 @@ def generate_agent_wallet(index: int) -> tuple[str, str]:
     Returns:
         tuple[str, str]: (address, private_key)
     """
-    mnemonic = os.getenv('AGENT_MNEMONIC')
-    if not mnemonic:
-        raise ValueError("AGENT_MNEMONIC not set in environment")
-        
-    seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
-    bip44_def = Bip44.FromSeed(seed_bytes, Bip44Coins.ETHEREUM)
-    bip44_acc = bip44_def.Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT)
-    bip44_addr = bip44_acc.AddressIndex(index)
+    bip44_addr = _get_agent_change_node().AddressIndex(index)
     
     private_key = bip44_addr.PrivateKey().Raw().ToHex()
     address = Account.from_key(private_key).address
     return address, private_key
 
-def create_wallet_record(user_address: str, safe_address: str) -> None:
-    """Create new wallet record"""
+def generate_agent_wallets(start: int, count: int) -> List[tuple[str, str]]:
+    """Generate a range of agent wallets for pre-provisioning
+    
+    Args:
+        start: First derivation index
+        count: Number of consecutive indices to derive
+        
+    Returns:
+        List[tuple[str, str]]: (address, private_key) for each index in order
+    """
+    change_node = _get_agent_change_node()
+    
+    wallets = []
+    for index in range(start, start + count):
+        private_key = change_node.AddressIndex(index).PrivateKey().Raw().ToHex()
+        wallets.append((Account.from_key(private_key).address, private_key))
+    return wallets
+
+def _reserve_agent_indices(cursor: sqlite3.Cursor, count: int) -> range:
+    """Advance the agent index sequence inside an open write transaction"""
+    if count < 1:
+        raise ValueError("count must be positive")
+    
+    cursor.execute("SELECT next_value FROM agent_index_seq WHERE name = 'agent'")
+    start = cursor.fetchone()[0]
+    cursor.execute(
+        "UPDATE agent_index_seq SET next_value = next_value + ? WHERE name = 'agent'",
+        (count,)
+    )
+    return range(start, start + count)
+
+def reserve_agent_indices(count: int = 1) -> range:
+    """Atomically reserve a block of agent derivation indices
+    
+    BEGIN IMMEDIATE takes the database write lock up front, so concurrent
+    threads and worker processes always receive disjoint blocks.
+    
+    Args:
+        count: Number of consecutive indices to reserve
+        
+    Returns:
+        range: Reserved indices; pass each once to create_wallet_record(..., agent_index=i)
+               (generate_agent_wallets(r.start, len(r)) derives their keys up front)
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        cursor.execute("SELECT COUNT(*) FROM wallets")
-        index = cursor.fetchone()[0]
+        cursor.execute("BEGIN IMMEDIATE")
+        indices = _reserve_agent_indices(cursor, count)
+        conn.commit()
+        return indices
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        release_db_connection(conn)
+
+def create_wallet_record(user_address: str, safe_address: str, agent_index: Optional[int] = None) -> None:
+    """Create new wallet record
+    
+    Args:
+        user_address: Wallet owner
+        safe_address: Deployed Safe
+        agent_index: Agent derivation index from reserve_agent_indices
+                     (default: reserve the next one)
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        if agent_index is None:
+            index = _reserve_agent_indices(cursor, 1).start
+        else:
+            # only indices handed out by the sequence; the unique index on
+            # agent_index rejects one that is already in use
+            cursor.execute("SELECT next_value FROM agent_index_seq WHERE name = 'agent'")
+            if not 0 <= agent_index < cursor.fetchone()[0]:
+                raise ValueError(f"Agent index {agent_index} was not reserved")
+            index = agent_index
         
         agent_address, agent_key = generate_agent_wallet(index)
         
@@ -91,27 +175,44 @@ def create_wallet_record(user_address: str, safe_address: str) -> None:
                 cobo_address,
                 agent_address,
                 agent_key,
+                agent_index,
                 created_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (
             user_address,
             safe_address,
             None,
             agent_address,
             agent_key,
+            index,
             datetime.utcnow()
         ))
         
         conn.commit()
+        _wallet_cache.put(user_address, {
+            'safe_address': safe_address,
+            'cobo_address': None,
+            'agent_address': agent_address,
+            'agent_key': agent_key
+        })
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        if 'agent_index' in str(e):
+            raise ValueError(f"Agent index {index} is already in use") from e
+        raise e
     except Exception as e:
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 def get_wallet(user_address: str) -> Dict[str, Any]:
     """Get wallet data for user"""
     
+    cached = _wallet_cache.get(user_address)
+    if cached is not None:
+        return dict(cached)
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -125,18 +226,20 @@ def get_wallet(user_address: str) -> Dict[str, Any]:
         if not wallet:
             raise ValueError(f"No wallet found for {user_address}")
             
-        return {
+        wallet_data = {
             'safe_address': wallet['safe_address'],
             'cobo_address': wallet['cobo_address'],
             'agent_address': wallet['agent_address'],
             'agent_key': wallet['agent_key']
         }
+        _wallet_cache.put(user_address, wallet_data)
+        return dict(wallet_data)
         
     except Exception as e:
         print(f"[Database] Error getting wallet: {str(e)}")
         raise
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 def update_cobo_address(user_address: str, cobo_address: str) -> None:
     """Update Cobo address"""
@@ -155,33 +258,72 @@ def update_cobo_address(user_address: str, cobo_address: str) -> None:
             raise ValueError(f"No wallet found for {user_address}")
             
         conn.commit()
+        _wallet_cache.invalidate(user_address)
         
     except Exception as e:
         conn.rollback()
         print(f"Error updating Cobo address: {e}")  
         raise e
     finally:
-        conn.close() 
+        release_db_connection(conn) 
 
-def init_db_threads():
-    """Initialize database and create tables"""
+def _get_wallet_by(column: str, address: str) -> Dict[str, Any]:
+    """Get wallet data by an indexed address column (case-insensitive)"""
     
-    os.makedirs(os.path.dirname(DB_PATH_THREADS), exist_ok=True)
-    
-    conn = sqlite3.connect(str(DB_PATH_THREADS))
+    conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS threads (
-            user_address TEXT PRIMARY KEY,
-            thread_id TEXT,
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_threads TEXT
+    try:
+        cursor.execute(
+            f"SELECT * FROM wallets WHERE {column} = ? COLLATE NOCASE",
+            (address,)
         )
-    """)
+        wallet = cursor.fetchone()
+        
+        if not wallet:
+            raise ValueError(f"No wallet found for {column} {address}")
+            
+        wallet_data = {
+            'safe_address': wallet['safe_address'],
+            'cobo_address': wallet['cobo_address'],
+            'agent_address': wallet['agent_address'],
+            'agent_key': wallet['agent_key']
+        }
+        _wallet_cache.put(wallet['user_address'], wallet_data)
+        return {'user_address': wallet['user_address'], **wallet_data}
+        
+    except Exception as e:
+        print(f"[Database] Error getting wallet by {column}: {str(e)}")
+        raise
+    finally:
+        release_db_connection(conn)
+
+def get_wallet_by_safe(safe_address: str) -> Dict[str, Any]:
+    """Get wallet data (including user_address) by Safe address"""
+    return _get_wallet_by('safe_address', safe_address)
+
+def get_wallet_by_cobo(cobo_address: str) -> Dict[str, Any]:
+    """Get wallet data (including user_address) by Cobo account address"""
+    return _get_wallet_by('cobo_address', cobo_address)
+
+def get_wallet_by_agent(agent_address: str) -> Dict[str, Any]:
+    """Get wallet data (including user_address) by agent address"""
+    return _get_wallet_by('agent_address', agent_address)
+
+def get_wallet_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters of the in-process wallet cache"""
+    return _wallet_cache.stats()
+
+def init_db_threads():
+    """Initialize threads database and apply schema migrations"""
+    
+    os.makedirs(os.path.dirname(DB_PATH_THREADS), exist_ok=True)
     
-    conn.commit()
-    conn.close()
+    conn = sqlite3.connect(str(DB_PATH_THREADS))
+    try:
+        migrate(conn, THREADS_MIGRATIONS)
+    finally:
+        conn.close()
 
 def create_thread_record(user_wallet_address: str, thread_id: str, timestamp: datetime, last_threads: list) -> None:
     """Create new thread record"""
@@ -201,7 +343,7 @@ def create_thread_record(user_wallet_address: str, thread_id: str, timestamp: da
         print(f"Error creating thread record: {e}")
         raise e
     finally:
-        conn.close()
+        release_db_connection_threads(conn)
 
 def get_thread_record(user_address: str) -> Dict[str, Any]:
     """Get thread record"""
@@ -219,7 +361,7 @@ def get_thread_record(user_address: str) -> Dict[str, Any]:
         print(f"Error getting thread record: {e}")
         raise e
     finally:
-        conn.close()
+        release_db_connection_threads(conn)
 
 def update_thread_record(user_address: str, thread_id: str, timestamp: datetime, last_threads: list) -> None:
     """Update thread record"""
@@ -240,7 +382,7 @@ def update_thread_record(user_address: str, thread_id: str, timestamp: datetime,
         print(f"Error updating thread record: {e}")
         raise e
     finally:
-        conn.close()
+        release_db_connection_threads(conn)
 
 def get_all_threads() -> Dict[str, Any]:
     """Get all threads"""
@@ -255,5 +397,96 @@ def get_all_threads() -> Dict[str, Any]:
         print(f"Error getting all threads: {e}")
         raise e
     finally:
-        conn.close()
+        release_db_connection_threads(conn)
+
+
+WALLET_COLUMNS = (
+    'user_address', 'safe_address', 'cobo_address',
+    'agent_address', 'agent_key', 'agent_index', 'created_at'
+)
+THREAD_COLUMNS = ('user_address', 'thread_id', 'last_updated', 'last_threads')
+
+def _iter_rows(pool: ConnectionPool, table: str, columns: tuple, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """Stream table rows in primary key order, chunk_size rows at a time"""
+    conn = pool.acquire()
+    
+    try:
+        cursor = conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table} ORDER BY user_address"
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        pool.release(conn)
+
+def _import_rows(pool: ConnectionPool, table: str, columns: tuple, rows: Iterable[Dict[str, Any]]) -> int:
+    """Upsert rows with executemany inside one transaction"""
+    imported = 0
+    
+    def values():
+        nonlocal imported
+        for row in rows:
+            imported += 1
+            yield tuple(row.get(column) for column in columns)
+    
+    conn = pool.acquire()
+    
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            values()
+        )
+        if table == 'wallets':
+            # keep the allocator ahead of every imported agent index
+            conn.execute("""
+                UPDATE agent_index_seq
+                SET next_value = MAX(
+                    next_value,
+                    (SELECT COALESCE(MAX(agent_index) + 1, 0) FROM wallets),
+                    (SELECT COUNT(*) FROM wallets)
+                )
+                WHERE name = 'agent'
+            """)
+        conn.commit()
+        return imported
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error importing {table}: {e}")
+        raise e
+    finally:
+        pool.release(conn)
+
+def iter_wallets(chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Stream all wallet rows without loading the table into memory"""
+    return _iter_rows(_wallets_pool, 'wallets', WALLET_COLUMNS, chunk_size)
+
+def iter_threads(chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Stream all thread rows without loading the table into memory"""
+    return _iter_rows(_threads_pool, 'threads', THREAD_COLUMNS, chunk_size)
+
+def import_wallets(rows: Iterable[Dict[str, Any]]) -> int:
+    """Bulk upsert wallet rows in one transaction
+    
+    Returns:
+        int: Number of rows imported
+    """
+    imported = _import_rows(_wallets_pool, 'wallets', WALLET_COLUMNS, rows)
+    _wallet_cache.clear()
+    return imported
+
+def import_threads(rows: Iterable[Dict[str, Any]]) -> int:
+    """Bulk upsert thread rows in one transaction
+    
+    Returns:
+        int: Number of rows imported
+    """
+    return _import_rows(_threads_pool, 'threads', THREAD_COLUMNS, rows)
 
+_wallets_pool = ConnectionPool(DB_PATH, initializer=init_db, size=DB_POOL_SIZE)
+_threads_pool = ConnectionPool(DB_PATH_THREADS, initializer=init_db_threads, size=DB_POOL_SIZE)
@@ -0,0 +1,195 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.db.database import get_db_connection_threads, release_db_connection_threads
+
+TERMINAL_RUN_STATUSES = ("completed", "failed", "cancelled", "expired", "incomplete")
+
+
+def record_message(user_address: str, thread_id: str, role: str, content: str) -> int:
+    """Append a message to the conversation history
+
+    Returns:
+        int: Message id (monotonic, usable as a pagination cursor)
+    """
+    conn = get_db_connection_threads()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            INSERT INTO messages (user_address, thread_id, role, content, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (user_address, thread_id, role, content, datetime.utcnow()))
+
+        conn.commit()
+        return cursor.lastrowid
+    except Exception as e:
+        conn.rollback()
+        print(f"Error recording message: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
+
+
+def get_messages(
+    user_address: str,
+    thread_id: str,
+    limit: int = 50,
+    before_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Get a page of messages, newest first
+
+    Args:
+        user_address: User wallet address
+        thread_id: OpenAI thread id
+        limit: Page size
+        before_id: Return messages older than this id (cursor from the previous page)
+    """
+    conn = get_db_connection_threads()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT id, role, content, created_at FROM messages
+            WHERE user_address = ? AND thread_id = ? AND id < ?
+            ORDER BY id DESC
+            LIMIT ?
+        """, (user_address, thread_id, before_id if before_id is not None else 2**63 - 1, limit))
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error getting messages: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
+
+
+def count_messages(user_address: str, thread_id: str) -> int:
+    """Count messages of a thread, including those moved to the archive
+
+    The thread itself still holds archived messages, so they count towards
+    its length (THREAD_MAX_MESSAGES rotation).
+    """
+    conn = get_db_connection_threads()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM messages WHERE user_address = ? AND thread_id = ?)
+                 + (SELECT COUNT(*) FROM messages_archive WHERE user_address = ? AND thread_id = ?)
+        """, (user_address, thread_id, user_address, thread_id))
+        return cursor.fetchone()[0]
+    except Exception as e:
+        print(f"Error counting messages: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
+
+
+def record_run(run_id: str, user_address: str, thread_id: str, status: str) -> None:
+    """Store a new assistant run"""
+    conn = get_db_connection_threads()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            INSERT OR REPLACE INTO runs (run_id, user_address, thread_id, status, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (run_id, user_address, thread_id, status, datetime.utcnow()))
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error recording run: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
+
+
+def update_run_status(run_id: str, status: str) -> None:
+    """Update run status, stamping completed_at for terminal statuses"""
+    completed_at = datetime.utcnow() if status in TERMINAL_RUN_STATUSES else None
+    conn = get_db_connection_threads()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            UPDATE runs SET status = ?, completed_at = COALESCE(?, completed_at)
+            WHERE run_id = ?
+        """, (status, completed_at, run_id))
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error updating run status: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
+
+
+def get_runs(user_address: str, thread_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Get most recent runs for a thread, newest first"""
+    conn = get_db_connection_threads()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT run_id, status, created_at, completed_at FROM runs
+            WHERE user_address = ? AND thread_id = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+        """, (user_address, thread_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error getting runs: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
+
+
+def compact_history(older_than: datetime, batch_size: int = 500) -> Dict[str, int]:
+    """Move messages and runs created before a cutoff into the archive tables
+
+    Works in batches, one short transaction each, so the live tables stay
+    writable while a large backlog is archived.
+
+    Args:
+        older_than: Archive rows created before this (UTC) timestamp
+        batch_size: Rows moved per transaction
+
+    Returns:
+        Dict[str, int]: Number of archived messages and runs
+    """
+    archived = {'messages': 0, 'runs': 0}
+    jobs = (
+        ('messages', 'id', 'id, user_address, thread_id, role, content, created_at'),
+        ('runs', 'run_id', 'run_id, user_address, thread_id, status, created_at, completed_at'),
+    )
+    conn = get_db_connection_threads()
+
+    try:
+        for table, key, columns in jobs:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                keys = [row[0] for row in conn.execute(
+                    f"SELECT {key} FROM {table} WHERE created_at < ? ORDER BY created_at LIMIT ?",
+                    (older_than, batch_size)
+                )]
+                if not keys:
+                    conn.rollback()
+                    break
+
+                placeholders = ', '.join('?' for _ in keys)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table}_archive ({columns}) "
+                    f"SELECT {columns} FROM {table} WHERE {key} IN ({placeholders})",
+                    keys
+                )
+                conn.execute(f"DELETE FROM {table} WHERE {key} IN ({placeholders})", keys)
+                conn.commit()
+                archived[table] += len(keys)
+        return archived
+    except Exception as e:
+        conn.rollback()
+        print(f"Error compacting history: {e}")
+        raise e
+    finally:
+        release_db_connection_threads(conn)
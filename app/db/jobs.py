@@ -0,0 +1,350 @@
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.db.database import get_db_connection, release_db_connection
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+SENDER_LEASE = "deployer"
+
+
+def _job_from_row(cursor, row) -> Dict[str, Any]:
+    """Decode a provisioning_jobs row and attach its step checkpoints"""
+    job = dict(row)
+    job['state'] = json.loads(job['state'])
+    job['steps'] = _load_steps(cursor, job['job_id']) or json.loads(job['steps'])
+    return job
+
+
+def _load_steps(cursor, job_id: str) -> List[Dict[str, Any]]:
+    cursor.execute("""
+        SELECT step AS name, status, tx_hash, submitted_at, output, error, attempts, started_at, finished_at
+        FROM provisioning_steps
+        WHERE job_id = ?
+        ORDER BY position, step
+    """, (job_id,))
+    steps = []
+    for row in cursor.fetchall():
+        step = dict(row)
+        step['output'] = json.loads(step['output']) if step['output'] else None
+        steps.append(step)
+    return steps
+
+
+def create_job(
+    job_id: str,
+    user_address: str,
+    plan: str,
+    step_names: List[str],
+    owner: Optional[str],
+    lease_until: Optional[float]
+) -> None:
+    """Store a new queued provisioning job and its pending steps
+
+    owner None leaves the job for the process holding the sender lease to claim.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        now = datetime.utcnow()
+        steps = [{'name': name, 'status': 'pending'} for name in step_names]
+        cursor.execute("""
+            INSERT INTO provisioning_jobs (
+                job_id, user_address, status, plan, steps, state, owner, lease_until, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, '{}', ?, ?, ?, ?)
+        """, (job_id, user_address, JOB_QUEUED, plan, json.dumps(steps), owner, lease_until, now, now))
+        cursor.executemany("""
+            INSERT INTO provisioning_steps (job_id, step, position, status)
+            VALUES (?, ?, ?, 'pending')
+        """, [(job_id, name, position) for position, name in enumerate(step_names)])
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error creating provisioning job: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Get a provisioning job with decoded state and step checkpoints, None if unknown"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT * FROM provisioning_jobs WHERE job_id = ?", (job_id,))
+        row = cursor.fetchone()
+        return _job_from_row(cursor, row) if row else None
+    except Exception as e:
+        print(f"[Database] Error getting provisioning job: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def get_active_job(user_address: str) -> Optional[Dict[str, Any]]:
+    """Get the queued or running provisioning job of a user, if any"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"""
+            SELECT * FROM provisioning_jobs
+            WHERE user_address = ? COLLATE NOCASE
+              AND status IN ({', '.join('?' for _ in ACTIVE_JOB_STATUSES)})
+            ORDER BY created_at DESC
+            LIMIT 1
+        """, (user_address, *ACTIVE_JOB_STATUSES))
+        row = cursor.fetchone()
+        return _job_from_row(cursor, row) if row else None
+    except Exception as e:
+        print(f"[Database] Error getting active provisioning job: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def get_latest_job(user_address: str) -> Optional[Dict[str, Any]]:
+    """Get the most recent provisioning job of a user in any status"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT * FROM provisioning_jobs
+            WHERE user_address = ? COLLATE NOCASE
+            ORDER BY created_at DESC
+            LIMIT 1
+        """, (user_address,))
+        row = cursor.fetchone()
+        return _job_from_row(cursor, row) if row else None
+    except Exception as e:
+        print(f"[Database] Error getting latest provisioning job: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def update_job(
+    job_id: str,
+    owner: str,
+    status: str,
+    step: Optional[str],
+    state: Dict[str, Any],
+    error: Optional[str] = None
+) -> bool:
+    """Save job progress; terminal statuses also release the lease
+
+    Returns:
+        bool: False if owner no longer holds the job (nothing was written)
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            UPDATE provisioning_jobs
+            SET status = ?, step = ?, state = ?, error = ?, updated_at = ?,
+                owner = CASE WHEN ? THEN NULL ELSE owner END,
+                lease_until = CASE WHEN ? THEN NULL ELSE lease_until END
+            WHERE job_id = ? AND owner = ?
+        """, (
+            status, step, json.dumps(state), error, datetime.utcnow(),
+            status not in ACTIVE_JOB_STATUSES, status not in ACTIVE_JOB_STATUSES,
+            job_id, owner
+        ))
+
+        conn.commit()
+        return cursor.rowcount == 1
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error updating provisioning job: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def save_step(job_id: str, owner: str, step: str, position: int, checkpoint: Dict[str, Any]) -> bool:
+    """Write a step checkpoint (status, tx_hash, submitted_at, output, error, attempts)
+
+    Steps missing from the table (added to the graph after the job was
+    created) are inserted at position.
+
+    Returns:
+        bool: False if owner no longer holds the job (nothing was written)
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        now = time.time()
+        status = checkpoint['status']
+        output = checkpoint.get('output')
+        cursor.execute("""
+            INSERT INTO provisioning_steps (
+                job_id, step, position, status, tx_hash, submitted_at, output, error, attempts, started_at, finished_at
+            )
+            SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            WHERE EXISTS (SELECT 1 FROM provisioning_jobs WHERE job_id = ? AND owner = ?)
+            ON CONFLICT (job_id, step) DO UPDATE SET
+                status = excluded.status,
+                tx_hash = excluded.tx_hash,
+                submitted_at = excluded.submitted_at,
+                output = excluded.output,
+                error = excluded.error,
+                attempts = excluded.attempts,
+                started_at = COALESCE(excluded.started_at, started_at),
+                finished_at = excluded.finished_at
+        """, (
+            job_id, step, position, status,
+            checkpoint.get('tx_hash'),
+            checkpoint.get('submitted_at'),
+            json.dumps(output) if output is not None else None,
+            checkpoint.get('error'),
+            checkpoint.get('attempts', 0),
+            now if status == 'running' else None,
+            now if status in ('done', 'failed') else None,
+            job_id, owner
+        ))
+
+        conn.commit()
+        return cursor.rowcount == 1
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error saving provisioning step: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def requeue_job(job_id: str, owner: Optional[str], lease_until: Optional[float]) -> bool:
+    """Put a failed job back in the queue, leased to owner (None: left for the sender to claim)
+
+    Step checkpoints are kept, so the job continues from its last
+    confirmed step.
+
+    Returns:
+        bool: False if the job is not failed (anymore)
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            UPDATE provisioning_jobs
+            SET status = ?, error = NULL, owner = ?, lease_until = ?, updated_at = ?
+            WHERE job_id = ? AND status = ?
+        """, (JOB_QUEUED, owner, lease_until, datetime.utcnow(), job_id, JOB_FAILED))
+
+        conn.commit()
+        return cursor.rowcount == 1
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error requeueing provisioning job: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def acquire_sender_lease(owner: str, now: float, lease_until: float) -> bool:
+    """Take or renew the lease that allows sending deployer transactions
+
+    Nonces are counted in memory by each process, so only one process may
+    run provisioning jobs at a time. The lease is taken over once its
+    holder stops renewing it.
+
+    Returns:
+        bool: True if owner holds the lease until lease_until
+    """
+    conn = get_db_connection()
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "INSERT OR IGNORE INTO provisioning_sender (name, owner, lease_until) VALUES (?, NULL, NULL)",
+            (SENDER_LEASE,)
+        )
+        cursor = conn.execute("""
+            UPDATE provisioning_sender SET owner = ?, lease_until = ?
+            WHERE name = ? AND (owner IS NULL OR owner = ? OR lease_until < ?)
+        """, (owner, lease_until, SENDER_LEASE, owner, now))
+        conn.commit()
+        return cursor.rowcount == 1
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error acquiring provisioning sender lease: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def claim_expired_jobs(owner: str, now: float, lease_until: float, limit: int) -> List[Dict[str, Any]]:
+    """Take over active jobs nobody holds a live lease on
+
+    Select and update run in one BEGIN IMMEDIATE transaction, so two
+    processes never claim the same job.
+
+    Returns:
+        List[Dict[str, Any]]: Claimed jobs, oldest first
+    """
+    conn = get_db_connection()
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(f"""
+            SELECT * FROM provisioning_jobs
+            WHERE status IN ({', '.join('?' for _ in ACTIVE_JOB_STATUSES)})
+              AND (lease_until IS NULL OR lease_until < ?)
+            ORDER BY created_at
+            LIMIT ?
+        """, (*ACTIVE_JOB_STATUSES, now, limit)).fetchall()
+        if rows:
+            job_ids = [row['job_id'] for row in rows]
+            conn.execute(f"""
+                UPDATE provisioning_jobs SET owner = ?, lease_until = ?
+                WHERE job_id IN ({', '.join('?' for _ in job_ids)})
+            """, (owner, lease_until, *job_ids))
+        cursor = conn.cursor()
+        jobs = [_job_from_row(cursor, row) for row in rows]
+        conn.commit()
+        return jobs
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error claiming provisioning jobs: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def renew_job_leases(owner: str, job_ids: List[str], lease_until: float) -> int:
+    """Extend the lease on jobs this owner is still working on
+
+    Returns:
+        int: Number of leases renewed
+    """
+    if not job_ids:
+        return 0
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"""
+            UPDATE provisioning_jobs SET lease_until = ?
+            WHERE owner = ? AND job_id IN ({', '.join('?' for _ in job_ids)})
+        """, (lease_until, owner, *job_ids))
+
+        conn.commit()
+        return cursor.rowcount
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error renewing provisioning job leases: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
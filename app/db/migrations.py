@@ -0,0 +1,259 @@
+import logging
+import sqlite3
+from typing import List, Optional, Tuple
+
+# (version, description, statements). Versions are applied in order and the
+# schema version is tracked in PRAGMA user_version. Never edit a released
+# migration; append a new one instead.
+Migration = Tuple[int, str, List[str]]
+
+# not stdout: dbtool export streams NDJSON there
+logger = logging.getLogger('app')
+
+WALLETS_MIGRATIONS: List[Migration] = [
+    (1, "create wallets table", [
+        """
+        CREATE TABLE IF NOT EXISTS wallets (
+            user_address TEXT PRIMARY KEY,
+            safe_address TEXT NOT NULL,
+            cobo_address TEXT,
+            agent_address TEXT,
+            agent_key TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    # next free agent derivation index, seeded once from the legacy
+    # COUNT(*)-based numbering so existing agent keys are never reissued
+    (2, "agent index sequence", [
+        """
+        CREATE TABLE IF NOT EXISTS agent_index_seq (
+            name TEXT PRIMARY KEY,
+            next_value INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO agent_index_seq (name, next_value)
+        SELECT 'agent', COUNT(*) FROM wallets
+        """,
+    ]),
+    # addresses arrive both checksummed (API) and lowercased (logs)
+    (3, "reverse lookup indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_wallets_safe ON wallets (safe_address COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_wallets_cobo ON wallets (cobo_address COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_wallets_agent ON wallets (agent_address COLLATE NOCASE)",
+    ]),
+    # record the derivation index with each agent key so exports are
+    # self-describing; legacy rows got COUNT(*) at insert time, i.e. their
+    # position in insertion (rowid) order
+    (4, "wallets agent_index column", [
+        "ALTER TABLE wallets ADD COLUMN agent_index INTEGER",
+        """
+        UPDATE wallets
+        SET agent_index = (SELECT COUNT(*) FROM wallets w WHERE w.rowid < wallets.rowid)
+        WHERE agent_index IS NULL
+        """,
+    ]),
+    # background wallet provisioning (see app/services/provisioning_queue.py);
+    # steps and state are JSON, owner/lease_until let another process pick up
+    # jobs whose worker died
+    (5, "provisioning jobs", [
+        """
+        CREATE TABLE IF NOT EXISTS provisioning_jobs (
+            job_id TEXT PRIMARY KEY,
+            user_address TEXT NOT NULL,
+            status TEXT NOT NULL,
+            step TEXT,
+            steps TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT '{}',
+            error TEXT,
+            owner TEXT,
+            lease_until REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_provisioning_jobs_user ON provisioning_jobs (user_address COLLATE NOCASE, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_provisioning_jobs_status ON provisioning_jobs (status, lease_until)",
+        # at most one queued/running job per user
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_provisioning_jobs_active
+        ON provisioning_jobs (user_address COLLATE NOCASE)
+        WHERE status IN ('queued', 'running')
+        """,
+    ]),
+    # one checkpoint row per step graph node (app/core/wallet/step_graph.py):
+    # the tx hash is stored before waiting for the receipt, so a retried job
+    # waits for a transaction already sent instead of sending it again
+    (6, "provisioning step checkpoints", [
+        "ALTER TABLE provisioning_jobs ADD COLUMN plan TEXT",
+        """
+        UPDATE provisioning_jobs
+        SET plan = CASE WHEN steps LIKE '%"deploy_argus"%' THEN 'batched' ELSE 'sequential' END
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS provisioning_steps (
+            job_id TEXT NOT NULL,
+            step TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            tx_hash TEXT,
+            output TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            started_at REAL,
+            finished_at REAL,
+            PRIMARY KEY (job_id, step)
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO provisioning_steps (job_id, step, position, status, started_at, finished_at)
+        SELECT j.job_id,
+               json_extract(s.value, '$.name'),
+               s.key,
+               CASE json_extract(s.value, '$.status') WHEN 'done' THEN 'done' WHEN 'failed' THEN 'failed' ELSE 'pending' END,
+               json_extract(s.value, '$.started_at'),
+               json_extract(s.value, '$.finished_at')
+        FROM provisioning_jobs j, json_each(j.steps) s
+        """,
+    ]),
+    # deployer nonces are counted in memory per process, so only the process
+    # holding this lease may run provisioning jobs
+    (7, "provisioning sender lease", [
+        """
+        CREATE TABLE IF NOT EXISTS provisioning_sender (
+            name TEXT PRIMARY KEY,
+            owner TEXT,
+            lease_until REAL
+        )
+        """,
+    ]),
+    # when a step's transaction was sent, so a resumed job can tell a
+    # dropped transaction from one that is merely slow
+    (8, "provisioning step submit time", [
+        "ALTER TABLE provisioning_steps ADD COLUMN submitted_at REAL",
+    ]),
+    # next nonce per sending address across worker processes
+    # (app/core/nonce_manager.py); NULL means ask the node
+    (9, "sender nonces", [
+        """
+        CREATE TABLE IF NOT EXISTS sender_nonces (
+            address TEXT PRIMARY KEY,
+            next_nonce INTEGER
+        )
+        """,
+    ]),
+    # one wallet per agent derivation index, also for indices passed in from
+    # reserve_agent_indices; the indices migration 4 gave legacy rows are unique
+    (10, "unique agent index", [
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_wallets_agent_index ON wallets (agent_index) WHERE agent_index IS NOT NULL",
+    ]),
+]
+
+THREADS_MIGRATIONS: List[Migration] = [
+    (1, "create threads table", [
+        """
+        CREATE TABLE IF NOT EXISTS threads (
+            user_address TEXT PRIMARY KEY,
+            thread_id TEXT,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_threads TEXT
+        )
+        """,
+    ]),
+    (2, "conversation history", [
+        """
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_address TEXT NOT NULL,
+            thread_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages (user_address, thread_id, id)",
+        "CREATE INDEX IF NOT EXISTS idx_messages_created ON messages (created_at)",
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            user_address TEXT NOT NULL,
+            thread_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_runs_thread ON runs (user_address, thread_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at)",
+        """
+        CREATE TABLE IF NOT EXISTS messages_archive (
+            id INTEGER PRIMARY KEY,
+            user_address TEXT NOT NULL,
+            thread_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS runs_archive (
+            run_id TEXT PRIMARY KEY,
+            user_address TEXT NOT NULL,
+            thread_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+        """,
+    ]),
+    # thread length (rotation) counts archived messages too
+    (3, "messages archive thread index", [
+        "CREATE INDEX IF NOT EXISTS idx_messages_archive_thread ON messages_archive (user_address, thread_id)",
+    ]),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get schema version stored in the database file"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(
+    conn: sqlite3.Connection,
+    migrations: List[Migration],
+    target: Optional[int] = None
+) -> int:
+    """Apply pending migrations
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction and the
+    version is re-read under the write lock, so several workers starting at
+    once apply every migration exactly once.
+
+    Args:
+        conn: Open connection to the database
+        migrations: Ordered migration list for this database
+        target: Stop after this version (defaults to latest)
+
+    Returns:
+        int: Schema version after migrating
+    """
+    for version, description, statements in migrations:
+        if target is not None and version > target:
+            break
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+            logger.info(f"[Database] Applied migration {version}: {description}")
+        except Exception:
+            conn.rollback()
+            raise
+
+    return get_schema_version(conn)
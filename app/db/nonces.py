@@ -0,0 +1,82 @@
+from typing import Optional
+from app.db.database import get_db_connection, release_db_connection
+
+
+def claim_nonce(address: str, nonce: int) -> int:
+    """Take the next transaction nonce of address, shared by every process
+
+    The stored counter is ahead of nonce when another process sent from the
+    same address since; the higher of the two is handed out.
+
+    Args:
+        address: Sending address
+        nonce: Next nonce as counted by the calling process
+
+    Returns:
+        int: Nonce to use, recorded as taken
+    """
+    conn = get_db_connection()
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT next_nonce FROM sender_nonces WHERE address = ?", (address.lower(),)
+        ).fetchone()
+        if row and row['next_nonce'] is not None:
+            nonce = max(nonce, row['next_nonce'])
+        conn.execute("""
+            INSERT INTO sender_nonces (address, next_nonce) VALUES (?, ?)
+            ON CONFLICT (address) DO UPDATE SET next_nonce = excluded.next_nonce
+        """, (address.lower(), nonce + 1))
+        conn.commit()
+        return nonce
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error claiming nonce: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def release_nonce(address: str, nonce: int) -> None:
+    """Give back a claimed nonce whose transaction was never sent
+
+    Only if no process has claimed a later one; the counter is then cleared
+    so the next claim starts from the node's pending count again.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            UPDATE sender_nonces SET next_nonce = NULL
+            WHERE address = ? AND next_nonce = ?
+        """, (address.lower(), nonce + 1))
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error releasing nonce: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
+
+
+def reset_nonces(address: Optional[str] = None) -> None:
+    """Clear the shared counter of address (None: every address)"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        if address is None:
+            cursor.execute("UPDATE sender_nonces SET next_nonce = NULL")
+        else:
+            cursor.execute("UPDATE sender_nonces SET next_nonce = NULL WHERE address = ?", (address.lower(),))
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"[Database] Error resetting nonces: {e}")
+        raise e
+    finally:
+        release_db_connection(conn)
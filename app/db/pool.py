@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty, Full, LifoQueue
+from typing import Callable, Iterator, Optional
+
+# Pragmas applied to every pooled connection. WAL lets readers run alongside
+# a writer, NORMAL sync is durable enough under WAL, and busy_timeout makes
+# concurrent writers wait instead of failing with "database is locked".
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Per-connection cache of compiled statements, reused across calls as long
+# as the connection stays open
+STATEMENT_CACHE_SIZE = 128
+
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived SQLite connections for one database file"""
+
+    def __init__(
+        self,
+        path: Path,
+        initializer: Optional[Callable[[], None]] = None,
+        size: int = 8
+    ):
+        self.path = Path(path)
+        self.size = size
+        self._initializer = initializer
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._idle = LifoQueue(maxsize=size)
+
+    def _ensure_initialized(self) -> None:
+        """Run the schema initializer once per process"""
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                if self._initializer:
+                    self._initializer()
+                self._initialized = True
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection with tuned pragmas"""
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=5.0,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection from the pool, opening one if none is idle"""
+        self._ensure_initialized()
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            return self._open()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool
+
+        Any transaction left open by the caller is rolled back first.
+        """
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                break
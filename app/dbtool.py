@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import iter_wallets, iter_threads, import_wallets, import_threads
+from app.db.history import compact_history
+
+EXPORTERS = {
+    'wallets': iter_wallets,
+    'threads': iter_threads,
+}
+
+IMPORTERS = {
+    'wallets': import_wallets,
+    'threads': import_threads,
+}
+
+
+def export_table(table: str, out, chunk_size: int) -> int:
+    """Write table rows as NDJSON, one row per line"""
+    count = 0
+    for row in EXPORTERS[table](chunk_size=chunk_size):
+        out.write(json.dumps(row, default=str))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def read_ndjson(source):
+    """Lazily parse NDJSON lines, skipping blanks"""
+    for line_number, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+
+
+def main():
+    """Database maintenance entry point"""
+    parser = argparse.ArgumentParser(description="Wallets/threads database tool")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Stream a table to NDJSON")
+    export_parser.add_argument('table', choices=EXPORTERS)
+    export_parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    export_parser.add_argument('--chunk-size', type=int, default=500)
+
+    import_parser = subparsers.add_parser('import', help="Bulk load a table from NDJSON")
+    import_parser.add_argument('table', choices=IMPORTERS)
+    import_parser.add_argument('-i', '--input', help="Input file (default: stdin)")
+
+    compact_parser = subparsers.add_parser('compact', help="Archive old conversation history")
+    compact_parser.add_argument('--days', type=int, default=30, help="Archive rows older than this many days")
+    compact_parser.add_argument('--batch-size', type=int, default=500)
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        out = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            count = export_table(args.table, out, args.chunk_size)
+        finally:
+            if args.output:
+                out.close()
+        print(f"Exported {count} {args.table} rows", file=sys.stderr)
+
+    elif args.command == 'import':
+        source = open(args.input, 'r') if args.input else sys.stdin
+        try:
+            count = IMPORTERS[args.table](read_ndjson(source))
+        finally:
+            if args.input:
+                source.close()
+        print(f"Imported {count} {args.table} rows", file=sys.stderr)
+
+    elif args.command == 'compact':
+        cutoff = datetime.utcnow() - timedelta(days=args.days)
+        archived = compact_history(cutoff, batch_size=args.batch_size)
+        print(f"Archived {archived['messages']} messages and {archived['runs']} runs", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,10 @@ from flask_cors import CORS
 from api.wallet import wallet_bp
 from api.info import info_bp
 from api.ai_request import ai_request_bp
+from api.metrics import metrics_bp
+from app.core.rpc_metrics import get_rpc_metrics
+from app.core.abi_registry import get_abi_registry
+from services.provisioning_queue import get_provisioning_queue
 
 settings = Settings()
 
@@ -57,6 +61,8 @@ def create_app():
     frontend_url = settings.FRONTEND_URL
     logger = setup_logger()
     app.logger = logger
+    # parse every ABI in app/abi/ once, before the first request needs one
+    get_abi_registry()
     
     ALLOWED_ORIGINS = [
         "http://localhost:5011",
@@ -82,6 +88,11 @@ def create_app():
         response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
         return response
 
+    @app.teardown_request
+    def finish_rpc_metrics(exc):
+        # per-request RPC call count and time (see app/core/rpc_metrics.py)
+        get_rpc_metrics().finish_request()
+
     @app.route('/api/<path:path>', methods=['OPTIONS'])
     def handle_options(path):
         return '', 200
@@ -115,6 +126,11 @@ def create_app():
     app.register_blueprint(wallet_bp, url_prefix='/api/wallet')
     app.register_blueprint(info_bp, url_prefix='/api/info')
     app.register_blueprint(ai_request_bp, url_prefix='/api/ai_request')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+    # pick up provisioning jobs a previous run left unfinished; under the
+    # debug reloader only the child process serves (and sends transactions)
+    if not settings.DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_provisioning_queue()
     
     return app
 def main():
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger('app')
+
+
+class AprCache:
+    """Stale-while-revalidate cache for protocol APR data
+
+    A background thread refreshes the value every refresh_interval seconds
+    and requests are always answered from memory. Only the very first
+    request (cold cache) waits for the chain. Concurrent refreshes are
+    coalesced, so at most one fetch is in flight at a time.
+    """
+
+    def __init__(self, fetch: Callable[[], Any], ttl: float, refresh_interval: float):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._cond = threading.Condition()
+        self._data: Optional[Any] = None
+        self._updated_at: Optional[float] = None
+        self._error: Optional[Exception] = None
+        self._in_flight = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start the background refresher (idempotent)"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="apr-cache-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def refresh(self) -> None:
+        """Fetch fresh data, or wait for the fetch already in flight"""
+        with self._cond:
+            if self._in_flight:
+                while self._in_flight:
+                    self._cond.wait()
+                return
+            self._in_flight = True
+
+        try:
+            data = self._fetch()
+            with self._cond:
+                self._data = data
+                self._updated_at = time.time()
+                self._error = None
+        except Exception as e:
+            logger.error(f"APR refresh failed: {e}")
+            with self._cond:
+                self._error = e
+        finally:
+            with self._cond:
+                self._in_flight = False
+                self._cond.notify_all()
+
+    def get(self) -> Dict[str, Any]:
+        """Get cached data with its staleness
+
+        Returns:
+            Dict[str, Any]: data, updated_at (ISO, UTC), age_seconds and stale flag
+
+        Raises:
+            Exception: Last refresh error if no data has ever been fetched
+        """
+        self.start()
+        if self._data is None:
+            self.refresh()
+
+        with self._cond:
+            if self._data is None:
+                raise self._error or RuntimeError("APR data unavailable")
+            age = time.time() - self._updated_at
+            return {
+                'data': self._data,
+                'updated_at': datetime.fromtimestamp(self._updated_at, tz=timezone.utc).isoformat(),
+                'age_seconds': round(age, 3),
+                'stale': age > self.ttl
+            }
@@ -0,0 +1,329 @@
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from web3 import Web3
+from config.settings import Settings
+from app.db.database import create_wallet_record, update_cobo_address, get_wallet
+from app.db.jobs import (
+    JOB_RUNNING, JOB_COMPLETED, JOB_FAILED,
+    create_job, get_job, get_active_job, get_latest_job, update_job, save_step, requeue_job,
+    acquire_sender_lease, claim_expired_jobs, renew_job_leases
+)
+from app.core.wallet.safe_factory import SafeWalletFactory
+from app.core.wallet.cobo_factory import CoboArgusFactory
+from app.core.wallet.authorizer_manager import AuthorizerManager
+from app.core.wallet.provisioning import ProvisioningPlanner, AUTHORIZERS
+from app.core.wallet.step_graph import Step, StepGraph
+
+logger = logging.getLogger('app')
+
+_lock = threading.Lock()
+_queue: Optional["ProvisioningQueue"] = None
+
+# ProvisioningPlanner: three transactions
+PLAN_BATCHED = "batched"
+# one transaction per former create_wallet stage
+PLAN_SEQUENTIAL = "sequential"
+
+RESULT_FIELDS = ('safe_address', 'cobo_address') + tuple(
+    f"{role_name}_authorizer_address" for _, role_name in AUTHORIZERS
+)
+
+
+class QueueFull(Exception):
+    """This process already holds PROVISIONING_MAX_QUEUED unfinished jobs"""
+
+
+class WalletExists(Exception):
+    """The user already has a wallet record"""
+
+
+class LeaseLost(Exception):
+    """Another process took over the job this process was running"""
+
+
+class ProvisioningQueue:
+    """Runs wallet provisioning (Safe, Cobo, authorizers) as background jobs
+
+    submit() stores a job in SQLite and hands it to a bounded thread pool.
+    Each job runs a StepGraph built from the factories' step lists; every
+    step's status, transaction hash and outputs are checkpointed in
+    provisioning_steps as it advances, so GET /api/wallet/create/<job_id>
+    can report progress and a failed or interrupted job continues after its
+    last confirmed step. Submitting again for a user whose last job failed
+    retries that job.
+
+    Deployer nonces are counted in memory (see NonceManager), so only one
+    process may send deployer transactions: the one holding the sender
+    lease in provisioning_sender. Other processes (extra web workers, the
+    debug reloader) only store their jobs unowned. A maintenance thread in
+    every process tries to take or renew the sender lease; the holder
+    renews the leases of its jobs and claims unowned jobs and jobs whose
+    lease expired. Job writes are conditional on the owner, so a job taken
+    over by another process stops here with LeaseLost.
+
+    Example:
+        queue = get_provisioning_queue()
+        job = queue.submit(user_address)
+        ...
+        queue.describe(get_job(job['job_id']))
+    """
+
+    def __init__(self, web3: Web3, settings: Settings):
+        self.web3 = web3
+        self.settings = settings
+        self.lease = settings.PROVISIONING_LEASE
+        self.max_queued = settings.PROVISIONING_MAX_QUEUED
+        self.workers = settings.PROVISIONING_WORKERS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="provisioning"
+        )
+        self._lock = threading.Lock()
+        self._active: Dict[str, str] = {}
+        self._stats = {'submitted': 0, 'retried': 0, 'resumed': 0, 'completed': 0, 'failed': 0}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._sender = False
+
+    def start(self) -> None:
+        """Start the lease / resume thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._maintain, name="provisioning-leases", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the lease / resume thread; running jobs finish on their own"""
+        self._stop.set()
+
+    def submit(self, user_address: str) -> Dict[str, Any]:
+        """Queue provisioning for a user
+
+        Returns the user's unfinished job instead if there already is one,
+        and retries the user's last job from its last confirmed step if it
+        failed.
+
+        Raises:
+            WalletExists: The user already has a wallet
+            QueueFull: Too many unfinished jobs in this process
+        """
+        existing = get_active_job(user_address)
+        if existing is not None:
+            return existing
+        with self._lock:
+            if len(self._active) >= self.max_queued:
+                raise QueueFull(f"{len(self._active)} provisioning jobs pending, try again later")
+
+        try:
+            # the failed job may have recorded the wallet already
+            # jobs submitted without the sender lease wait unowned for its holder
+            owner, lease_until = (self.owner, time.time() + self.lease) if self._acquire_sender() else (None, None)
+            latest = get_latest_job(user_address)
+            if latest is not None and latest['status'] == JOB_FAILED:
+                if requeue_job(latest['job_id'], owner, lease_until):
+                    logger.info(f"Retrying provisioning job {latest['job_id']} for {user_address}")
+                    return self._accept(get_job(latest['job_id']), 'retried')
+
+            if self._has_wallet(user_address):
+                raise WalletExists(f"Wallet already exists for {user_address}")
+
+            plan = PLAN_BATCHED if self.settings.PROVISIONING_BATCHED else PLAN_SEQUENTIAL
+            job_id = uuid.uuid4().hex
+            create_job(job_id, user_address, plan, self._graph(plan).names, owner, lease_until)
+        except sqlite3.IntegrityError:
+            # a concurrent request for the same user got there first
+            existing = get_active_job(user_address)
+            if existing is not None:
+                return existing
+            raise
+
+        return self._accept(get_job(job_id), 'submitted')
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Public view of a job for the status endpoint"""
+        state = job['state']
+        return {
+            'job_id': job['job_id'],
+            'user_address': job['user_address'],
+            'status': job['status'],
+            'plan': job.get('plan'),
+            'step': job['step'],
+            'steps': [
+                {field: step.get(field) for field in (
+                    'name', 'status', 'tx_hash', 'attempts', 'error', 'started_at', 'finished_at'
+                )}
+                for step in job['steps']
+            ],
+            'result': {field: state[field] for field in RESULT_FIELDS if field in state},
+            'error': job['error'],
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at']
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'sender': self._sender,
+                'active': len(self._active),
+                **self._stats
+            }
+
+    def _accept(self, job: Dict[str, Any], counter: str) -> Dict[str, Any]:
+        if job['owner'] == self.owner:
+            self._enqueue(job)
+        with self._lock:
+            self._stats[counter] += 1
+        self.start()
+        return job
+
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            if job['job_id'] in self._active:
+                return
+            self._active[job['job_id']] = job['user_address']
+        self._executor.submit(self._run, job)
+
+    def _acquire_sender(self) -> bool:
+        """Take or renew the sender lease; True if this process may run jobs"""
+        now = time.time()
+        sender = acquire_sender_lease(self.owner, now, now + self.lease)
+        if sender != self._sender:
+            logger.info(f"Provisioning sender lease {'acquired' if sender else 'lost'} by {self.owner}")
+            self._sender = sender
+        return sender
+
+    def _maintain(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._acquire_sender():
+                    with self._lock:
+                        local_jobs = list(self._active)
+                        capacity = self.max_queued - len(local_jobs)
+                    now = time.time()
+                    renew_job_leases(self.owner, local_jobs, now + self.lease)
+                    if capacity > 0:
+                        for job in claim_expired_jobs(self.owner, now, now + self.lease, capacity):
+                            logger.info(f"Claimed provisioning job {job['job_id']} for {job['user_address']}")
+                            with self._lock:
+                                self._stats['resumed'] += 1
+                            self._enqueue(job)
+            except Exception as e:
+                logger.error(f"Provisioning lease maintenance failed: {e}")
+            self._stop.wait(self.lease / 3)
+
+    def _graph(self, plan: str) -> StepGraph:
+        """Step graph of a plan
+
+        Transaction steps come from the factories; record_wallet and
+        record_cobo write the wallets database in between.
+        """
+        safe_factory = SafeWalletFactory(self.web3, self.settings)
+        steps = safe_factory.create_safe_steps() + [
+            Step("record_wallet", requires=("create_safe",), run=self._record_wallet)
+        ]
+
+        if plan == PLAN_BATCHED:
+            deploy_argus, configure = ProvisioningPlanner(self.web3, self.settings).argus_steps(
+                requires=("record_wallet",)
+            )
+            record_cobo = Step("record_cobo", requires=("deploy_argus",), run=self._record_cobo)
+            return StepGraph(steps + [deploy_argus, record_cobo, configure])
+
+        steps += CoboArgusFactory(self.web3, self.settings).create_cobo_steps(requires=("record_wallet",))
+        steps.append(Step("record_cobo", requires=("create_cobo",), run=self._record_cobo))
+        authorizer_manager = AuthorizerManager(self.web3, self.settings)
+        for authorizer_type, role_name in AUTHORIZERS:
+            steps += authorizer_manager.authorizer_steps(authorizer_type, role_name, requires=(steps[-1].name,))
+        steps += safe_factory.transfer_ownership_steps(requires=(steps[-1].name,))
+        return StepGraph(steps)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job['job_id']
+        user_address = job['user_address']
+        plan = job.get('plan') or PLAN_SEQUENTIAL
+        ctx = {**job['state'], 'user_address': user_address}
+        current = None
+        try:
+            graph = self._graph(plan)
+            positions = {name: position for position, name in enumerate(graph.names)}
+
+            def save(name: str, checkpoint: Dict[str, Any]) -> None:
+                nonlocal current
+                current = name
+                # the new sender takes the job over once its lease lapses
+                if not self._sender:
+                    raise LeaseLost(f"Provisioning sender lease lost, leaving job {job_id} to its new holder")
+                if not (save_step(job_id, self.owner, name, positions[name], checkpoint)
+                        and update_job(job_id, self.owner, JOB_RUNNING, name, ctx)):
+                    raise LeaseLost(f"Provisioning job {job_id} is now owned by another process")
+
+            graph.run(
+                self.web3,
+                ctx,
+                checkpoints={step['name']: step for step in job['steps']},
+                save=save
+            )
+
+            if not update_job(job_id, self.owner, JOB_COMPLETED, None, ctx):
+                raise LeaseLost(f"Provisioning job {job_id} is now owned by another process")
+            with self._lock:
+                self._stats['completed'] += 1
+            logger.info(f"Provisioning job {job_id} completed for {user_address}")
+        except LeaseLost as e:
+            logger.warning(str(e))
+        except Exception as e:
+            logger.error(f"Provisioning job {job_id} failed at {current}: {e}")
+            with self._lock:
+                self._stats['failed'] += 1
+            try:
+                update_job(job_id, self.owner, JOB_FAILED, current, ctx, error=str(e))
+            except Exception as db_error:
+                logger.error(f"Could not record failure of provisioning job {job_id}: {db_error}")
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+
+    @staticmethod
+    def _has_wallet(user_address: str) -> bool:
+        try:
+            get_wallet(user_address)
+            return True
+        except ValueError:
+            return False
+
+    def _record_wallet(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        user_address = ctx['user_address']
+        # the row may already exist if the process stopped right after writing it
+        if not self._has_wallet(user_address):
+            create_wallet_record(user_address, ctx['safe_address'])
+        wallet = get_wallet(user_address)
+        if wallet['safe_address'].lower() != ctx['safe_address'].lower():
+            raise WalletExists(f"Wallet already exists for {user_address}")
+        return {'agent_address': wallet['agent_address']}
+
+    def _record_cobo(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        update_cobo_address(ctx['user_address'], ctx['cobo_address'])
+        return {}
+
+
+def get_provisioning_queue() -> ProvisioningQueue:
+    """Get the process-wide provisioning queue, started on first use"""
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                from app.core.provider import get_web3
+                settings = Settings()
+                _queue = ProvisioningQueue(get_web3(settings), settings)
+    _queue.start()
+    return _queue
@@ -1,6 +1,6 @@
-from web3 import Web3   
 import logging
 from config.settings import Settings
+from app.core.provider import get_web3
 from app.core.protocols.crowdfinding import CrowdfindingProtocol
 from app.core.protocols.token import TokenProtocol
 settings = Settings()
@@ -8,13 +8,24 @@ settings = Settings()
 
 def make_contribution(wallet_address: str, amount: int) -> str:
     amount = amount*10**6
-    web3 = Web3(Web3.HTTPProvider(settings.RPC_URL))
+    web3 = get_web3(settings)
     token_protocol = TokenProtocol(web3, settings, wallet_address)
-    allowance = token_protocol.get_allowance("0x29219dd400f2Bf60E5a23d13Be72B486D4038894", "0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7")
+    # approve and contribution use consecutive agent nonces, so the contribution
+    # is mined after the approve without waiting for it here
+    token_protocol.wait_for_receipt = False
+    # balance and allowance in one multicall round trip
+    balances, (allowance,) = token_protocol.get_token_reads(
+        ["0x29219dd400f2Bf60E5a23d13Be72B486D4038894"],
+        [("0x29219dd400f2Bf60E5a23d13Be72B486D4038894", "0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7")]
+    )
+    balance = balances["0x29219dd400f2Bf60E5a23d13Be72B486D4038894"]
+    if balance is not None and balance < amount:
+        return (f'Insufficient USDC.e balance: {balance / 10**6} available, {amount / 10**6} needed')
     crowdfinding_protocol = CrowdfindingProtocol(web3, settings, wallet_address)
+    crowdfinding_protocol.wait_for_receipt = False
     tx_hash_approve = "It's already approved"
     tx_status_approve = "It's already approved"
-    if allowance < amount:
+    if allowance is None or allowance < amount:
         tx_hash_approve, tx_status_approve = token_protocol.approve(
             token_address="0x29219dd400f2Bf60E5a23d13Be72B486D4038894",
             spender_address="0x9303a680bA1A2924Bb6EeE5A7eD804df2E1824f7",
@@ -1,27 +1,42 @@
-from web3 import Web3
 from config.settings import Settings
+from app.core.provider import get_web3
 from app.core.protocols.token import TokenProtocol
+from app.core.tx_tracker import get_receipt_tracker
 
 settings = Settings()
 
 def get_wallet_balance(wallet_address: str) -> float:
-    web3 = Web3(Web3.HTTPProvider(settings.RPC_URL))
+    web3 = get_web3(settings)
     balance = TokenProtocol(web3, settings, wallet_address).get_native_balance()
     return balance / 10**18
 
 def make_approve_transaction(wallet_address: str, token_address: str, spender_address: str, amount: float) -> str:
-    web3 = Web3(Web3.HTTPProvider(settings.RPC_URL))
+    web3 = get_web3(settings)
     token_protocol = TokenProtocol(web3, settings, wallet_address)
+    # don't hold the assistant run until the block is mined
+    token_protocol.wait_for_receipt = False
     
     tx_hash, tx_status = token_protocol.approve(
         token_address=token_address,
         spender_address=spender_address,
         amount=amount
     )
-    return (f'Transaction successful, tx_hash: {tx_hash}, status: {tx_status}')
+    return (f'Transaction sent, tx_hash: {tx_hash}, status: {tx_status}')
+
+def get_transaction_status(tx_hash: str) -> str:
+    web3 = get_web3(settings)
+    tracker = get_receipt_tracker(web3)
+    # only long-poll hashes this process sent; anything else is looked up once
+    result = tracker.wait(tx_hash, timeout=settings.TX_LONG_POLL_MAX, track=False) or tracker.lookup(tx_hash)
+    if result is None:
+        return f'Transaction {tx_hash} not found'
+    return (f'Transaction {result["tx_hash"]} status: {result["status"]}, block: {result["block_number"]}')
 
 def get_token_balance_for_wallet(wallet_address: str, token_address: str) -> str:
-    web3 = Web3(Web3.HTTPProvider(settings.RPC_URL))
+    web3 = get_web3(settings)
     token_protocol = TokenProtocol(web3, settings, wallet_address)
-    return (f'Token balance: {token_protocol.get_token_balance(token_address)}')
+    balance = token_protocol.get_token_balances([token_address])[token_address]
+    if balance is None:
+        return f'Could not read the balance of token {token_address}'
+    return (f'Token balance: {balance}')
 